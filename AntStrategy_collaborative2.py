@@ -1,4 +1,3 @@
-import random
 from environment import TerrainType, AntPerception
 from ant import AntAction, AntStrategy
 from common import Direction
@@ -76,7 +75,7 @@ class Collaborative(AntStrategy):
     def _choose_exploration_action(self, perception: AntPerception) -> AntAction:
         """Basic exploration behavior to reach food (simple forward-biased random walk)"""
 
-        r = random.random()
+        r = perception.rng.random()
         ant_id = perception.ant_id
         if len(perception.visible_cells) == 1 or len(perception.visible_cells) == 4:
             if r > 0.5:
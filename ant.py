@@ -1,14 +1,27 @@
 from abc import ABC, abstractmethod
+from typing import List
 from common import Direction, AntPerception, AntAction
 
 
 # Strategy interface for ant behavior
 class AntStrategy(ABC):
+    # Set to True in strategies that keep perceptions beyond decide_action,
+    # otherwise each ant's perception object is reused every step
+    keeps_perceptions = False
+
     @abstractmethod
     def decide_action(self, perception: AntPerception) -> AntAction:
         """Decide the action of an ant based on its perception"""
         pass
 
+    def decide_actions(self, perceptions: List[AntPerception]) -> List[AntAction]:
+        """Decide the actions of several ants at once, one per perception in order
+
+        Strategies may override this to share work across all their ants in a
+        step. The default decides each ant separately with decide_action.
+        """
+        return [self.decide_action(perception) for perception in perceptions]
+
     def get_name(self) -> str:
         """Get strategy name"""
         return self.__class__.__name__
@@ -16,6 +29,24 @@ class AntStrategy(ABC):
 
 # Ant class with possible actions
 class Ant:
+    __slots__ = (
+        "x",
+        "y",
+        "direction",
+        "strategy",
+        "has_food",
+        "home_pheromone",
+        "food_pheromone",
+        "pheromone_decrease_rate",
+        "vision_range",
+        "vision_angle",
+        "food_collected",
+        "steps_taken",
+        "id",
+        "perception_buffer",
+        "rng",
+    )
+
     def __init__(
         self,
         x: int,
@@ -37,6 +68,25 @@ class Ant:
         self.food_collected = 0
         self.steps_taken = 0
         self.id = ant_id
+        # Perception refilled by the environment each step, see keeps_perceptions
+        self.perception_buffer = None
+        # Per-ant random.Random, set by the environment in seeded runs
+        self.rng = None
+
+    def __getstate__(self) -> dict:
+        # The perception buffer is scratch space refilled every step, and
+        # unseeded it holds the random module, which cannot be pickled
+        state = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name != "perception_buffer" and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.perception_buffer = None
 
     def set_strategy(self, strategy: AntStrategy) -> None:
         self.strategy = strategy
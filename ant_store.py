@@ -0,0 +1,101 @@
+import numpy as np
+from ant import Ant, AntStrategy
+from common import Direction
+
+
+# Directions indexed by their value, and their deltas as arrays
+DIRECTIONS = tuple(sorted(Direction, key=lambda direction: direction.value))
+DELTA_X = np.array([Direction.get_delta(d)[0] for d in DIRECTIONS], dtype=np.int64)
+DELTA_Y = np.array([Direction.get_delta(d)[1] for d in DIRECTIONS], dtype=np.int64)
+
+
+# Structure-of-arrays storage for the state of many ants
+class AntStore:
+    # Column name, dtype
+    COLUMNS = (
+        ("x", np.int64),
+        ("y", np.int64),
+        ("direction", np.int8),
+        ("has_food", np.bool_),
+        ("home_pheromone", np.float64),
+        ("food_pheromone", np.float64),
+        ("pheromone_decrease_rate", np.float64),
+        ("food_collected", np.int64),
+        ("steps_taken", np.int64),
+    )
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for name, dtype in self.COLUMNS:
+            column = np.zeros(self.capacity, dtype=dtype)
+            column[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, column)
+
+    def attach(self, ant: Ant) -> "AntView":
+        """Copy an ant's state into the store and return a view on it"""
+        if self.count == self.capacity:
+            self._grow()
+
+        index = self.count
+        self.count += 1
+        self.x[index] = ant.x
+        self.y[index] = ant.y
+        self.direction[index] = ant.direction.value
+        self.has_food[index] = ant.has_food
+        self.home_pheromone[index] = ant.home_pheromone
+        self.food_pheromone[index] = ant.food_pheromone
+        self.pheromone_decrease_rate[index] = ant.pheromone_decrease_rate
+        self.food_collected[index] = ant.food_collected
+        self.steps_taken[index] = ant.steps_taken
+
+        return AntView(self, index, ant)
+
+
+def _column(name: str, to_python):
+    def getter(view):
+        return to_python(getattr(view.store, name)[view.index])
+
+    def setter(view, value):
+        getattr(view.store, name)[view.index] = value
+
+    return property(getter, setter)
+
+
+def _get_direction(view) -> Direction:
+    return DIRECTIONS[view.store.direction[view.index]]
+
+
+def _set_direction(view, direction: Direction) -> None:
+    view.store.direction[view.index] = direction.value
+
+
+# Ant whose state lives in an AntStore, for strategies and code that need Ant objects
+class AntView(Ant):
+    x = _column("x", int)
+    y = _column("y", int)
+    direction = property(_get_direction, _set_direction)
+    has_food = _column("has_food", bool)
+    home_pheromone = _column("home_pheromone", float)
+    food_pheromone = _column("food_pheromone", float)
+    pheromone_decrease_rate = _column("pheromone_decrease_rate", float)
+    food_collected = _column("food_collected", int)
+    steps_taken = _column("steps_taken", int)
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: AntStore, index: int, ant: Ant):
+        # State columns live in the store, only per-ant configuration is kept here
+        self.store = store
+        self.index = index
+        self.strategy: AntStrategy = ant.strategy
+        self.vision_range = ant.vision_range
+        self.vision_angle = ant.vision_angle
+        self.id = ant.id
+        self.perception_buffer = None
+        self.rng = ant.rng
@@ -0,0 +1,339 @@
+# Multi-process batch runner for ant colony simulations.
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from environment import Environment
+from simulation import SimulationRunner
+from utils import create_environment, add_ants
+
+# Tunable parameters a job can override, see apply_parameters
+PARAMETERS = (
+    "ants",
+    "evaporation_rate",
+    "vision_range",
+    "vision_angle",
+    "pheromone_decrease_rate",
+)
+
+# Metrics summarized by aggregate_results, with their display format
+SUMMARY_METRICS = ("steps", "time_taken", "completion_percentage")
+SUMMARY_FORMATS = {"steps": ".1f", "time_taken": ".3f", "completion_percentage": ".1f"}
+
+
+class BatchJob(NamedTuple):
+    """One simulation run: environment x strategy x seed"""
+
+    env: str
+    strategy_file: Optional[str] = None  # None runs the built-in random strategy
+    seed: int = 0
+    ants: int = 0  # 0 uses the environment file's ANTS section, or 10
+    max_steps: int = 0  # 0 uses the environment file's MAX_STEPS section
+    time_limit: float = 0  # 0 uses the environment file's TIME_LIMIT section
+    width: int = 100
+    height: int = 100
+    params: Tuple[Tuple[str, float], ...] = ()  # (name, value) pairs from PARAMETERS
+
+
+# Per-process cache of loaded environment files, copied for every run
+_environments: Dict[str, Environment] = {}
+
+
+def _load_environment(job: BatchJob) -> Environment:
+    if not os.path.isfile(job.env):
+        # Generated environments depend on the seed, so they are never cached
+        return create_environment(
+            job.env, job.width, job.height, verbose=False, seed=job.seed
+        )
+
+    environment = _environments.get(job.env)
+    if environment is None:
+        environment = create_environment(job.env, 0, 0, verbose=False)
+        _environments[job.env] = environment
+    environment = copy.deepcopy(environment)
+    environment.seed = job.seed
+    return environment
+
+
+def apply_parameters(environment: Environment, params: Dict[str, float]) -> None:
+    """Apply parameter overrides to an environment whose ants are already added
+
+    "ants" is handled by run_job since it decides how many ants are added.
+    """
+    unknown = set(params) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+    if "evaporation_rate" in params:
+        environment.home_pheromones.evaporation_rate = params["evaporation_rate"]
+        environment.food_pheromones.evaporation_rate = params["evaporation_rate"]
+    for ant in environment.ants:
+        if "vision_range" in params:
+            ant.vision_range = int(params["vision_range"])
+        if "vision_angle" in params:
+            ant.vision_angle = params["vision_angle"]
+        if "pheromone_decrease_rate" in params:
+            ant.pheromone_decrease_rate = params["pheromone_decrease_rate"]
+
+
+def strategy_label(strategy_file: Optional[str]) -> str:
+    if strategy_file is None:
+        return "random"
+    return os.path.basename(strategy_file)
+
+
+def run_job(job: BatchJob) -> dict:
+    """Run a single job and return SimulationRunner's result dictionary"""
+    result = {
+        "env": job.env,
+        "strategy": strategy_label(job.strategy_file),
+        "strategy_file": job.strategy_file,
+        "seed": job.seed,
+    }
+    params = dict(job.params)
+    if params:
+        result["params"] = params
+
+    try:
+        # Ants draw from per-ant streams, the global seed covers strategies
+        # that still use the random module directly
+        random.seed(job.seed)
+        environment = _load_environment(job)
+
+        # Job values take precedence over the environment file. For steps and
+        # time that matches the CLI, but unlike simulation.py a job's ant count
+        # also overrides the file's ANTS section so sweeps can vary it
+        ant_count = int(params.get("ants", 0)) or job.ants
+        ant_count = ant_count or getattr(environment, "requested_ant_count", 0) or 10
+        max_steps = job.max_steps or getattr(environment, "max_steps", 0)
+        time_limit = job.time_limit or getattr(environment, "time_limit", 0)
+
+        # Strategies may print on every step, keep worker output quiet
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_ants(environment, "random", job.strategy_file, ant_count, verbose=False)
+            apply_parameters(environment, params)
+            runner = SimulationRunner(
+                environment, max_steps=max_steps, time_limit=time_limit
+            )
+            result.update(runner.run(verbose=False))
+    except Exception as e:
+        result.update(
+            {
+                "error": str(e),
+                "completion_percentage": 0,
+                "steps": 0,
+                "time_taken": 0,
+            }
+        )
+
+    return result
+
+
+def run_batch(
+    jobs: Iterable[BatchJob], processes: Optional[int] = None
+) -> Iterator[dict]:
+    """Run jobs over a process pool, yielding each result as soon as it finishes
+
+    processes defaults to the number of CPU cores. With a single process
+    the jobs run in order in the current interpreter.
+    """
+    jobs = list(jobs)
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as pool:
+        futures = [pool.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile with linear interpolation between closest ranks"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def aggregate_results(results: Iterable[dict]) -> Dict[tuple, dict]:
+    """Summarize results per (env, strategy) with mean, median and p95 of each metric"""
+    groups = {}
+    for result in results:
+        groups.setdefault((result["env"], result["strategy"]), []).append(result)
+
+    summary = {}
+    for key, group in groups.items():
+        completed = [result for result in group if "error" not in result]
+        summary[key] = {"runs": len(group), "errors": len(group) - len(completed)}
+        for metric in SUMMARY_METRICS:
+            values = [result[metric] for result in completed]
+            summary[key][metric] = {
+                "mean": statistics.fmean(values) if values else 0.0,
+                "median": statistics.median(values) if values else 0.0,
+                "p95": percentile(values, 95),
+            }
+    return summary
+
+
+def print_summary(summary: Dict[tuple, dict]) -> None:
+    header = " ".join(f"{metric:>30}" for metric in SUMMARY_METRICS)
+    print(f"\n{'env':<36} {'strategy':<28} {'runs':>5} {header}")
+    print(
+        f"{'':<36} {'':<28} {'':>5} "
+        + " ".join(f"{'mean / median / p95':>30}" for _ in SUMMARY_METRICS)
+    )
+    for (env, strategy), stats in sorted(summary.items()):
+        columns = []
+        for metric in SUMMARY_METRICS:
+            fmt = SUMMARY_FORMATS[metric]
+            values = stats[metric]
+            columns.append(
+                " / ".join(
+                    f"{values[stat]:{fmt}}" for stat in ("mean", "median", "p95")
+                )
+            )
+        row = " ".join(f"{column:>30}" for column in columns)
+        print(f"{env:<36} {strategy:<28} {stats['runs']:>5} {row}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run many seeded ant colony simulations in parallel"
+    )
+    parser.add_argument(
+        "--env",
+        type=str,
+        nargs="+",
+        required=True,
+        help="Environment types (simple, obstacle, maze) or environment files",
+    )
+    parser.add_argument(
+        "--strategy-file",
+        type=str,
+        nargs="+",
+        default=["random"],
+        help="Strategy files, 'random' for the built-in strategy (default: random)",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=10,
+        help="Number of seeded runs per environment and strategy (default: 10)",
+    )
+    parser.add_argument(
+        "--seed-start",
+        type=int,
+        default=0,
+        help="First seed, runs use seed-start .. seed-start + seeds - 1 (default: 0)",
+    )
+    parser.add_argument(
+        "--ants",
+        type=int,
+        default=0,
+        help="Number of ants, overriding the environment file's ANTS section unlike "
+        "simulation.py (default: 0, use the file's ANTS or 10)",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=0,
+        help="Maximum steps per run (default: 0, environment file's MAX_STEPS)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=0,
+        help="Time limit per run in seconds (default: 0, file's TIME_LIMIT)",
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=100,
+        help="Environment width for generated environments (default: 100)",
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=100,
+        help="Environment height for generated environments (default: 100)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0, one per CPU core)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Write one JSON result per line to this file as runs finish",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    jobs = [
+        BatchJob(
+            env=env,
+            strategy_file=None if strategy_file == "random" else strategy_file,
+            seed=seed,
+            ants=args.ants,
+            max_steps=args.max_steps,
+            time_limit=args.time_limit,
+            width=args.width,
+            height=args.height,
+        )
+        for env in args.env
+        for strategy_file in args.strategy_file
+        for seed in range(args.seed_start, args.seed_start + args.seeds)
+    ]
+
+    output = open(args.output, "w") if args.output else None
+    results = []
+    try:
+        for result in run_batch(jobs, processes=args.processes or None):
+            results.append(result)
+            if output:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+            if not args.quiet:
+                status = (
+                    f"error: {result['error']}"
+                    if "error" in result
+                    else f"steps={result['steps']} "
+                    f"completion={result['completion_percentage']:.1f}% "
+                    f"time={result['time_taken']:.2f}s"
+                )
+                print(
+                    f"[{len(results)}/{len(jobs)}] {result['env']} "
+                    f"{result['strategy']} seed={result['seed']}: {status}"
+                )
+    finally:
+        if output:
+            output.close()
+
+    print_summary(aggregate_results(results))
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
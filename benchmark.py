@@ -0,0 +1,348 @@
+# Throughput benchmark suite for the simulation engine.
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from batch import percentile, strategy_label
+from environment import Environment
+from utils import create_environment, add_ants
+
+# Bump when the report layout changes
+REPORT_VERSION = 1
+DEFAULT_REPORT = "benchmark.json"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Synthetic large maps: name -> (generator, width, height)
+SYNTHETIC_ENVS = {
+    "large_simple": ("simple", 1000, 1000),
+    "large_maze": ("maze", 1000, 1000),
+}
+
+DEFAULT_ANT_COUNTS = (10, 100, 1000, 10000)
+
+# Built-in random strategy plus the strategy files shipped with the repo
+BUILTIN_STRATEGIES = (
+    "random",
+    "AntStrategy_collaborative2.py",
+    "non-cooperativeAgent.py",
+    "non-cooperativeAgent2.py",
+    "smartAgent.py",
+)
+
+# Per-step latency percentiles reported for every case
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class BenchmarkCase(NamedTuple):
+    """One measurement: environment x strategy x ant count"""
+
+    env: str  # Environment file or a SYNTHETIC_ENVS name
+    strategy_file: Optional[str]  # None runs the built-in random strategy
+    ants: int
+
+    @property
+    def key(self) -> str:
+        """Identifies the case across reports, used to match baselines"""
+        return f"{self.env}|{strategy_label(self.strategy_file)}|{self.ants}"
+
+
+def default_envs() -> List[str]:
+    """Bundled environment files followed by the synthetic large maps"""
+    files = sorted(glob.glob(os.path.join(BASE_DIR, "envs", "*.txt")))
+    return [os.path.relpath(path, BASE_DIR) for path in files] + list(SYNTHETIC_ENVS)
+
+
+def build_environment(env: str, seed: int) -> Environment:
+    if env in SYNTHETIC_ENVS:
+        generator, width, height = SYNTHETIC_ENVS[env]
+        return create_environment(generator, width, height, verbose=False, seed=seed)
+    path = env if os.path.isfile(env) else os.path.join(BASE_DIR, env)
+    return create_environment(path, 0, 0, verbose=False, seed=seed)
+
+
+def resolve_strategy(strategy_file: str) -> Optional[str]:
+    """Map 'random' to the built-in strategy and find bundled strategy files"""
+    if strategy_file == "random":
+        return None
+    if os.path.isfile(strategy_file):
+        return strategy_file
+    return os.path.join(BASE_DIR, strategy_file)
+
+
+def run_case(
+    case: BenchmarkCase,
+    steps: int = 100,
+    warmup: int = 10,
+    max_seconds: float = 30,
+    seed: int = 0,
+    pheromone_map: str = "sparse",
+    ant_store: bool = False,
+    lazy_perception: bool = False,
+) -> dict:
+    """Time the steps of a single case and return its report entry
+
+    Setup and warmup steps are not timed. Warmup and measurement each stop
+    early once they have run for max_seconds, so huge cases stay bounded.
+    """
+    result = {
+        "key": case.key,
+        "env": case.env,
+        "strategy": strategy_label(case.strategy_file),
+        "ants": case.ants,
+    }
+
+    try:
+        random.seed(seed)
+        environment = build_environment(case.env, seed)
+        environment.set_pheromone_map(pheromone_map)
+        if ant_store:
+            environment.enable_ant_store()
+        environment.lazy_perception = lazy_perception
+
+        # Strategies may print on every step, keep benchmark output clean
+        with contextlib.redirect_stdout(io.StringIO()):
+            add_ants(
+                environment, "random", case.strategy_file, case.ants, verbose=False
+            )
+
+            started = time.perf_counter()
+            for _ in range(warmup):
+                environment.update()
+                if max_seconds > 0 and time.perf_counter() - started >= max_seconds:
+                    break
+
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(steps):
+                step_start = time.perf_counter()
+                environment.update()
+                step_end = time.perf_counter()
+                latencies.append(step_end - step_start)
+                if max_seconds > 0 and step_end - started >= max_seconds:
+                    break
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    if not latencies:
+        result["error"] = "no steps timed"
+        return result
+
+    total = sum(latencies)
+    result["steps"] = len(latencies)
+    result["steps_per_second"] = len(latencies) / total if total > 0 else 0.0
+    result["ant_steps_per_second"] = result["steps_per_second"] * case.ants
+    result["latency_ms"] = {
+        "mean": statistics.fmean(latencies) * 1000,
+        **{
+            f"p{pct}": percentile(latencies, pct) * 1000
+            for pct in LATENCY_PERCENTILES
+        },
+        "max": max(latencies) * 1000,
+    }
+    return result
+
+
+def run_suite(cases: List[BenchmarkCase], verbose: bool = True, **options) -> dict:
+    """Run every case in order and return the full report"""
+    report = {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "results": [],
+    }
+    for index, case in enumerate(cases, 1):
+        result = run_case(case, **options)
+        report["results"].append(result)
+        if verbose:
+            print(f"[{index}/{len(cases)}] {format_result(result)}")
+    return report
+
+
+def format_result(result: dict) -> str:
+    if "error" in result:
+        return f"{result['key']}: error: {result['error']}"
+    latency = result["latency_ms"]
+    return (
+        f"{result['key']}: {result['steps_per_second']:.1f} steps/s "
+        f"p50={latency['p50']:.2f}ms p99={latency['p99']:.2f}ms "
+        f"({result['steps']} steps)"
+    )
+
+
+def compare_reports(
+    baseline: dict, current: dict, threshold: float = 0.1
+) -> List[Tuple[str, float, float, float]]:
+    """Cases whose steps/sec dropped by more than threshold against the baseline
+
+    Returns (key, baseline steps/sec, current steps/sec, relative change)
+    sorted by the worst regression first. Cases missing from either report
+    or failed in either are skipped.
+    """
+    baseline_rates = {
+        result["key"]: result["steps_per_second"]
+        for result in baseline.get("results", [])
+        if "error" not in result
+    }
+
+    regressions = []
+    for result in current["results"]:
+        before = baseline_rates.get(result["key"])
+        if "error" in result or not before:
+            continue
+        change = (result["steps_per_second"] - before) / before
+        if change < -threshold:
+            regressions.append(
+                (result["key"], before, result["steps_per_second"], change)
+            )
+    regressions.sort(key=lambda regression: regression[3])
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Measure simulation throughput and per-step latency"
+    )
+    parser.add_argument(
+        "--env",
+        type=str,
+        nargs="+",
+        help="Environment files or synthetic maps ("
+        + ", ".join(SYNTHETIC_ENVS)
+        + ") (default: envs/*.txt and every synthetic map)",
+    )
+    parser.add_argument(
+        "--strategy-file",
+        type=str,
+        nargs="+",
+        default=list(BUILTIN_STRATEGIES),
+        help="Strategy files, 'random' for the built-in strategy (default: every bundled strategy)",
+    )
+    parser.add_argument(
+        "--ants",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_ANT_COUNTS),
+        help="Ant counts to measure (default: 10 100 1000 10000)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=100,
+        help="Timed steps per case (default: 100)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=10,
+        help="Untimed steps before measuring (default: 10)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=30,
+        help="Stop warming up and timing a case after this many seconds each (default: 30, 0 = no limit)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed for every case (default: 0)"
+    )
+    parser.add_argument(
+        "--pheromone-map",
+        type=str,
+        choices=["sparse", "dense", "lazy"],
+        default="sparse",
+        help="Pheromone storage to benchmark (default: sparse)",
+    )
+    parser.add_argument(
+        "--ant-store",
+        action="store_true",
+        help="Benchmark with the structure-of-arrays ant store",
+    )
+    parser.add_argument(
+        "--lazy-perception",
+        action="store_true",
+        help="Benchmark with lazily computed perceptions",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=DEFAULT_REPORT,
+        help=f"JSON report to write (default: {DEFAULT_REPORT})",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Earlier JSON report to compare against, regressions exit with status 1",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="Steps/sec drop in percent that counts as a regression (default: 10)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print regressions")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    cases = [
+        BenchmarkCase(
+            env=env,
+            strategy_file=resolve_strategy(strategy_file),
+            ants=ants,
+        )
+        for env in args.env or default_envs()
+        for strategy_file in args.strategy_file
+        for ants in args.ants
+    ]
+
+    report = run_suite(
+        cases,
+        verbose=not args.quiet,
+        steps=args.steps,
+        warmup=args.warmup,
+        max_seconds=args.max_seconds,
+        seed=args.seed,
+        pheromone_map=args.pheromone_map,
+        ant_store=args.ant_store,
+        lazy_perception=args.lazy_perception,
+    )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if not args.quiet:
+        print(f"Report written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_reports(baseline, report, args.threshold / 100)
+    if not regressions:
+        if not args.quiet:
+            print(f"No regressions above {args.threshold:.1f}% against {args.baseline}")
+        return 0
+
+    print(f"{len(regressions)} regression(s) above {args.threshold:.1f}%:")
+    for key, before, after, change in regressions:
+        print(f"  {key}: {before:.1f} -> {after:.1f} steps/s ({change * 100:+.1f}%)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from enum import Enum
+import random
 from typing import Optional
 import math
 
@@ -66,6 +67,22 @@ class AntAction(Enum):
 class AntPerception:
     """Class representing what an ant can perceive from its environment"""
 
+    __slots__ = (
+        "visible_cells",
+        "food_pheromone",
+        "home_pheromone",
+        "nearby_ants",
+        "has_food",
+        "direction",
+        "home_pheromone_level",
+        "food_pheromone_level",
+        "pheromone_decrease_rate",
+        "food_collected",
+        "steps_taken",
+        "ant_id",
+        "rng",
+    )
+
     def __init__(self):
         self.visible_cells = {}
         self.food_pheromone = {}
@@ -81,6 +98,16 @@ class AntPerception:
         self.food_collected = 0
         self.steps_taken = 0
         self.ant_id = None
+        # The ant's own random stream in seeded runs, otherwise the random module.
+        # Strategies should draw from it so results don't depend on ant order
+        self.rng = random
+
+    def clear(self) -> None:
+        """Empty the perceived cells so the perception can be refilled in place"""
+        self.visible_cells.clear()
+        self.food_pheromone.clear()
+        self.home_pheromone.clear()
+        self.nearby_ants.clear()
 
     def can_see_food(self) -> bool:
         return TerrainType.FOOD in [cell for cell in self.visible_cells.values()]
@@ -134,3 +161,100 @@ class AntPerception:
         elif dx < 0 and dy < 0:
             return Direction.NORTHWEST.value
         return Direction.NORTH.value
+
+
+# Perception that reads the environment only when a field is first accessed
+class LazyAntPerception(AntPerception):
+    """AntPerception whose visible cells, pheromones and nearby ants are
+    computed from the environment on first access
+
+    Fields are read from the environment's state at access time, so they
+    should be used during the decision they were built for.
+    """
+
+    __slots__ = (
+        "_source",
+        "_cone",
+        "_offsets",
+        "_visible_cells",
+        "_food_pheromone",
+        "_home_pheromone",
+        "_nearby_ants",
+    )
+
+    def __init__(self):
+        self._source = None
+        self._cone = None
+        self._offsets = None
+        super().__init__()
+
+    def bind(self, environment, x: int, y: int, direction, vision_range, vision_angle):
+        """Back this perception with what an ant at (x, y) facing direction sees"""
+        self._source = (environment, x, y)
+        self._cone = (direction, vision_range, vision_angle)
+        self._offsets = None
+        self._visible_cells = None
+        self._food_pheromone = None
+        self._home_pheromone = None
+        self._nearby_ants = None
+
+    def clear(self) -> None:
+        """Nothing to empty, bind() resets every lazily computed field"""
+
+    def _visible_offsets(self):
+        if self._offsets is None:
+            environment, x, y = self._source
+            self._offsets = environment.visible_offsets(x, y, *self._cone)
+        return self._offsets
+
+    @property
+    def visible_cells(self) -> dict:
+        if self._visible_cells is None:
+            environment, x, y = self._source
+            self._visible_cells = environment.perceive_terrain(
+                x, y, self._visible_offsets()
+            )
+        return self._visible_cells
+
+    @visible_cells.setter
+    def visible_cells(self, value: dict) -> None:
+        self._visible_cells = value
+
+    @property
+    def food_pheromone(self) -> dict:
+        if self._food_pheromone is None:
+            environment, x, y = self._source
+            self._food_pheromone = environment.perceive_pheromone(
+                environment.food_pheromones, x, y, self._visible_offsets()
+            )
+        return self._food_pheromone
+
+    @food_pheromone.setter
+    def food_pheromone(self, value: dict) -> None:
+        self._food_pheromone = value
+
+    @property
+    def home_pheromone(self) -> dict:
+        if self._home_pheromone is None:
+            environment, x, y = self._source
+            self._home_pheromone = environment.perceive_pheromone(
+                environment.home_pheromones, x, y, self._visible_offsets()
+            )
+        return self._home_pheromone
+
+    @home_pheromone.setter
+    def home_pheromone(self, value: dict) -> None:
+        self._home_pheromone = value
+
+    @property
+    def nearby_ants(self) -> list:
+        if self._nearby_ants is None:
+            environment, x, y = self._source
+            self._nearby_ants = environment.perceive_ants(
+                x, y, self._visible_offsets()
+            )
+        return self._nearby_ants
+
+    @nearby_ants.setter
+    def nearby_ants(self, value: list) -> None:
+        self._nearby_ants = value
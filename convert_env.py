@@ -0,0 +1,63 @@
+# Convert environment files between the text and binary formats.
+
+import argparse
+import sys
+from typing import List, Optional
+
+from environment import EnvironmentBuilder
+from utils import create_environment
+
+BINARY_EXTENSION = ".envb"
+
+
+def convert_environment(
+    source: str, destination: str, binary: Optional[bool] = None, verbose: bool = True
+) -> bool:
+    """Load an environment file in either format and save it in the other
+
+    binary selects the output format, by default binary for the .envb
+    extension and text otherwise.
+    """
+    if binary is None:
+        binary = destination.endswith(BINARY_EXTENSION)
+
+    environment = create_environment(source, 0, 0, verbose=verbose)
+    if binary:
+        return EnvironmentBuilder.save_binary(environment, destination)
+    return EnvironmentBuilder.save_to_file(environment, destination)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert environment files between the text and binary formats"
+    )
+    parser.add_argument("source", help="Environment file to read, text or binary")
+    parser.add_argument(
+        "destination",
+        help=f"File to write, binary when it ends in {BINARY_EXTENSION}, "
+        "gzip-compressed text when it ends in .gz",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "binary"],
+        help="Output format (default: from the destination extension)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Suppress output")
+    args = parser.parse_args(argv)
+
+    binary = None if args.format is None else args.format == "binary"
+    try:
+        converted = convert_environment(
+            args.source, args.destination, binary, verbose=not args.quiet
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if converted and not args.quiet:
+        print(f"Wrote {args.destination}")
+    return 0 if converted else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
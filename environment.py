@@ -1,13 +1,23 @@
 from typing import Optional
-from ant import Ant
+from ant import Ant, AntStrategy
+from ant_store import AntStore, DIRECTIONS, DELTA_X, DELTA_Y
+import gzip
+import json
 import random
 import math
+import os
+import re
+import struct
+import time
+import numpy as np
 from common import (
     TerrainType,
     Direction,
     AntPerception,
+    LazyAntPerception,
     AntAction,
 )
+from update_stats import UpdateStats
 
 
 # Class for pheromone handling
@@ -29,12 +39,37 @@ class PheromoneMap:
             self.values[pos] = max(self.values.get(pos, 0), amount)
             self.modified_positions.add(pos)
 
+    def add_pheromones(self, xs, ys, amounts) -> None:
+        """Add pheromone at many positions at once, given as parallel arrays"""
+        for x, y, amount in zip(xs.tolist(), ys.tolist(), amounts.tolist()):
+            self.add_pheromone(x, y, amount)
+
     def get_value(self, x: int, y: int) -> float:
         """Get pheromone value at position (x, y)"""
         if 0 <= x < self.width and 0 <= y < self.height:
             return self.values.get((x, y), 0.0)
         return 0.0
 
+    def to_array(self) -> np.ndarray:
+        """All values as a (height, width) float64 array, indexed [y, x]"""
+        array = np.zeros((self.height, self.width), dtype=np.float64)
+        for (x, y), value in self.values.items():
+            array[y, x] = value
+        return array
+
+    def get_values(self, xs, ys) -> np.ndarray:
+        """Values at many positions on the map at once, given as parallel arrays"""
+        get = self.values.get
+        return np.array(
+            [get(pos, 0.0) for pos in zip(xs.tolist(), ys.tolist())],
+            dtype=np.float64,
+        )
+
+    def take_modified_positions(self) -> set:
+        """Positions deposited on or evaporated since the last call, then forget them"""
+        modified, self.modified_positions = self.modified_positions, set()
+        return modified
+
     def evaporate(self) -> None:
         """Evaporate pheromones"""
         # Create a list of positions to potentially remove
@@ -81,35 +116,421 @@ class PheromoneMap:
         return best_direction
 
 
+# Dense, array-backed pheromone map for large or pheromone-heavy environments
+class DensePheromoneMap(PheromoneMap):
+    def __init__(self, width: int, height: int, evaporation_rate: float = 0.999):
+        super().__init__(width, height, evaporation_rate)
+        # Row-major array indexed as values[y, x]
+        self.values = np.zeros((height, width), dtype=np.float64)
+        # Bounding box (x0, y0, x1, y1) of every cell ever deposited on,
+        # evaporation only touches this window
+        self.bounds = None
+
+    def add_pheromone(self, x: int, y: int, amount: float) -> None:
+        """Add pheromone at position (x, y)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            # Add maximum pheromone amount between current and new amount
+            if amount > self.values[y, x]:
+                self.values[y, x] = amount
+            self.modified_positions.add((x, y))
+
+            if self.bounds is None:
+                self.bounds = (x, y, x + 1, y + 1)
+            else:
+                x0, y0, x1, y1 = self.bounds
+                if not (x0 <= x < x1 and y0 <= y < y1):
+                    self.bounds = (
+                        min(x0, x),
+                        min(y0, y),
+                        max(x1, x + 1),
+                        max(y1, y + 1),
+                    )
+
+    def add_pheromones(self, xs, ys, amounts) -> None:
+        """Add pheromone at many positions at once, given as parallel arrays"""
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs, ys, amounts = xs[inside], ys[inside], amounts[inside]
+        if not xs.size:
+            return
+
+        np.maximum.at(self.values, (ys, xs), amounts)
+        self.modified_positions.update(zip(xs.tolist(), ys.tolist()))
+
+        x0, y0 = int(xs.min()), int(ys.min())
+        x1, y1 = int(xs.max()) + 1, int(ys.max()) + 1
+        if self.bounds is not None:
+            x0, y0 = min(x0, self.bounds[0]), min(y0, self.bounds[1])
+            x1, y1 = max(x1, self.bounds[2]), max(y1, self.bounds[3])
+        self.bounds = (x0, y0, x1, y1)
+
+    def get_value(self, x: int, y: int) -> float:
+        """Get pheromone value at position (x, y)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return float(self.values[y, x])
+        return 0.0
+
+    def to_array(self) -> np.ndarray:
+        return self.values.copy()
+
+    def get_values(self, xs, ys) -> np.ndarray:
+        return self.values[ys, xs]
+
+    def evaporate(self) -> None:
+        """Evaporate pheromones, dropping values below the cutoff in one pass"""
+        if self.bounds is None:
+            return
+
+        x0, y0, x1, y1 = self.bounds
+        window = self.values[y0:y1, x0:x1]
+        window *= self.evaporation_rate
+        window[window < 0.01] = 0.0
+
+
+# Pheromone map with lazy, timestamp-based decay for long runs
+class LazyPheromoneMap(PheromoneMap):
+    def __init__(self, width: int, height: int, evaporation_rate: float = 0.999):
+        super().__init__(width, height, evaporation_rate)
+        # Key is (x, y) tuple, value is (strength when written, step written, expiry step)
+        self.values = {}
+        self.now = 0
+        # Expiry step -> positions whose value falls below the cutoff at that step
+        self.expiry_buckets = {}
+
+    def _expiry_step(self, value: float) -> Optional[int]:
+        """First step after now at which value has decayed below the cutoff"""
+        rate = self.evaporation_rate
+        if not 0 < rate < 1:
+            return None
+
+        steps = 1
+        if value * rate >= 0.01:
+            steps = max(1, int(math.log(0.01 / value) / math.log(rate)))
+            # Correct for rounding in the logarithm
+            while value * rate**steps >= 0.01:
+                steps += 1
+            while steps > 1 and value * rate ** (steps - 1) < 0.01:
+                steps -= 1
+        return self.now + steps
+
+    def add_pheromone(self, x: int, y: int, amount: float) -> None:
+        """Add pheromone at position (x, y)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            pos = (x, y)
+            # Add maximum pheromone amount between current and new amount
+            value = max(self.get_value(x, y), amount)
+            expires = self._expiry_step(value)
+            self.values[pos] = (value, self.now, expires)
+            if expires is not None:
+                self.expiry_buckets.setdefault(expires, []).append(pos)
+            self.modified_positions.add(pos)
+
+    def get_value(self, x: int, y: int) -> float:
+        """Get pheromone value at position (x, y), decayed up to the current step"""
+        entry = self.values.get((x, y))
+        if entry is None:
+            return 0.0
+        value, stamp, _ = entry
+        if stamp == self.now:
+            return value
+        return value * self.evaporation_rate ** (self.now - stamp)
+
+    def to_array(self) -> np.ndarray:
+        array = np.zeros((self.height, self.width), dtype=np.float64)
+        for x, y in self.values:
+            array[y, x] = self.get_value(x, y)
+        return array
+
+    def get_values(self, xs, ys) -> np.ndarray:
+        get_value = self.get_value
+        return np.array(
+            [get_value(x, y) for x, y in zip(xs.tolist(), ys.tolist())],
+            dtype=np.float64,
+        )
+
+    def evaporate(self) -> None:
+        """Advance one step and reclaim the cells that expire on it"""
+        self.now += 1
+        expired = self.expiry_buckets.pop(self.now, None)
+        if expired is None:
+            return
+
+        for pos in expired:
+            entry = self.values.get(pos)
+            # Skip positions that were rewritten since this expiry was scheduled
+            if entry is not None and entry[2] == self.now:
+                del self.values[pos]
+
+
+# Terrain types indexed by their value, for lookups in the effective terrain layer
+TERRAIN_TYPES = tuple(sorted(TerrainType, key=lambda terrain: terrain.value))
+
+
+# Pheromone map implementations selectable per environment
+PHEROMONE_MAP_TYPES = {
+    "sparse": PheromoneMap,
+    "dense": DensePheromoneMap,
+    "lazy": LazyPheromoneMap,
+}
+
+
+def _decides_in_batch(strategy: AntStrategy) -> bool:
+    """Whether a strategy overrides the batch decision hook"""
+    return type(strategy).decide_actions is not AntStrategy.decide_actions
+
+
+# Vision cone tables shared by all ants
+# Key is (direction, vision_range, vision_angle), value is a tuple of
+# (dx, dy, line_of_sight) where line_of_sight lists the intermediate offsets
+_vision_cones = {}
+
+
+def get_vision_cone(direction: Direction, vision_range: int, vision_angle: float):
+    """Get the offsets visible from a cell facing direction, ignoring walls"""
+    key = (direction, vision_range, vision_angle)
+    cone = _vision_cones.get(key)
+    if cone is None:
+        cone = _build_vision_cone(direction, vision_range, vision_angle)
+        _vision_cones[key] = cone
+    return cone
+
+
+def _build_vision_cone(direction: Direction, vision_range: int, vision_angle: float):
+    # Get ant's direction vector, normalized
+    dir_dx, dir_dy = Direction.get_delta(direction)
+    dir_magnitude = math.sqrt(dir_dx * dir_dx + dir_dy * dir_dy)
+    if dir_magnitude > 0:
+        dir_dx, dir_dy = dir_dx / dir_magnitude, dir_dy / dir_magnitude
+    half_vision_angle = vision_angle / 2
+
+    cone = []
+    for dx in range(-vision_range, vision_range + 1):
+        for dy in range(-vision_range, vision_range + 1):
+            if dx == 0 and dy == 0:
+                continue
+
+            # If point is too far, it's not in vision field
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance > vision_range:
+                continue
+
+            # Calculate angle between ant's direction and point
+            point_dx, point_dy = dx / distance, dy / distance
+            dot_product = dir_dx * point_dx + dir_dy * point_dy
+            dot_product = max(-1.0, min(1.0, dot_product))
+            angle = math.degrees(math.acos(dot_product))
+            if angle > half_vision_angle:
+                continue
+
+            # Intermediate cells for the line-of-sight check, adjacent cells
+            # are always visible
+            line_of_sight = []
+            if abs(dx) > 1 or abs(dy) > 1:
+                steps = max(abs(dx), abs(dy))
+                step_x = dx / steps
+                step_y = dy / steps
+                for step in range(1, steps):
+                    line_of_sight.append(
+                        (math.floor(step * step_x), math.floor(step * step_y))
+                    )
+
+            cone.append((dx, dy, tuple(line_of_sight)))
+
+    return tuple(cone)
+
+
+# Decoded visibility masks, key is (cone, mask), value is the visible (dx, dy) offsets
+_visible_offsets = {}
+
+
+def get_visible_offsets(cone, mask: int):
+    """Get the offsets of a vision cone selected by a visibility bitmask"""
+    key = (cone, mask)
+    offsets = _visible_offsets.get(key)
+    if offsets is None:
+        offsets = tuple(
+            (dx, dy) for i, (dx, dy, _) in enumerate(cone) if mask >> i & 1
+        )
+        _visible_offsets[key] = offsets
+    return offsets
+
+
+# Runs of wall cells in a terrain row
+_WALL_RUN = re.compile(bytes([TerrainType.WALL.value]) + b"+")
+
+
 # Environment class to represent the world
 class Environment:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, pheromone_map: str = "sparse"):
         self.width = width
         self.height = height
-        self.grid = [
-            [TerrainType.EMPTY.value for _ in range(width)] for _ in range(height)
-        ]
-        self.food_amounts = [[0 for _ in range(width)] for _ in range(height)]
-        self.home_pheromones = PheromoneMap(width, height)
-        self.food_pheromones = PheromoneMap(width, height)
+        self.grid = [[TerrainType.EMPTY.value] * width for _ in range(height)]
+        self.food_amounts = [[0] * width for _ in range(height)]
+        # Effective terrain layer: grid values with the colony radius painted in,
+        # one bytearray row per y
+        self.terrain = [bytearray(width) for _ in range(height)]
+        self.colony_area = set()
+        self.pheromone_map = pheromone_map
+        self.home_pheromones = self._create_pheromone_map()
+        self.food_pheromones = self._create_pheromone_map()
         self.ants = []
+        # Optional structure-of-arrays ant storage, see enable_ant_store()
+        self.ant_store = None
+        # Boolean wall array, only maintained while the ant store is enabled
+        self.wall_mask = None
+        # Occupancy index: (x, y) -> ants standing there, in arrival order
+        self.ant_cells = {}
+        # Line-of-sight cache: (direction, vision_range, vision_angle) ->
+        # {(x, y): bitmask of the cone offsets visible from that cell}
+        self.visibility_masks = {}
         self.colony_positions = []
         self.colony_radius = 2  # This creates a 5x5 area (radius 2 around center point)
         self.food_positions = set()
+        # Wall index, kept current by add_wall* and rebuild_terrain
+        self.wall_positions = set()
+        # Cells whose effective terrain changed since take_terrain_changes(),
+        # bulk edits bump terrain_version instead
+        self.terrain_changes = set()
+        self.terrain_version = 0
         self.initial_food_amount = 0
         self.food_collected = 0
         self.steps = 0
         self.pheromones_enabled = True
+        # Build perceptions that read the environment on first access
+        self.lazy_perception = False
+        # Run seed, when set every ant added gets its own random stream
+        self.seed = None
+        # Per-phase update timings, None unless enabled with enable_stats()
+        self.stats = None
+        # Trajectory recorder fed every step, see trajectory.TrajectoryRecorder
+        self.recorder = None
         self.next_ant_id = 1  # For tracking sequential ant IDs
 
+    def __getstate__(self) -> dict:
+        # Caches, profiling and recording are rebuilt on demand, not
+        # simulation state
+        state = self.__dict__.copy()
+        # Rows memory-mapped by load_binary are stored as plain rows
+        if self.grid and isinstance(self.grid[0], memoryview):
+            state["grid"] = [row.tolist() for row in self.grid]
+            state["food_amounts"] = [row.tolist() for row in self.food_amounts]
+        if self.terrain and isinstance(self.terrain[0], memoryview):
+            state["terrain"] = [bytearray(row) for row in self.terrain]
+        state["visibility_masks"] = {}
+        state["stats"] = None
+        state["recorder"] = None
+        return state
+
+    def _create_pheromone_map(self, evaporation_rate: float = 0.999) -> PheromoneMap:
+        if self.pheromone_map not in PHEROMONE_MAP_TYPES:
+            raise ValueError(f"Unknown pheromone map type: {self.pheromone_map}")
+        map_class = PHEROMONE_MAP_TYPES[self.pheromone_map]
+        return map_class(self.width, self.height, evaporation_rate)
+
+    def set_pheromone_map(self, pheromone_map: str) -> None:
+        """Switch pheromone storage type (sparse, dense or lazy), should be called before the simulation starts"""
+        self.pheromone_map = pheromone_map
+        self.home_pheromones = self._create_pheromone_map(
+            self.home_pheromones.evaporation_rate
+        )
+        self.food_pheromones = self._create_pheromone_map(
+            self.food_pheromones.evaporation_rate
+        )
+
     def disable_pheromones(self) -> None:
         self.pheromones_enabled = False
-        self.home_pheromones = PheromoneMap(self.width, self.height)
-        self.food_pheromones = PheromoneMap(self.width, self.height)
+        self.home_pheromones = self._create_pheromone_map()
+        self.food_pheromones = self._create_pheromone_map()
 
     def add_wall(self, x: int, y: int) -> None:
         if self.is_valid_position(x, y):
             self.grid[y][x] = TerrainType.WALL.value
+            self.wall_positions.add((x, y))
+            self._refresh_terrain(x, y)
+            self._invalidate_visibility(x, y)
+            if self.wall_mask is not None:
+                self.wall_mask[y, x] = True
+
+    def add_wall_rect(self, x: int, y: int, width: int, height: int) -> None:
+        """Turn a rectangle into walls with one slice write per row, clipped to the map"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + width), min(self.height, y + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Bytes slices assign into list and memory-mapped rows alike
+        row_bytes = bytes([TerrainType.WALL.value]) * (x1 - x0)
+        columns = range(x0, x1)
+        for row in range(y0, y1):
+            self.grid[row][x0:x1] = row_bytes
+            self.terrain[row][x0:x1] = row_bytes
+            self.wall_positions.update(zip(columns, [row] * len(columns)))
+        self._terrain_replaced()
+        self._invalidate_visibility_rect(x0, y0, x1 - 1, y1 - 1)
+        if self.wall_mask is not None:
+            self.wall_mask[y0:y1, x0:x1] = True
+
+    def add_wall_line(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Add walls on the cells of a line, both ends included"""
+        if x1 == x2 or y1 == y2:
+            self.add_wall_rect(
+                min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1
+            )
+            return
+
+        # Bresenham's line for diagonal walls
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        step_x = 1 if x2 > x1 else -1
+        step_y = 1 if y2 > y1 else -1
+        error = dx + dy
+        x, y = x1, y1
+        while True:
+            self.add_wall(x, y)
+            if x == x2 and y == y2:
+                break
+            doubled = 2 * error
+            if doubled >= dy:
+                error += dy
+                x += step_x
+            if doubled <= dx:
+                error += dx
+                y += step_y
+
+    def _invalidate_visibility(self, x: int, y: int) -> None:
+        """Drop cached visibility masks of cells that can see position (x, y)"""
+        self._invalidate_visibility_rect(x, y, x, y)
+
+    def _invalidate_visibility_rect(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Drop cached visibility masks of cells that can see into a rectangle"""
+        for (_, vision_range, _), masks in self.visibility_masks.items():
+            if not masks:
+                continue
+            for cell_y in range(y0 - vision_range, y1 + vision_range + 1):
+                for cell_x in range(x0 - vision_range, x1 + vision_range + 1):
+                    masks.pop((cell_x, cell_y), None)
+
+    def _compute_visibility_mask(self, x: int, y: int, cone) -> int:
+        """Bitmask of the cone offsets that are on the map and not hidden by walls"""
+        grid = self.grid
+        mask = 0
+        for i, (dx, dy, line_of_sight) in enumerate(cone):
+            if not self.is_valid_position(x + dx, y + dy):
+                continue
+
+            # Line-of-sight check over the precomputed intermediate cells
+            is_blocked = False
+            for step_dx, step_dy in line_of_sight:
+                check_step_x = x + step_dx
+                check_step_y = y + step_dy
+                if (
+                    self.is_valid_position(check_step_x, check_step_y)
+                    and grid[check_step_y][check_step_x] == TerrainType.WALL.value
+                ):
+                    is_blocked = True
+                    break
+
+            if not is_blocked:
+                mask |= 1 << i
+        return mask
 
     def add_food(self, x: int, y: int, amount: int = 1) -> None:
         if self.is_valid_position(x, y) and self.grid[y][x] == TerrainType.EMPTY.value:
@@ -117,13 +538,30 @@ class Environment:
             self.food_amounts[y][x] += amount
             self.food_positions.add((x, y))
             self.initial_food_amount += amount
+            self._refresh_terrain(x, y)
 
     def add_food_area(
         self, x: int, y: int, width: int, height: int, amount: int = 1
     ) -> None:
-        for i in range(width):
-            for j in range(height):
-                self.add_food(x + i, y + j, amount)
+        """add_food on every empty cell of a rectangle, clipped to the map"""
+        empty, food = TerrainType.EMPTY.value, TerrainType.FOOD.value
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + width), min(self.height, y + height)
+
+        added = 0
+        for row in range(y0, y1):
+            grid_row = self.grid[row]
+            amounts = self.food_amounts[row]
+            terrain_row = self.terrain[row]
+            for column in range(x0, x1):
+                if grid_row[column] == empty:
+                    grid_row[column] = food
+                    amounts[column] += amount
+                    terrain_row[column] = food
+                    self.food_positions.add((column, row))
+                    added += amount
+        self.initial_food_amount += added
+        self._terrain_replaced()
 
     def remove_food(self, x: int, y: int) -> bool:
         if (
@@ -136,6 +574,7 @@ class Environment:
             if self.food_amounts[y][x] == 0:
                 self.grid[y][x] = TerrainType.EMPTY.value
                 self.food_positions.discard((x, y))
+                self._refresh_terrain(x, y)
 
             return True
 
@@ -145,9 +584,114 @@ class Environment:
         if self.is_valid_position(x, y) and self.grid[y][x] == TerrainType.EMPTY.value:
             self.grid[y][x] = TerrainType.COLONY.value
             self.colony_positions.append((x, y))
+            self._paint_colony(x, y)
+
+    def _colony_cells(self, colony_x: int, colony_y: int) -> list:
+        """Cells within colony_radius of a colony, clipped to the map"""
+        radius = self.colony_radius
+        return [
+            (x, y)
+            for y in range(
+                max(0, colony_y - radius), min(self.height, colony_y + radius + 1)
+            )
+            for x in range(
+                max(0, colony_x - radius), min(self.width, colony_x + radius + 1)
+            )
+        ]
+
+    def _paint_colony(self, colony_x: int, colony_y: int) -> None:
+        for x, y in self._colony_cells(colony_x, colony_y):
+            self.colony_area.add((x, y))
+            self._refresh_terrain(x, y)
+
+    def _refresh_terrain(self, x: int, y: int) -> None:
+        """Recompute the effective terrain of a single cell"""
+        value = self.grid[y][x]
+        # Inside the colony radius everything but food and walls counts as colony
+        if (
+            value != TerrainType.FOOD.value
+            and value != TerrainType.WALL.value
+            and (x, y) in self.colony_area
+        ):
+            value = TerrainType.COLONY.value
+        self.terrain[y][x] = value
+        self.terrain_changes.add((x, y))
+
+    def _terrain_replaced(self) -> None:
+        """Record a bulk terrain change, superseding the per-cell changes"""
+        self.terrain_version += 1
+        self.terrain_changes = set()
+
+    def take_terrain_changes(self) -> set:
+        """Cells whose terrain changed since the last call, then forget them"""
+        changes, self.terrain_changes = self.terrain_changes, set()
+        return changes
+
+    def rebuild_terrain(self) -> None:
+        """Rebuild the terrain layer, wall index, wall mask and line-of-sight
+        cache after direct grid or colony_radius changes"""
+        self.terrain = [bytearray(row) for row in self.grid]
+        self.wall_positions = set()
+        for y, row in enumerate(self.terrain):
+            for match in _WALL_RUN.finditer(row):
+                columns = range(match.start(), match.end())
+                self.wall_positions.update(zip(columns, [y] * len(columns)))
+        self.colony_area = set()
+        for colony_x, colony_y in self.colony_positions:
+            self._paint_colony(colony_x, colony_y)
+        self._terrain_replaced()
+        self.visibility_masks = {}
+        if self.wall_mask is not None:
+            self.wall_mask = np.array(self.grid) == TerrainType.WALL.value
+
+    def ant_rng(self, ant_id: int) -> random.Random:
+        """Random stream of one ant, independent of the order ants act in"""
+        return random.Random(f"{self.seed}:ant:{ant_id}")
 
     def add_ant(self, ant) -> None:
+        if self.seed is not None and ant.rng is None:
+            ant.rng = self.ant_rng(ant.id)
+        if self.ant_store is not None:
+            ant = self.ant_store.attach(ant)
         self.ants.append(ant)
+        self._occupy(ant, int(ant.x), int(ant.y))
+
+    def enable_ant_store(self) -> None:
+        """Keep ant state in arrays and execute each tick's actions in batch
+
+        Ants in self.ants are replaced by AntView objects backed by the store.
+        In this mode every ant perceives the world as it was at the start of
+        the tick, then all actions are applied together.
+        """
+        if self.ant_store is not None:
+            return
+
+        self.ant_store = AntStore(capacity=len(self.ants))
+        self.ants = [self.ant_store.attach(ant) for ant in self.ants]
+        self.wall_mask = np.array(self.grid) == TerrainType.WALL.value
+        self.rebuild_occupancy()
+
+    def _occupy(self, ant, x: int, y: int) -> None:
+        cell = self.ant_cells.get((x, y))
+        if cell is None:
+            self.ant_cells[(x, y)] = cell = {}
+        cell[ant] = None
+
+    def _vacate(self, ant, x: int, y: int) -> None:
+        cell = self.ant_cells.get((x, y))
+        if cell is not None:
+            cell.pop(ant, None)
+            if not cell:
+                del self.ant_cells[(x, y)]
+
+    def rebuild_occupancy(self) -> None:
+        """Rebuild the occupancy index after ant positions were changed directly"""
+        self.ant_cells = {}
+        for ant in self.ants:
+            self._occupy(ant, int(ant.x), int(ant.y))
+
+    def count_ants_at(self, x: int, y: int) -> int:
+        return len(self.ant_cells.get((x, y), ()))
 
     def is_valid_position(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -157,39 +701,283 @@ class Environment:
             self.is_valid_position(x, y) and self.grid[y][x] != TerrainType.WALL.value
         )
 
+    def terrain_array(self) -> np.ndarray:
+        """Effective terrain values as a (height, width) uint8 array, indexed [y, x]"""
+        return np.frombuffer(b"".join(self.terrain), dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+
     def get_terrain(self, x: int, y: int) -> Optional[TerrainType]:
-        if self.is_valid_position(x, y):
-            # Check if the position is within the colony radius
-            for colony_x, colony_y in self.colony_positions:
-                # Check if the position is within the colony radius
-                if (
-                    abs(x - colony_x) <= self.colony_radius
-                    and abs(y - colony_y) <= self.colony_radius
-                ):
-                    if self.grid[y][x] == TerrainType.FOOD.value:
-                        return TerrainType.FOOD
-                    elif self.grid[y][x] == TerrainType.WALL.value:
-                        return TerrainType.WALL
-                    return TerrainType.COLONY
-
-            # If not in colony radius, return the actual terrain
-            return TerrainType(self.grid[y][x])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return TERRAIN_TYPES[self.terrain[y][x]]
         return None
 
+    def enable_stats(self) -> UpdateStats:
+        """Start timing each phase of update(), see UpdateStats"""
+        if self.stats is None:
+            self.stats = UpdateStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        self.stats = None
+
     def update(self) -> None:
+        stats = self.stats
         if self.pheromones_enabled:
+            if stats is not None:
+                start = time.perf_counter()
             self.home_pheromones.evaporate()
             self.food_pheromones.evaporate()
+            if stats is not None:
+                stats.add("evaporate", time.perf_counter() - start, 2)
+
+        if self.ant_store is not None:
+            self._update_batched(stats)
+        else:
+            self._update_sequential(stats)
+
+        self.steps += 1
+        if stats is not None:
+            stats.steps += 1
+
+        if self.recorder is not None:
+            self.recorder.record_step(self)
+
+    def _update_sequential(self, stats: Optional[UpdateStats] = None) -> None:
+        """Let each ant perceive, decide and act in turn
+
+        Ants whose strategy implements decide_actions are grouped per strategy
+        instance and decided in one call after the other ants have acted.
+        With stats, perception, decisions and execution are timed.
+        """
+        clock = time.perf_counter
+        perceiving = executing = 0.0
+        batches = {}
         for ant in self.ants:
+            if ant.strategy is not None and _decides_in_batch(ant.strategy):
+                batches.setdefault(id(ant.strategy), []).append(ant)
+                continue
+
+            if stats is not None:
+                start = clock()
             perception = self.get_perception_for_ant(ant)
+            if stats is not None:
+                perceived_at = clock()
             action = ant.decide_action(perception)
+            if stats is not None:
+                decided_at = clock()
             self.execute_action(ant, action)
+            if stats is not None:
+                executing += clock() - decided_at
+                perceiving += perceived_at - start
+                stats.add_decisions(ant.strategy, decided_at - perceived_at)
+
+        for ants in batches.values():
+            if stats is not None:
+                start = clock()
+            perceptions = [self.get_perception_for_ant(ant) for ant in ants]
+            if stats is not None:
+                perceived_at = clock()
+            actions = ants[0].strategy.decide_actions(perceptions)
+            if stats is not None:
+                decided_at = clock()
+            for ant, action in zip(ants, actions):
+                ant.steps_taken += 1
+                self.execute_action(ant, action)
+            if stats is not None:
+                executing += clock() - decided_at
+                perceiving += perceived_at - start
+                stats.add_decisions(
+                    ants[0].strategy, decided_at - perceived_at, len(ants)
+                )
+
+        if stats is not None:
+            stats.add("perception", perceiving, len(self.ants))
+            stats.add("execute", executing, len(self.ants))
+
+    def _update_batched(self, stats: Optional[UpdateStats] = None) -> None:
+        """Gather every ant's action for the tick, then apply them in batch
+
+        With stats, the three passes are timed as perception, decide and execute.
+        """
+        if stats is not None:
+            start = time.perf_counter()
+        store = self.ant_store
+        count = store.count
+        actions = np.full(count, AntAction.NO_ACTION.value, dtype=np.int8)
+        deciding = np.zeros(count, dtype=np.int64)
+        # id(strategy) -> (strategy, ant indices, perceptions)
+        batches = {}
+
+        # Read the state columns once per tick instead of through each view
+        columns = zip(
+            self.ants,
+            store.x[:count].tolist(),
+            store.y[:count].tolist(),
+            store.direction[:count].tolist(),
+            store.has_food[:count].tolist(),
+            store.home_pheromone[:count].tolist(),
+            store.food_pheromone[:count].tolist(),
+            store.pheromone_decrease_rate[:count].tolist(),
+            store.food_collected[:count].tolist(),
+            store.steps_taken[:count].tolist(),
+        )
+        for i, (ant, x, y, direction, *state) in enumerate(columns):
+            if ant.strategy is None:
+                continue
+
+            perception = self._new_perception(ant)
+            (
+                perception.has_food,
+                perception.home_pheromone_level,
+                perception.food_pheromone_level,
+                perception.pheromone_decrease_rate,
+                perception.food_collected,
+                perception.steps_taken,
+            ) = state
+            perception.direction = DIRECTIONS[direction]
+            perception.ant_id = ant.id
+            perception.rng = ant.rng or random
+            self._fill_perception(
+                perception,
+                x,
+                y,
+                perception.direction,
+                ant.vision_range,
+                ant.vision_angle,
+            )
+
+            batch = batches.get(id(ant.strategy))
+            if batch is None:
+                batch = batches[id(ant.strategy)] = (ant.strategy, [], [])
+            batch[1].append(i)
+            batch[2].append(perception)
+            deciding[i] = 1
+
+        if stats is not None:
+            perceived_at = time.perf_counter()
+            perceived = sum(len(indices) for _, indices, _ in batches.values())
+            stats.add("perception", perceived_at - start, perceived)
+
+        # One decision call per strategy instance
+        for strategy, indices, perceptions in batches.values():
+            decided = strategy.decide_actions(perceptions)
+            actions[indices] = [action.value for action in decided]
+            if stats is not None:
+                decided_at = time.perf_counter()
+                stats.add_decisions(strategy, decided_at - perceived_at, len(indices))
+                perceived_at = decided_at
+
+        if stats is not None:
+            start = time.perf_counter()
+        store.steps_taken[:count] += deciding
+        self.execute_actions(actions)
+        if stats is not None:
+            stats.add("execute", time.perf_counter() - start, count)
+
+    def execute_actions(self, actions) -> None:
+        """Apply one action per stored ant, given as an array of AntAction values"""
+        if self.recorder is not None:
+            self.recorder.record_actions(actions)
+        store = self.ant_store
+        count = store.count
+        x, y = store.x[:count], store.y[:count]
+        direction = store.direction[:count]
+        has_food = store.has_food[:count]
+
+        # Turns
+        turning = actions == AntAction.TURN_LEFT.value
+        direction[turning] = (direction[turning] - 1) % 8
+        turning = actions == AntAction.TURN_RIGHT.value
+        direction[turning] = (direction[turning] + 1) % 8
+
+        # Moves, blocked by walls and map edges
+        moving = np.flatnonzero(actions == AntAction.MOVE_FORWARD.value)
+        if moving.size:
+            new_x = x[moving] + DELTA_X[direction[moving]]
+            new_y = y[moving] + DELTA_Y[direction[moving]]
+            walkable = (new_x >= 0) & (new_x < self.width)
+            walkable &= (new_y >= 0) & (new_y < self.height)
+            walkable[walkable] = ~self.wall_mask[new_y[walkable], new_x[walkable]]
+            moving, new_x, new_y = moving[walkable], new_x[walkable], new_y[walkable]
+
+            for i, old_x, old_y, to_x, to_y in zip(
+                moving.tolist(),
+                x[moving].tolist(),
+                y[moving].tolist(),
+                new_x.tolist(),
+                new_y.tolist(),
+            ):
+                ant = self.ants[i]
+                self._vacate(ant, old_x, old_y)
+                self._occupy(ant, to_x, to_y)
+            x[moving] = new_x
+            y[moving] = new_y
+
+        # Pick-ups compete for the same food, so they are resolved in ant order
+        picking = np.flatnonzero((actions == AntAction.PICK_UP_FOOD.value) & ~has_food)
+        for i, food_x, food_y in zip(
+            picking.tolist(), x[picking].tolist(), y[picking].tolist()
+        ):
+            if self.get_terrain(food_x, food_y) == TerrainType.FOOD:
+                has_food[i] = self.remove_food(food_x, food_y)
+
+        # Drops at the colony
+        dropping = np.flatnonzero((actions == AntAction.DROP_FOOD.value) & has_food)
+        if dropping.size:
+            at_colony = np.array(
+                [
+                    self.get_terrain(drop_x, drop_y) == TerrainType.COLONY
+                    for drop_x, drop_y in zip(
+                        x[dropping].tolist(), y[dropping].tolist()
+                    )
+                ],
+                dtype=bool,
+            )
+            dropping = dropping[at_colony]
+            has_food[dropping] = False
+            store.food_collected[dropping] += 1
+            store.home_pheromone[dropping] = 100.0
+            store.food_pheromone[dropping] = 100.0
+            self.food_collected += dropping.size
+
+        # Pheromone deposits, drawing on the food level while carrying food
+        if self.pheromones_enabled:
+            for action, pheromones in (
+                (AntAction.DEPOSIT_HOME_PHEROMONE, self.home_pheromones),
+                (AntAction.DEPOSIT_FOOD_PHEROMONE, self.food_pheromones),
+            ):
+                depositing = np.flatnonzero(actions == action.value)
+                if not depositing.size:
+                    continue
 
-        self.steps += 1
+                carrying = has_food[depositing]
+                amounts = np.where(
+                    carrying,
+                    store.food_pheromone[depositing],
+                    store.home_pheromone[depositing],
+                )
+                rates = store.pheromone_decrease_rate[depositing]
+                store.food_pheromone[depositing[carrying]] *= rates[carrying]
+                store.home_pheromone[depositing[~carrying]] *= rates[~carrying]
+                pheromones.add_pheromones(x[depositing], y[depositing], amounts)
+
+    def _new_perception(self, ant: Ant) -> AntPerception:
+        """The ant's perception buffer emptied for refilling, or a fresh perception"""
+        perception_class = LazyAntPerception if self.lazy_perception else AntPerception
+        if ant.strategy is not None and ant.strategy.keeps_perceptions:
+            return perception_class()
+
+        perception = ant.perception_buffer
+        if type(perception) is not perception_class:
+            perception = ant.perception_buffer = perception_class()
+        else:
+            perception.clear()
+        return perception
 
     def get_perception_for_ant(self, ant: Ant) -> AntPerception:
 
-        perception = AntPerception()
+        perception = self._new_perception(ant)
         perception.has_food = ant.has_food
         perception.direction = ant.direction
         perception.home_pheromone_level = ant.home_pheromone
@@ -198,117 +986,118 @@ class Environment:
         perception.food_collected = ant.food_collected
         perception.steps_taken = ant.steps_taken
         perception.ant_id = ant.id
+        perception.rng = ant.rng or random
+
+        self._fill_perception(
+            perception,
+            int(ant.x),
+            int(ant.y),
+            ant.direction,
+            ant.vision_range,
+            ant.vision_angle,
+        )
+        return perception
 
-        current_terrain = self.get_terrain(int(ant.x), int(ant.y))
-        if current_terrain is not None:
-            perception.visible_cells[(0, 0)] = current_terrain
-
-        for dx in range(-ant.vision_range, ant.vision_range + 1):
-            for dy in range(-ant.vision_range, ant.vision_range + 1):
-                if dx == 0 and dy == 0:
-                    continue
-
-                check_x = int(ant.x + dx)
-                check_y = int(ant.y + dy)
-
-                # Check if the point is within the ant's vision field based on distance and angle
-
-                # Calculate distance
-                distance = math.sqrt(dx * dx + dy * dy)
-
-                # If point is too far, it's not in vision field
-                if distance > ant.vision_range:
-                    continue
-
-                # Get ant's direction vector
-                dir_dx, dir_dy = Direction.get_delta(ant.direction)
-
-                # Calculate angle between ant's direction and point
-                # First normalize vectors
-                if distance > 0:
-                    point_dx, point_dy = dx / distance, dy / distance
-                else:
-                    # If distance is 0, point is at ant's position (already handled with continue above)
-                    continue
-
-                dir_magnitude = math.sqrt(dir_dx * dir_dx + dir_dy * dir_dy)
-                if dir_magnitude > 0:
-                    dir_dx, dir_dy = dir_dx / dir_magnitude, dir_dy / dir_magnitude
-
-                # Calculate dot product
-                dot_product = dir_dx * point_dx + dir_dy * point_dy
-
-                # Clamp to valid range for acos
-                dot_product = max(-1.0, min(1.0, dot_product))
-
-                # Calculate angle in degrees
-                angle = math.degrees(math.acos(dot_product))
-
-                # Check if angle is within vision field
-                half_vision_angle = ant.vision_angle / 2
-                if angle > half_vision_angle:
-                    continue
-
-                is_blocked = False
-
-                # Simple line-of-sight check
-                if (
-                    abs(dx) > 1 or abs(dy) > 1
-                ):  # Skip line-of-sight check for adjacent cells (they're always visible)
-                    # Calculate steps for line-of-sight check
-                    steps = max(abs(dx), abs(dy))
-                    step_x = dx / steps
-                    step_y = dy / steps
-
-                    # Check each step along the line of sight
-                    for step in range(1, steps):
-                        check_step_x = int(ant.x + step * step_x)
-                        check_step_y = int(ant.y + step * step_y)
-
-                        if (
-                            self.is_valid_position(check_step_x, check_step_y)
-                            and self.grid[check_step_y][check_step_x]
-                            == TerrainType.WALL.value
-                        ):
-                            is_blocked = True
-                            break
-
-                if is_blocked:
-                    continue
+    def _fill_perception(
+        self,
+        perception: AntPerception,
+        x: int,
+        y: int,
+        direction: Direction,
+        vision_range: int,
+        vision_angle: float,
+    ) -> None:
+        """Fill in what an ant at (x, y) facing direction can see"""
+        if self.lazy_perception:
+            perception.bind(self, x, y, direction, vision_range, vision_angle)
+            return
 
-                # If valid position and not blocked, add to visible cells
-                if self.is_valid_position(check_x, check_y):
-                    terrain = self.grid[check_y][check_x]
-                    # Convert integer value to TerrainType enum for consistency
-                    perception.visible_cells[(dx, dy)] = TerrainType(terrain)
+        grid = self.grid
 
-                    # Also add pheromone information
-                    perception.food_pheromone[(dx, dy)] = (
-                        self.food_pheromones.get_value(check_x, check_y)
-                    )
-                    perception.home_pheromone[(dx, dy)] = (
-                        self.home_pheromones.get_value(check_x, check_y)
-                    )
+        current_terrain = self.get_terrain(x, y)
+        if current_terrain is not None:
+            perception.visible_cells[(0, 0)] = current_terrain
 
-                    # Check for other ants
-                    for other_ant in self.ants:
-                        if (
-                            other_ant != ant
-                            and int(other_ant.x) == check_x
-                            and int(other_ant.y) == check_y
-                        ):
-                            perception.nearby_ants.append(
-                                ((dx, dy), other_ant.has_food)
-                            )
-                            break
-        return perception
+        for dx, dy in self.visible_offsets(x, y, direction, vision_range, vision_angle):
+            check_x = x + dx
+            check_y = y + dy
+
+            terrain = grid[check_y][check_x]
+            # Convert integer value to TerrainType enum for consistency
+            perception.visible_cells[(dx, dy)] = TerrainType(terrain)
+
+            # Also add pheromone information
+            perception.food_pheromone[(dx, dy)] = (
+                self.food_pheromones.get_value(check_x, check_y)
+            )
+            perception.home_pheromone[(dx, dy)] = (
+                self.home_pheromones.get_value(check_x, check_y)
+            )
+
+            # Check for other ants, reporting one representative per cell
+            occupants = self.ant_cells.get((check_x, check_y))
+            if occupants:
+                other_ant = next(iter(occupants))
+                perception.nearby_ants.append(((dx, dy), other_ant.has_food))
+
+    def visible_offsets(
+        self, x: int, y: int, direction: Direction, vision_range: int, vision_angle
+    ) -> tuple:
+        """Offsets (dx, dy) visible from (x, y) facing direction, excluding (0, 0)"""
+        # Visible offsets come from the line-of-sight cache, computed the
+        # first time an ant stands on this cell facing this way
+        cone_key = (direction, vision_range, vision_angle)
+        masks = self.visibility_masks.get(cone_key)
+        if masks is None:
+            self.visibility_masks[cone_key] = masks = {}
+        cone = get_vision_cone(*cone_key)
+        mask = masks.get((x, y))
+        if mask is None:
+            mask = masks[(x, y)] = self._compute_visibility_mask(x, y, cone)
+        return get_visible_offsets(cone, mask)
+
+    def perceive_terrain(self, x: int, y: int, offsets: tuple) -> dict:
+        """Terrain at (x, y) and at the given visible offsets"""
+        visible_cells = {}
+        current_terrain = self.get_terrain(x, y)
+        if current_terrain is not None:
+            visible_cells[(0, 0)] = current_terrain
+
+        grid = self.grid
+        for dx, dy in offsets:
+            visible_cells[(dx, dy)] = TERRAIN_TYPES[grid[y + dy][x + dx]]
+        return visible_cells
+
+    def perceive_pheromone(
+        self, pheromones: PheromoneMap, x: int, y: int, offsets: tuple
+    ) -> dict:
+        """Pheromone readings at the given visible offsets from (x, y)"""
+        return {
+            (dx, dy): pheromones.get_value(x + dx, y + dy) for dx, dy in offsets
+        }
+
+    def perceive_ants(self, x: int, y: int, offsets: tuple) -> list:
+        """One (offset, has_food) entry per visible cell holding another ant"""
+        nearby_ants = []
+        ant_cells = self.ant_cells
+        for dx, dy in offsets:
+            occupants = ant_cells.get((x + dx, y + dy))
+            if occupants:
+                nearby_ants.append(((dx, dy), next(iter(occupants)).has_food))
+        return nearby_ants
 
     def execute_action(self, ant: "Ant", action: "AntAction") -> bool:
+        if self.recorder is not None:
+            self.recorder.record_action(ant, action)
+
         if action == AntAction.MOVE_FORWARD:
             dx, dy = Direction.get_delta(ant.direction)
             new_x, new_y = ant.x + dx, ant.y + dy
 
             success = self.is_walkable(int(new_x), int(new_y))
+            if success:
+                self._vacate(ant, int(ant.x), int(ant.y))
+                self._occupy(ant, int(new_x), int(new_y))
             ant.move_forward(success)
             return success
 
@@ -389,6 +1178,99 @@ class Environment:
 
 
 # Environment Builder to create different scenarios
+# Binary environment format: magic bytes, the JSON header length as a
+# little-endian uint32, the JSON header, then the grid (uint8), the effective
+# terrain layer (uint8) and the food amounts (int32) as row-major arrays,
+# followed by the flat y * width + x indexes (int64) of the wall and food
+# cells, each aligned to BINARY_ALIGNMENT
+BINARY_MAGIC = b"ANTENVB\x00"
+BINARY_VERSION = 2
+BINARY_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+
+
+def _binary_layout(
+    header_length: int, width: int, height: int, walls: int, food_cells: int
+):
+    """Offsets of the grid, terrain, food, wall and food cell arrays in a
+    binary environment file"""
+    grid_offset = _align(len(BINARY_MAGIC) + 4 + header_length)
+    terrain_offset = _align(grid_offset + width * height)
+    food_offset = _align(terrain_offset + width * height)
+    walls_offset = _align(food_offset + 4 * width * height)
+    food_cells_offset = _align(walls_offset + 8 * walls)
+    return grid_offset, terrain_offset, food_offset, walls_offset, food_cells_offset
+
+
+def _mapped_rows(filename: str, dtype, offset: int, width: int, height: int):
+    """Rows of a copy-on-write memory-mapped array, as memoryviews
+
+    They index and assign like the list rows of an Environment, writes stay in
+    memory and the file is only read for the pages that are accessed.
+    """
+    array = np.memmap(
+        filename, dtype=dtype, mode="c", offset=offset, shape=(height * width,)
+    )
+    flat = memoryview(array)
+    return [flat[y * width : (y + 1) * width] for y in range(height)]
+
+
+def _cell_positions(filename: str, offset: int, count: int, width: int) -> set:
+    """(x, y) positions of flat cell indexes stored in a binary file"""
+    cells = np.fromfile(filename, dtype="<i8", count=count, offset=offset)
+    ys, xs = np.divmod(cells, width)
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def _row_runs(positions, value_of=None) -> dict:
+    """Group (x, y) positions into runs along each row
+
+    Returns {y: [(x, length, value), ...]}, where a run only continues over
+    cells with the same value_of(x, y).
+    """
+    runs = {}
+    for y, x in sorted((y, x) for x, y in positions):
+        value = value_of(x, y) if value_of is not None else None
+        row = runs.get(y)
+        if row is None:
+            runs[y] = row = []
+        elif row[-1][0] + row[-1][1] == x and row[-1][2] == value:
+            row[-1] = (row[-1][0], row[-1][1] + 1, value)
+            continue
+        row.append((x, 1, value))
+    return runs
+
+
+def _merge_runs(runs: dict) -> list:
+    """Merge row runs into rectangles
+
+    runs maps y to (x, length, value) runs along that row. Runs repeated on
+    consecutive rows are merged, giving sorted (x, y, width, height, value).
+    """
+    rects = []
+    open_rects = {}  # Run -> rectangle that ended on the previous row
+    previous_y = None
+    for y in sorted(runs):
+        if previous_y is not None and y != previous_y + 1:
+            rects.extend(open_rects.values())
+            open_rects = {}
+        next_open = {}
+        for run in runs[y]:
+            rect = open_rects.pop(run, None)
+            if rect is None:
+                rect = [run[0], y, run[1], 0, run[2]]
+            rect[3] += 1
+            next_open[run] = rect
+        rects.extend(open_rects.values())
+        open_rects = next_open
+        previous_y = y
+    rects.extend(open_rects.values())
+    return sorted((tuple(rect) for rect in rects), key=lambda r: (r[1], r[0]))
+
+
 class EnvironmentBuilder:
     @staticmethod
     def create_empty(width: int, height: int) -> Environment:
@@ -442,7 +1324,10 @@ class EnvironmentBuilder:
         return env
 
     @staticmethod
-    def create_maze(width: int, height: int) -> Environment:
+    def create_maze(
+        width: int, height: int, rng: Optional[random.Random] = None
+    ) -> Environment:
+        rng = rng or random
         env = Environment(width, height)
 
         center_x, center_y = width // 2, height // 2
@@ -451,11 +1336,11 @@ class EnvironmentBuilder:
         cell_size = 20
         for x in range(0, width, cell_size):
             for y in range(0, height, cell_size):
-                if random.random() < 0.3 and (
+                if rng.random() < 0.3 and (
                     abs(x - center_x) > cell_size or abs(y - center_y) > cell_size
                 ):
-                    wall_len = random.randint(5, cell_size - 2)
-                    if random.random() < 0.5:
+                    wall_len = rng.randint(5, cell_size - 2)
+                    if rng.random() < 0.5:
                         for i in range(wall_len):
                             if x + i < width:
                                 env.add_wall(x + i, y)
@@ -466,8 +1351,8 @@ class EnvironmentBuilder:
 
         for _ in range(5):
             while True:
-                fx = random.randint(0, width - 6)
-                fy = random.randint(0, height - 6)
+                fx = rng.randint(0, width - 6)
+                fy = rng.randint(0, height - 6)
 
                 if math.sqrt((fx - center_x) ** 2 + (fy - center_y) ** 2) > width // 4:
                     env.add_food_area(fx, fy, 5, 5)
@@ -483,11 +1368,17 @@ class EnvironmentBuilder:
         - DIMENSIONS: width height
         - WALL: x y (for adding wall/obstacle positions)
         - FOOD: x y [amount] (for adding food with optional specific amounts)
+        - WALL_RECT: x y width height (for filling a rectangle with walls)
+        - WALL_LINE: x1 y1 x2 y2 (for a straight or diagonal line of walls, ends included)
+        - WALL_RUNS: y x length [x length ...] (for runs of walls along row y)
+        - FOOD_RECT: x y width height [amount] (for filling a rectangle with food)
         - COLONY: x y (for adding colony positions)
         - ANTS: count (for specifying the number of ants to create)
         - TIME_LIMIT: seconds (for specifying simulation time limit in seconds)
         - MAX_STEPS: steps (for specifying maximum simulation steps)
 
+        Gzip-compressed files are detected and read transparently.
+
         Example:
         ```
         DIMENSIONS: 100 100
@@ -495,6 +1386,8 @@ class EnvironmentBuilder:
         10 10
         10 11
         10 12
+        WALL_RECT:
+        30 0 2 40
         FOOD:
         50 30 5
         70 80 10
@@ -509,149 +1402,376 @@ class EnvironmentBuilder:
         ```
         """
         try:
-            with open(filename, "r") as f:
-                lines = f.readlines()
-
-                width, height = 100, 100
-                env = None
-                current_section = None
-                ant_count = 0
-                time_limit = 0  # Default: no time limit
-                max_steps = 0  # Default: no step limit
-
-                for line in lines:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    if line.endswith(":"):
-                        current_section = line[:-1].upper()
-                        continue
-
-                    if current_section == "DIMENSIONS":
-                        width, height = map(int, line.split())
-                        if verbose:
-                            print(
-                                f"Loading environment with dimensions: {width}x{height}"
-                            )
-                        env = Environment(width, height)
-                    elif current_section == "WALL" and env is not None:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            x, y = int(parts[0]), int(parts[1])
-                            if env.is_valid_position(x, y):
-                                env.add_wall(x, y)
-                    elif current_section == "FOOD" and env is not None:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            x, y = int(parts[0]), int(parts[1])
-                            amount = int(parts[2])
-                            if env.is_valid_position(x, y):
-                                env.add_food(x, y, amount)
-                        elif len(parts) >= 2:
-                            x, y = int(parts[0]), int(parts[1])
-                            if env.is_valid_position(x, y):
-                                env.add_food(x, y)
-                    elif current_section == "COLONY" and env is not None:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            x, y = int(parts[0]), int(parts[1])
-                            if env.is_valid_position(x, y):
-                                env.add_colony(x, y)
-                    elif current_section == "ANTS" and env is not None:
-                        try:
-                            ant_count = int(line.strip())
-                            if verbose:
-                                print(f"Loading environment with {ant_count} ants")
-                        except ValueError:
-                            if verbose:
-                                print(f"Invalid ant count: {line}")
-                    elif current_section == "TIME_LIMIT":
-                        try:
-                            time_limit = int(line.strip())
-                            if verbose:
-                                print(f"Environment time limit: {time_limit} seconds")
-                        except ValueError:
-                            if verbose:
-                                print(f"Invalid time limit: {line}")
-                    elif current_section == "MAX_STEPS":
-                        try:
-                            max_steps = int(line.strip())
-                            if verbose:
-                                print(f"Environment max steps: {max_steps}")
-                        except ValueError:
-                            if verbose:
-                                print(f"Invalid max steps: {line}")
-
-                if env is None:
-                    env = Environment(width, height)
-
-                if not env.colony_positions:
+            with open(filename, "rb") as f:
+                compressed = f.read(2) == b"\x1f\x8b"
+            opener = gzip.open if compressed else open
+            with opener(filename, "rt") as f:
+                return EnvironmentBuilder.from_text(f.read(), verbose=verbose)
+        except Exception as e:
+            if verbose:
+                print(f"Error loading environment from file: {e}")
+            return None
+
+    @staticmethod
+    def from_text(text: str, verbose: bool = True) -> Environment:
+        """Build an environment from the text format, see load_from_file"""
+        lines = text.splitlines()
+
+        width, height = 100, 100
+        env = None
+        current_section = None
+        ant_count = 0
+        time_limit = 0  # Default: no time limit
+        max_steps = 0  # Default: no step limit
+
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.endswith(":"):
+                current_section = line[:-1].upper()
+                continue
+
+            if current_section == "DIMENSIONS":
+                width, height = map(int, line.split())
+                if verbose:
+                    print(
+                        f"Loading environment with dimensions: {width}x{height}"
+                    )
+                env = Environment(width, height)
+            elif current_section == "WALL" and env is not None:
+                parts = line.split()
+                if len(parts) >= 2:
+                    x, y = int(parts[0]), int(parts[1])
+                    if env.is_valid_position(x, y):
+                        env.add_wall(x, y)
+            elif current_section == "FOOD" and env is not None:
+                parts = line.split()
+                if len(parts) >= 3:
+                    x, y = int(parts[0]), int(parts[1])
+                    amount = int(parts[2])
+                    if env.is_valid_position(x, y):
+                        env.add_food(x, y, amount)
+                elif len(parts) >= 2:
+                    x, y = int(parts[0]), int(parts[1])
+                    if env.is_valid_position(x, y):
+                        env.add_food(x, y)
+            elif current_section == "WALL_RECT" and env is not None:
+                parts = line.split()
+                if len(parts) >= 4:
+                    x, y, w, h = map(int, parts[:4])
+                    env.add_wall_rect(x, y, w, h)
+            elif current_section == "WALL_LINE" and env is not None:
+                parts = line.split()
+                if len(parts) >= 4:
+                    x1, y1, x2, y2 = map(int, parts[:4])
+                    env.add_wall_line(x1, y1, x2, y2)
+            elif current_section == "WALL_RUNS" and env is not None:
+                parts = line.split()
+                try:
+                    values = list(map(int, parts))
+                except ValueError:
+                    values = []
+                # A row and at least one complete x/length pair
+                if len(values) >= 3 and len(values) % 2 == 1:
+                    y = values[0]
+                    for i in range(1, len(values), 2):
+                        env.add_wall_rect(values[i], y, values[i + 1], 1)
+                elif verbose:
+                    print(f"Invalid wall runs: {line}")
+            elif current_section == "FOOD_RECT" and env is not None:
+                parts = line.split()
+                if len(parts) >= 4:
+                    x, y, w, h = map(int, parts[:4])
+                    amount = int(parts[4]) if len(parts) >= 5 else 1
+                    env.add_food_area(x, y, w, h, amount)
+            elif current_section == "COLONY" and env is not None:
+                parts = line.split()
+                if len(parts) >= 2:
+                    x, y = int(parts[0]), int(parts[1])
+                    if env.is_valid_position(x, y):
+                        env.add_colony(x, y)
+            elif current_section == "ANTS" and env is not None:
+                try:
+                    ant_count = int(line.strip())
+                    if verbose:
+                        print(f"Loading environment with {ant_count} ants")
+                except ValueError:
                     if verbose:
-                        print(
-                            "Warning: No colony positions defined in environment file. Adding one at center."
-                        )
-                    env.add_colony(env.width // 2, env.height // 2)
+                        print(f"Invalid ant count: {line}")
+            elif current_section == "TIME_LIMIT":
+                try:
+                    time_limit = int(line.strip())
+                    if verbose:
+                        print(f"Environment time limit: {time_limit} seconds")
+                except ValueError:
+                    if verbose:
+                        print(f"Invalid time limit: {line}")
+            elif current_section == "MAX_STEPS":
+                try:
+                    max_steps = int(line.strip())
+                    if verbose:
+                        print(f"Environment max steps: {max_steps}")
+                except ValueError:
+                    if verbose:
+                        print(f"Invalid max steps: {line}")
+
+        if env is None:
+            env = Environment(width, height)
 
-                # Store the ant count as an attribute of the environment for later use
-                env.requested_ant_count = ant_count
+        if not env.colony_positions:
+            if verbose:
+                print(
+                    "Warning: No colony positions defined in environment file. Adding one at center."
+                )
+            env.add_colony(env.width // 2, env.height // 2)
 
-                # Store time limit and max steps as environment attributes
-                env.time_limit = time_limit
-                env.max_steps = max_steps
+        # Store the ant count as an attribute of the environment for later use
+        env.requested_ant_count = ant_count
 
-                return env
+        # Store time limit and max steps as environment attributes
+        env.time_limit = time_limit
+        env.max_steps = max_steps
+
+        return env
+
+    @staticmethod
+    def save_to_file(
+        env: Environment, filename: str, compress: Optional[bool] = None
+    ) -> bool:
+        """Save the environment in the text format
+
+        compress writes gzip, by default when filename ends in .gz.
+        """
+        if compress is None:
+            compress = filename.endswith(".gz")
+        try:
+            text = EnvironmentBuilder.to_text(env)
+            opener = gzip.open if compress else open
+            with opener(filename, "wt") as f:
+                f.write(text)
+            return True
         except Exception as e:
-            if verbose:
-                print(f"Error loading environment from file: {e}")
-            return None
+            print(f"Error saving environment to file: {e}")
+            return False
 
     @staticmethod
-    def save_to_file(env: Environment, filename: str) -> bool:
+    def to_text(env: Environment) -> str:
+        """The environment in the text format
+
+        Built from the colony, food and wall indexes, so the cost depends on
+        the number of non-empty cells, not the map area.
+        """
+        lines = [f"DIMENSIONS:\n{env.width} {env.height}\n\n"]
+
+        if env.colony_positions:
+            lines.append("COLONY:\n")
+            lines.extend(f"{x} {y}\n" for x, y in env.colony_positions)
+            lines.append("\n")
+
+        # Rectangles of equal food amounts, single cells as FOOD lines
+        food_amounts = env.food_amounts
+        food_runs = _row_runs(env.food_positions, lambda x, y: food_amounts[y][x])
+        EnvironmentBuilder._write_rects(
+            lines, "FOOD", "FOOD_RECT", _merge_runs(food_runs), with_value=True
+        )
+
+        # Rectangles of walls taller than one row, the remaining rows as
+        # WALL_RUNS, or a WALL line when all that is left of a row is one cell
+        wall_rects = _merge_runs(_row_runs(env.wall_positions))
+        rects = [rect for rect in wall_rects if rect[3] > 1]
+        rows = {}
+        for rect in wall_rects:
+            if rect[3] == 1:
+                rows.setdefault(rect[1], []).append(rect)
+        for y in list(rows):
+            if len(rows[y]) == 1 and rows[y][0][2] == 1:
+                rects.append(rows.pop(y)[0])
+        EnvironmentBuilder._write_rects(
+            lines, "WALL", "WALL_RECT", sorted(rects, key=lambda r: (r[1], r[0]))
+        )
+        if rows:
+            lines.append("WALL_RUNS:\n")
+            for y in sorted(rows):
+                runs = "".join(f" {x} {w}" for x, _, w, _, _ in rows[y])
+                lines.append(f"{y}{runs}\n")
+            lines.append("\n")
+
+        # Write the number of ants
+        lines.append(f"ANTS:\n{EnvironmentBuilder._ant_count(env)}\n\n")
+
+        # Write time limit if it's set
+        if hasattr(env, "time_limit") and env.time_limit > 0:
+            lines.append(f"TIME_LIMIT:\n{env.time_limit}\n\n")
+
+        # Write max steps if it's set
+        if hasattr(env, "max_steps") and env.max_steps > 0:
+            lines.append(f"MAX_STEPS:\n{env.max_steps}\n\n")
+
+        return "".join(lines)
+
+    @staticmethod
+    def _write_rects(
+        lines: list, cell_section: str, rect_section: str, rects, with_value=False
+    ) -> None:
+        """Add single-cell rectangles as cell_section lines, the rest as rect_section"""
+        cells = [rect for rect in rects if rect[2] == 1 and rect[3] == 1]
+        areas = [rect for rect in rects if rect[2] > 1 or rect[3] > 1]
+        if cells:
+            lines.append(f"{cell_section}:\n")
+            if with_value:
+                lines.extend(f"{x} {y} {value}\n" for x, y, _, _, value in cells)
+            else:
+                lines.extend(f"{x} {y}\n" for x, y, _, _, _ in cells)
+            lines.append("\n")
+        if areas:
+            lines.append(f"{rect_section}:\n")
+            if with_value:
+                lines.extend(f"{x} {y} {w} {h} {value}\n" for x, y, w, h, value in areas)
+            else:
+                lines.extend(f"{x} {y} {w} {h}\n" for x, y, w, h, _ in areas)
+            lines.append("\n")
+
+    @staticmethod
+    def _ant_count(env: Environment) -> int:
+        """Ants to store in a file, the loaded ANTS count if none were added"""
+        if env.ants:
+            return len(env.ants)
+        return getattr(env, "requested_ant_count", 0)
+
+    @staticmethod
+    def is_binary_file(filename: str) -> bool:
         try:
-            with open(filename, "w") as f:
-                f.write(f"DIMENSIONS:\n{env.width} {env.height}\n\n")
-
-                if env.colony_positions:
-                    f.write("COLONY:\n")
-                    for x, y in env.colony_positions:
-                        f.write(f"{x} {y}\n")
-                    f.write("\n")
-
-                if env.food_positions:
-                    f.write("FOOD:\n")
-                    for x, y in env.food_positions:
-                        amount = env.food_amounts[y][x]
-                        f.write(f"{x} {y} {amount}\n")
-                    f.write("\n")
-
-                walls = []
-                for y in range(env.height):
-                    for x in range(env.width):
-                        if env.grid[y][x] == TerrainType.WALL.value:
-                            walls.append((x, y))
-
-                if walls:
-                    f.write("WALL:\n")
-                    for x, y in walls:
-                        f.write(f"{x} {y}\n")
-                    f.write("\n")
-
-                # Write the number of ants
-                f.write("ANTS:\n")
-                f.write(f"{len(env.ants) if env.ants else 0}\n\n")
-
-                # Write time limit if it's set
-                if hasattr(env, "time_limit") and env.time_limit > 0:
-                    f.write("TIME_LIMIT:\n")
-                    f.write(f"{env.time_limit}\n\n")
-
-                # Write max steps if it's set
-                if hasattr(env, "max_steps") and env.max_steps > 0:
-                    f.write("MAX_STEPS:\n")
-                    f.write(f"{env.max_steps}\n\n")
+            with open(filename, "rb") as f:
+                return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+        except OSError:
+            return False
 
-                return True
+    @staticmethod
+    def save_binary(env: Environment, filename: str) -> bool:
+        """Save the environment in the binary format, see load_binary
+
+        The file is written under a temporary name and then renamed, so an
+        environment still mapped from filename keeps reading the old file.
+        """
+        temporary = f"{filename}.tmp"
+        try:
+            width = env.width
+            walls = np.array(
+                sorted(y * width + x for x, y in env.wall_positions), dtype="<i8"
+            )
+            food_cells = np.array(
+                sorted(y * width + x for x, y in env.food_positions), dtype="<i8"
+            )
+            header = json.dumps(
+                {
+                    "version": BINARY_VERSION,
+                    "width": env.width,
+                    "height": env.height,
+                    "colonies": [list(position) for position in env.colony_positions],
+                    "walls": len(walls),
+                    "food_cells": len(food_cells),
+                    "food_amount": env.initial_food_amount,
+                    "ants": EnvironmentBuilder._ant_count(env),
+                    "time_limit": getattr(env, "time_limit", 0),
+                    "max_steps": getattr(env, "max_steps", 0),
+                }
+            ).encode()
+            offsets = _binary_layout(
+                len(header), env.width, env.height, len(walls), len(food_cells)
+            )
+            arrays = (
+                np.array(env.grid, dtype=np.uint8),
+                env.terrain_array(),
+                np.array(env.food_amounts, dtype="<i4"),
+                walls,
+                food_cells,
+            )
+
+            with open(temporary, "wb") as f:
+                f.write(BINARY_MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                for offset, array in zip(offsets, arrays):
+                    f.seek(offset)
+                    f.write(array.tobytes())
+            os.replace(temporary, filename)
+            return True
         except Exception as e:
             print(f"Error saving environment to file: {e}")
+            if os.path.exists(temporary):
+                os.remove(temporary)
             return False
+
+    @staticmethod
+    def load_binary(filename: str, verbose: bool = True) -> Optional[Environment]:
+        """Load an environment saved by save_binary
+
+        The grid, terrain and food layers are copy-on-write memory maps of the
+        file, and the wall and food indexes are read as stored, so loading
+        does not depend on the map area, only on the number of wall and food
+        cells.
+        """
+        try:
+            with open(filename, "rb") as f:
+                if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                    raise ValueError("not a binary environment file")
+                (header_length,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(header_length))
+
+            if header.get("version") != BINARY_VERSION:
+                raise ValueError(f"unsupported version {header.get('version')}")
+            width, height = header["width"], header["height"]
+            if verbose:
+                print(f"Loading environment with dimensions: {width}x{height}")
+
+            # Start from an empty map so no per-cell layers are allocated,
+            # then size it and attach the mapped layers
+            env = Environment(0, 0)
+            env.width, env.height = width, height
+            env.set_pheromone_map(env.pheromone_map)
+            env.colony_positions = [tuple(position) for position in header["colonies"]]
+            if width > 0 and height > 0:
+                walls, food_cells = header["walls"], header["food_cells"]
+                (
+                    grid_offset,
+                    terrain_offset,
+                    food_offset,
+                    walls_offset,
+                    food_cells_offset,
+                ) = _binary_layout(header_length, width, height, walls, food_cells)
+                env.grid = _mapped_rows(filename, np.uint8, grid_offset, width, height)
+                env.terrain = _mapped_rows(
+                    filename, np.uint8, terrain_offset, width, height
+                )
+                env.food_amounts = _mapped_rows(
+                    filename, "<i4", food_offset, width, height
+                )
+                env.wall_positions = _cell_positions(
+                    filename, walls_offset, walls, width
+                )
+                env.food_positions = _cell_positions(
+                    filename, food_cells_offset, food_cells, width
+                )
+                env.initial_food_amount = header["food_amount"]
+                for colony_x, colony_y in env.colony_positions:
+                    env.colony_area.update(env._colony_cells(colony_x, colony_y))
+
+            if not env.colony_positions:
+                if verbose:
+                    print(
+                        "Warning: No colony positions defined in environment file. Adding one at center."
+                    )
+                env.add_colony(env.width // 2, env.height // 2)
+
+            env.requested_ant_count = header.get("ants", 0)
+            env.time_limit = header.get("time_limit", 0)
+            env.max_steps = header.get("max_steps", 0)
+            if verbose and env.requested_ant_count:
+                print(f"Loading environment with {env.requested_ant_count} ants")
+            return env
+        except Exception as e:
+            if verbose:
+                print(f"Error loading environment from file: {e}")
+            return None
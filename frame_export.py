@@ -0,0 +1,134 @@
+# Writers for GUI frames exported without a window.
+
+import os
+import shutil
+import subprocess
+
+import pygame
+
+# Extensions written as one video file through ffmpeg
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".avi", ".mov")
+
+
+class PngSequenceWriter:
+    """Save each frame as a numbered PNG file in a directory"""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.frames = 0
+
+    def add(self, surface: pygame.Surface) -> None:
+        filename = os.path.join(self.directory, f"frame_{self.frames:06d}.png")
+        pygame.image.save(surface, filename)
+        self.frames += 1
+
+    def close(self) -> None:
+        pass
+
+
+class GifWriter:
+    """Collect frames into an animated GIF, written on close
+
+    Needs Pillow. Frames are kept in memory as 256-colour images until the
+    file is written, so long runs are better exported as a PNG sequence or
+    a video.
+    """
+
+    def __init__(self, filename: str, fps: int = 30):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ValueError("Exporting GIF files requires Pillow (pip install Pillow)")
+        self.image_module = Image
+        self.filename = filename
+        self.duration = max(1, round(1000 / max(1, fps)))
+        self.images = []
+        self.frames = 0
+
+    def add(self, surface: pygame.Surface) -> None:
+        image = self.image_module.frombytes(
+            "RGB", surface.get_size(), pygame.image.tobytes(surface, "RGB")
+        )
+        self.images.append(image.quantize(256))
+        self.frames += 1
+
+    def close(self) -> None:
+        if not self.images:
+            return
+        first, *rest = self.images
+        first.save(
+            self.filename,
+            save_all=True,
+            append_images=rest,
+            duration=self.duration,
+            loop=0,
+        )
+        self.images = []
+
+
+class VideoWriter:
+    """Stream frames to ffmpeg as raw RGB, encoding one video file
+
+    Needs ffmpeg on the PATH. Frames are piped as they are added, so memory
+    use does not grow with the length of the run.
+    """
+
+    def __init__(self, filename: str, fps: int = 30):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise ValueError("Exporting video files requires ffmpeg on the PATH")
+        self.ffmpeg = ffmpeg
+        self.filename = filename
+        self.fps = max(1, fps)
+        self.process = None
+        self.frames = 0
+
+    def _start(self, width: int, height: int) -> None:
+        command = [
+            self.ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            str(self.fps),
+            "-i",
+            "-",
+            # Most codecs need even dimensions
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-pix_fmt",
+            "yuv420p",
+            self.filename,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def add(self, surface: pygame.Surface) -> None:
+        if self.process is None:
+            self._start(*surface.get_size())
+        self.process.stdin.write(pygame.image.tobytes(surface, "RGB"))
+        self.frames += 1
+
+    def close(self) -> None:
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise ValueError(f"ffmpeg failed to write {self.filename}")
+        self.process = None
+
+
+def open_frame_writer(path: str, fps: int = 30):
+    """Writer for path: an animated GIF, a video by extension, else a PNG directory"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".gif":
+        return GifWriter(path, fps)
+    if extension in VIDEO_EXTENSIONS:
+        return VideoWriter(path, fps)
+    return PngSequenceWriter(path)
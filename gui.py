@@ -1,9 +1,17 @@
+import numpy as np
+import os
 import pygame
 import sys
+import threading
 import time
 import argparse
+import math
+import random
+from typing import Optional
 
 from environment import Environment, TerrainType, Direction
+from frame_export import open_frame_writer
+from trajectory import TrajectoryReplay
 from utils import create_environment, add_ants
 
 # Colors - using the exact same colors as in improved_ant.py
@@ -19,6 +27,154 @@ DIRT_COLOR = (DIRT_R, DIRT_G, DIRT_B)
 FOOD_COLOR = (158, 55, 17)
 HOME_R, HOME_G, HOME_B = 96, 85, 33
 FOOD_R, FOOD_G, FOOD_B = 255, 255, 255
+GRID_COLOR = (DIRT_R - 20, DIRT_G - 20, DIRT_B - 20)
+MAX_PHEROMONE = 100.0
+
+# Cell colours by terrain value, empty cells show the dirt or pheromones
+TERRAIN_COLORS = np.zeros((len(TerrainType), 3), dtype=np.uint8)
+TERRAIN_COLORS[TerrainType.WALL.value] = GRAY
+TERRAIN_COLORS[TerrainType.COLONY.value] = (HOME_R, HOME_G, HOME_B)
+TERRAIN_COLORS[TerrainType.FOOD.value] = FOOD_COLOR
+
+
+def blend_pheromones(home: np.ndarray, food: np.ndarray) -> np.ndarray:
+    """Colours of cells with the given pheromone levels, as (..., 3) uint8
+
+    Home pheromone blends dirt towards the colony colour, then food
+    pheromone blends that towards white, truncating to integers after each
+    step exactly like improved_ant.py.
+    """
+    home_pct = np.minimum(1.0, home / MAX_PHEROMONE)[..., None]
+    food_pct = np.minimum(1.0, food / MAX_PHEROMONE)[..., None]
+    home_color = np.array([HOME_R, HOME_G, HOME_B])
+    food_color = np.array([FOOD_R, FOOD_G, FOOD_B])
+    pixel = np.trunc(home_color * home_pct + np.array(DIRT_COLOR) * (1 - home_pct))
+    pixel = food_color * food_pct + pixel * (1 - food_pct)
+    return pixel.astype(np.uint8)
+
+
+def cell_colors(environment: Environment, show_pheromones: bool = True):
+    """Colours of all cells and the mask of cells drawn over the background
+
+    Returns a (height, width, 3) uint8 array and a (height, width) bool
+    array; unmasked cells are plain dirt and leave the grid lines visible.
+    """
+    terrain = environment.terrain_array()
+    colors = TERRAIN_COLORS[terrain]
+    drawn = terrain != TerrainType.EMPTY.value
+    if show_pheromones:
+        home = environment.home_pheromones.to_array()
+        food = environment.food_pheromones.to_array()
+        tinted = ~drawn & ((home != 0) | (food != 0))
+        colors[tinted] = blend_pheromones(home[tinted], food[tinted])
+        drawn |= tinted
+    return colors, drawn
+
+
+# Largest map area of the window, larger maps are shown through a viewport
+MAX_VIEW_WIDTH = 1280
+MAX_VIEW_HEIGHT = 800
+# Most screen pixels per cell, and the zoom factor of one mouse wheel step
+MAX_ZOOM = 64.0
+WHEEL_ZOOM = 1.25
+# Arrow keys -> pan direction
+PAN_KEYS = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+}
+
+
+def _downsample(pixels: np.ndarray) -> np.ndarray:
+    """Average 2x2 pixel blocks, repeating the last row and column of odd sizes"""
+    width, height = pixels.shape[:2]
+    padded = np.pad(pixels, ((0, width % 2), (0, height % 2), (0, 0)), mode="edge")
+    padded = padded.astype(np.uint16)
+    total = padded[0::2, 0::2] + padded[1::2, 0::2]
+    total += padded[0::2, 1::2] + padded[1::2, 1::2]
+    return ((total + 2) // 4).astype(np.uint8)
+
+
+def _downsample_at(source: np.ndarray, target: np.ndarray, xs, ys) -> None:
+    """_downsample() of the blocks at (xs, ys) of target only"""
+    width, height = source.shape[:2]
+    x0, y0 = xs * 2, ys * 2
+    x1, y1 = np.minimum(x0 + 1, width - 1), np.minimum(y0 + 1, height - 1)
+    total = source[x0, y0].astype(np.uint16)
+    total += source[x1, y0]
+    total += source[x0, y1]
+    total += source[x1, y1]
+    target[xs, ys] = (total + 2) // 4
+
+
+def _unique_pairs(xs: np.ndarray, ys: np.ndarray):
+    keys = np.unique(xs * (int(ys.max()) + 1) + ys)
+    return np.divmod(keys, int(ys.max()) + 1)
+
+
+# Longest time the worker holds the lock in turbo mode before letting a
+# frame be drawn
+TURBO_SLICE = 0.02
+# Frame rate cap in turbo mode, drawing shares the interpreter with the worker
+TURBO_DISPLAY_FPS = 15
+
+
+class SimulationWorker(threading.Thread):
+    """Steps the simulation of a running AntSimulationGUI in the background
+
+    Steps at gui.fps steps per second, or in slices of as many steps as fit
+    in TURBO_SLICE when turbo is on or fps is 0, so the simulation speed
+    does not depend on how fast frames are drawn. An exception raised while
+    stepping ends the GUI and is kept in error for the drawing thread to
+    raise.
+    """
+
+    def __init__(self, gui: "AntSimulationGUI"):
+        super().__init__(name="simulation", daemon=True)
+        self.gui = gui
+        self.stopped = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        try:
+            self._run()
+        except Exception as e:
+            self.error = e
+            self.gui.running = False
+
+    def _run(self) -> None:
+        gui = self.gui
+        clock = time.perf_counter
+        next_step = clock()
+        while not self.stopped.is_set() and gui.running:
+            if gui.paused or gui.simulation_complete:
+                self.stopped.wait(0.01)
+                next_step = clock()
+                continue
+
+            if gui.turbo or gui.fps <= 0:
+                deadline = clock() + TURBO_SLICE
+                with gui.lock:
+                    while clock() < deadline and gui.running and not gui.paused:
+                        gui.step()
+                # Give the drawing thread its turn at the lock
+                time.sleep(0.001)
+                next_step = clock()
+                continue
+
+            now = clock()
+            if now < next_step:
+                self.stopped.wait(min(next_step - now, 0.01))
+                continue
+            with gui.lock:
+                gui.step()
+            # Catch up after short stalls, but don't burst after long ones
+            next_step = max(next_step + 1.0 / gui.fps, now - 0.1)
 
 
 class AntSimulationGUI:
@@ -32,10 +188,30 @@ class AntSimulationGUI:
         time_limit: float = 0,  # Time limit in seconds, 0 means no limit
         verbose: bool = True,
         progress_interval: int = 100,
+        replay: Optional[TrajectoryReplay] = None,
+        replay_speed: int = 1,  # Recorded steps shown per simulation tick
+        display_fps: int = 60,
+        turbo: bool = False,  # Step as fast as possible, ignoring fps
+        headless: bool = False,  # Draw off-screen only, see export()
+        view_width: int = 0,  # Map area of the window, 0 for the scaled map
+        view_height: int = 0,  # size up to MAX_VIEW_WIDTH x MAX_VIEW_HEIGHT
+        fit: bool = False,  # Start zoomed out to show the whole map
     ):
         self.environment = environment
+        # With a replay, the recorded steps are played back instead of
+        # running the strategies
+        self.replay = replay
+        self.replay_speed = max(1, replay_speed)
         self.cell_size = cell_size
-        self.fps = fps
+        self.fps = fps  # Simulation steps per second, 0 means unlimited
+        self.display_fps = display_fps
+        self.turbo = turbo
+        self.running = False
+        # Held while the simulation steps or a frame reads its state
+        self.lock = threading.Lock()
+        # Step count and time of the last steps-per-second measurement
+        self.rate_sample = (0, time.perf_counter())
+        self.steps_per_second = 0.0
         self.scale_factor = scale_factor
         self.max_steps = max_steps
         self.time_limit = time_limit
@@ -50,33 +226,61 @@ class AntSimulationGUI:
         self.progress_interval = progress_interval
         self.initial_food = environment.initial_food_amount
 
+        self.headless = headless
+        if headless:
+            # Works without a display, e.g. on build servers
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
         pygame.init()
         self.width = environment.width * cell_size
         self.height = environment.height * cell_size
         self.stats_height = 100  # Increased height for stats area for better visibility
 
-        # Create scaled display for better visibility
-        self.scaled_width = self.width * scale_factor
-        self.scaled_height = self.height * scale_factor
-        self.screen = pygame.display.set_mode(
-            (self.scaled_width, self.scaled_height + self.stats_height)
+        # Create scaled display for better visibility, the map area is a
+        # viewport on the map for maps larger than the window
+        self.scaled_width = view_width or min(
+            self.width * scale_factor, MAX_VIEW_WIDTH
         )
-        pygame.display.set_caption("Ant Colony Simulation")
-
-        self.main_surface = pygame.Surface((self.width, self.height))
-        self.main_surface.fill(DIRT_COLOR)
+        self.scaled_height = view_height or min(
+            self.height * scale_factor, MAX_VIEW_HEIGHT
+        )
+        screen_size = (self.scaled_width, self.scaled_height + self.stats_height)
+        if headless:
+            self.screen = pygame.Surface(screen_size)
+        else:
+            self.screen = pygame.display.set_mode(screen_size)
+            pygame.display.set_caption("Ant Colony Simulation")
 
         self.font = pygame.font.SysFont("Arial", 18)
         self.clock = pygame.time.Clock()
 
-        # Track last known positions for incremental updates
-        self.last_food_positions = set()
-        self.last_home_pheromones = set()
-        self.last_food_pheromones = set()
+        # Terrain layer kept between frames: static_pixels holds the dirt,
+        # grid lines, walls, colony and food, terrain_surface adds the
+        # pheromone tint of the cells in tinted_cells (flat y * width + x).
+        # Only cells reported changed by the environment are redrawn.
+        self.terrain_surface = pygame.Surface((self.width, self.height))
+        self.static_pixels = None
+        self.static_drawn = None
+        self.tinted_cells = np.zeros(0, dtype=np.int64)
+        self.layer_key = None
+        # Downsampled terrain layers for zoomed-out views, built on demand:
+        # lod_levels[k - 1] averages blocks of 2^k x 2^k layer pixels and is
+        # kept current from the cells redrawn since, queued in lod_dirty
+        self.lod_levels = []
+        self.lod_dirty = []
+
+        # Viewport: screen pixels per cell and the cell at the top-left corner
+        self.default_zoom = float(cell_size * scale_factor)
+        self.zoom = self.default_zoom
+        self.view_x = 0.0
+        self.view_y = 0.0
+        self.drag_start = None
+        if fit:
+            self.fit_view()
+        else:
+            self.clamp_view()
 
     def run(self) -> None:
-        running = True
-        last_update = time.time()
+        self.running = True
         self.start_time = time.time()  # Record when simulation starts
 
         if self.verbose:
@@ -93,285 +297,588 @@ class AntSimulationGUI:
             else:
                 print("No step limit (unlimited)")
 
-        while running:
-            # Process events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        self.paused = not self.paused
-                    elif event.key == pygame.K_p:
-                        self.show_pheromones = not self.show_pheromones
-                    elif event.key == pygame.K_s:
-                        self.show_stats = not self.show_stats
-                    elif event.key == pygame.K_g:
-                        # Toggle grid
-                        self.show_grid = not self.show_grid
-                    elif event.key == pygame.K_n and self.paused:
-                        # Single step when paused
-                        self.environment.update()
-                        self.step_count += 1
-                        # Check if simulation is complete after manual step
-                        if self.environment.is_complete():
-                            self.simulation_complete = True
-                            self.paused = True
-
-            # Update simulation if not paused and not complete
-            current_time = time.time()
-            if (
-                not self.paused
-                and not self.simulation_complete
-                and current_time - last_update > 1.0 / self.fps
-            ):
-                self.environment.update()
-                self.step_count += 1
-                last_update = current_time
-
-                # Print progress updates at specified intervals
-                if self.verbose and self.step_count % self.progress_interval == 0:
-                    food_collected = self.environment.food_collected
-                    completion_pct = (
-                        (food_collected / self.initial_food * 100)
-                        if self.initial_food > 0
-                        else 0
-                    )
-                    ants_with_food = sum(
-                        1 for ant in self.environment.ants if ant.has_food
-                    )
-
-                    print(
-                        f"Step {self.step_count}: "
-                        f"Food collected: {food_collected}/{self.initial_food} ({completion_pct:.1f}%) | "
-                        f"Ants with food: {ants_with_food}/{len(self.environment.ants)}"
-                    )
-
-                # Check if simulation is complete
-                if self.environment.is_complete():
-                    self.simulation_complete = True
-                    self.paused = True
-                    if self.verbose:
-                        print(
-                            f"Simulation complete! All food collected in {self.step_count} steps."
-                        )
-
-                # Check if we've reached time limit
-                elapsed_time = current_time - self.start_time
-                if self.time_limit > 0 and elapsed_time >= self.time_limit:
-                    self.simulation_complete = True
-                    self.paused = True
-                    if self.verbose:
-                        print(f"Time limit reached: {self.time_limit} seconds")
-                    if self.environment.is_complete():
-                        if self.verbose:
-                            print("Simulation complete! All food collected.")
+        # The simulation steps in a worker thread at its own pace, this loop
+        # only handles events and draws the latest state at display rate
+        worker = SimulationWorker(self)
+        worker.start()
+        try:
+            while self.running:
+                # Process events
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    elif event.type == pygame.KEYDOWN:
+                        self.handle_key(event.key)
                     else:
-                        completion = self.environment.get_completion_percentage()
-                        if self.verbose:
-                            print(
-                                f"Simulation incomplete. Completion: {completion:.1f}%"
-                            )
-
-                # Check if we've reached max steps
-                if self.max_steps > 0 and self.step_count >= self.max_steps:
-                    if self.verbose:
-                        print(f"Reached maximum steps: {self.max_steps}")
-                    if self.environment.is_complete():
-                        if self.verbose:
-                            print("Simulation completed successfully!")
-                    else:
-                        if self.verbose:
-                            print(
-                                f"Simulation ended without collecting all food. Food collected: {self.environment.food_collected}/{self.environment.initial_food_amount}"
-                            )
-                    running = False
+                        self.handle_mouse(event)
+
+                # Draw everything
+                with self.lock:
+                    self.draw()
+
+                # Cap framerate, lower in turbo mode to leave time for stepping
+                display_fps = self.display_fps
+                if self.turbo:
+                    display_fps = min(display_fps, TURBO_DISPLAY_FPS)
+                self.clock.tick(display_fps)
+        finally:
+            worker.stop()
+            pygame.quit()
+        if worker.error is not None:
+            raise worker.error
+
+    def handle_key(self, key: int) -> None:
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_p:
+            self.show_pheromones = not self.show_pheromones
+        elif key == pygame.K_s:
+            self.show_stats = not self.show_stats
+        elif key == pygame.K_g:
+            # Toggle grid
+            self.show_grid = not self.show_grid
+        elif key == pygame.K_t:
+            # Step as fast as possible instead of at --fps steps per second
+            self.turbo = not self.turbo
+        elif key in (pygame.K_PLUS, pygame.K_EQUALS):
+            # Faster replay
+            self.replay_speed *= 2
+        elif key == pygame.K_MINUS:
+            self.replay_speed = max(1, self.replay_speed // 2)
+        elif key == pygame.K_n and self.paused:
+            # Single step when paused
+            with self.lock:
+                self.step(1)
+        elif key == pygame.K_PAGEUP:
+            self.zoom_at(2.0, self.scaled_width / 2, self.scaled_height / 2)
+        elif key == pygame.K_PAGEDOWN:
+            self.zoom_at(0.5, self.scaled_width / 2, self.scaled_height / 2)
+        elif key == pygame.K_f:
+            self.fit_view()
+        elif key == pygame.K_HOME:
+            self.zoom, self.view_x, self.view_y = self.default_zoom, 0.0, 0.0
+            self.clamp_view()
+        elif key in PAN_KEYS:
+            # Pan by a quarter of the view
+            dx, dy = PAN_KEYS[key]
+            self.view_x += dx * self.scaled_width / self.zoom / 4
+            self.view_y += dy * self.scaled_height / self.zoom / 4
+            self.clamp_view()
+
+    def handle_mouse(self, event) -> None:
+        """Zoom with the wheel at the cursor, pan by dragging the map"""
+        if event.type == pygame.MOUSEWHEEL:
+            x, y = pygame.mouse.get_pos()
+            self.zoom_at(WHEEL_ZOOM**event.y, x, y)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if event.pos[1] < self.scaled_height:
+                self.drag_start = (event.pos, self.view_x, self.view_y)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.drag_start = None
+        elif event.type == pygame.MOUSEMOTION and self.drag_start is not None:
+            (start_x, start_y), view_x, view_y = self.drag_start
+            self.view_x = view_x - (event.pos[0] - start_x) / self.zoom
+            self.view_y = view_y - (event.pos[1] - start_y) / self.zoom
+            self.clamp_view()
+
+    def zoom_at(self, factor: float, screen_x: float, screen_y: float) -> None:
+        """Change the zoom keeping the cell under a screen position in place"""
+        cell_x = self.view_x + screen_x / self.zoom
+        cell_y = self.view_y + screen_y / self.zoom
+        self.zoom = min(MAX_ZOOM, max(self.min_zoom(), self.zoom * factor))
+        self.view_x = cell_x - screen_x / self.zoom
+        self.view_y = cell_y - screen_y / self.zoom
+        self.clamp_view()
+
+    def min_zoom(self) -> float:
+        """Zoom showing the whole map, or the default zoom if that is smaller"""
+        env = self.environment
+        fit = min(self.scaled_width / env.width, self.scaled_height / env.height)
+        return min(fit, self.default_zoom)
+
+    def fit_view(self) -> None:
+        self.zoom = self.min_zoom()
+        self.clamp_view()
+
+    def clamp_view(self) -> None:
+        """Keep the map in view, centred along an axis it doesn't fill"""
+        env = self.environment
+        visible_width = self.scaled_width / self.zoom
+        visible_height = self.scaled_height / self.zoom
+        if visible_width >= env.width:
+            self.view_x = (env.width - visible_width) / 2
+        else:
+            self.view_x = min(max(0.0, self.view_x), env.width - visible_width)
+        if visible_height >= env.height:
+            self.view_y = (env.height - visible_height) / 2
+        else:
+            self.view_y = min(max(0.0, self.view_y), env.height - visible_height)
+
+    def step(self, steps: Optional[int] = None) -> None:
+        """Advance the simulation and check the end conditions
+
+        steps defaults to replay_speed recorded steps in replays and one step
+        otherwise. Call with the lock held while the GUI is running.
+        """
+        previous_step = self.step_count
+        if steps is None:
+            steps = self.replay_speed if self.replay is not None else 1
+        self.advance(steps)
+
+        # Print progress updates at specified intervals, also when several
+        # steps are advanced at once
+        interval = self.progress_interval
+        if self.verbose and self.step_count // interval > previous_step // interval:
+            food_collected = self.environment.food_collected
+            completion_pct = (
+                (food_collected / self.initial_food * 100)
+                if self.initial_food > 0
+                else 0
+            )
+            ants_with_food = sum(1 for ant in self.environment.ants if ant.has_food)
 
-            # Draw everything
-            self.draw()
+            print(
+                f"Step {self.step_count}: "
+                f"Food collected: {food_collected}/{self.initial_food} ({completion_pct:.1f}%) | "
+                f"Ants with food: {ants_with_food}/{len(self.environment.ants)}"
+            )
 
-            # Cap framerate
-            self.clock.tick(60)
+        # Check if simulation is complete
+        if self.environment.is_complete() and not self.simulation_complete:
+            self.simulation_complete = True
+            self.paused = True
+            if self.verbose:
+                print(
+                    f"Simulation complete! All food collected in {self.step_count} steps."
+                )
 
-        pygame.quit()
+        # Check if we've reached time limit
+        elapsed_time = time.time() - self.start_time
+        if self.time_limit > 0 and elapsed_time >= self.time_limit:
+            self.simulation_complete = True
+            self.paused = True
+            if self.verbose:
+                print(f"Time limit reached: {self.time_limit} seconds")
+            if self.environment.is_complete():
+                if self.verbose:
+                    print("Simulation complete! All food collected.")
+            else:
+                completion = self.environment.get_completion_percentage()
+                if self.verbose:
+                    print(f"Simulation incomplete. Completion: {completion:.1f}%")
+
+        # Check if we've reached max steps
+        if self.max_steps > 0 and self.step_count >= self.max_steps:
+            if self.verbose:
+                print(f"Reached maximum steps: {self.max_steps}")
+            if self.environment.is_complete():
+                if self.verbose:
+                    print("Simulation completed successfully!")
+            else:
+                if self.verbose:
+                    print(
+                        f"Simulation ended without collecting all food. Food collected: {self.environment.food_collected}/{self.environment.initial_food_amount}"
+                    )
+            self.running = False
+
+    def advance(self, steps: int) -> None:
+        """Run one simulation step, or play back up to steps recorded ones"""
+        if self.replay is None:
+            self.environment.update()
+            self.step_count += 1
+            return
+
+        for _ in range(steps):
+            if not self.replay.update():
+                self.simulation_complete = True
+                self.paused = True
+                if self.verbose:
+                    print(f"Replay finished after {self.step_count} steps")
+                return
+            self.step_count += 1
+
+    def export(self, writer, every: int = 1) -> int:
+        """Run the simulation without a window, passing every Nth frame to writer
+
+        Frames are drawn straight after their step, without the event loop or
+        frame pacing, so exporting is as fast as the simulation. The first
+        and the last step are always exported. Returns the number of frames.
+        """
+        if self.max_steps <= 0 and self.time_limit <= 0 and self.replay is None:
+            raise ValueError("Exporting needs a step or time limit")
+
+        self.running = True
+        self.start_time = time.time()
+        every = max(1, every)
+        frames = 0
+        exported_step = None
+        try:
+            while True:
+                if exported_step != self.step_count:
+                    self.render_frame()
+                    writer.add(self.screen)
+                    frames += 1
+                    exported_step = self.step_count
+                if not self.running or self.simulation_complete:
+                    break
+
+                # Advance to the next exported step, or until the run ends
+                target = (self.step_count // every + 1) * every
+                while (
+                    self.step_count < target
+                    and self.running
+                    and not self.simulation_complete
+                ):
+                    self.step()
+        finally:
+            writer.close()
+            self.running = False
+        return frames
 
     def draw(self) -> None:
-        self.main_surface.fill(DIRT_COLOR)
+        self.render_frame()
+        pygame.display.flip()
 
-        if self.show_grid:
-            for x in range(0, self.width, 10):
-                pygame.draw.line(
-                    self.main_surface,
-                    (DIRT_R - 20, DIRT_G - 20, DIRT_B - 20),
-                    (x, 0),
-                    (x, self.height),
-                    1,
-                )
-            for y in range(0, self.height, 10):
-                pygame.draw.line(
-                    self.main_surface,
-                    (DIRT_R - 20, DIRT_G - 20, DIRT_B - 20),
-                    (0, y),
-                    (self.width, y),
-                    1,
-                )
+    def render_frame(self) -> None:
+        """Draw the map, ants and stats onto the screen surface"""
+        self.render_terrain()
 
-        if self.show_pheromones:
-            self.render_pixel_perfect()
-        else:
-            self.render_basic_terrain()
+        self.render_view()
 
         self.render_ants()
 
-        scaled_surface = pygame.transform.scale(
-            self.main_surface, (self.scaled_width, self.scaled_height)
-        )
-
-        self.screen.blit(scaled_surface, (0, 0))
-
         if self.show_stats:
             self.draw_stats()
 
-        pygame.display.flip()
+    def render_terrain(self) -> None:
+        """Bring the terrain layer up to date"""
+        env = self.environment
+        layer_key = (
+            self.show_grid,
+            self.show_pheromones,
+            env.terrain_version,
+            id(env.home_pheromones),
+            id(env.food_pheromones),
+        )
+        if layer_key != self.layer_key:
+            self.layer_key = layer_key
+            self.rebuild_terrain_layer()
+        else:
+            self.update_terrain_layer()
 
-    def render_basic_terrain(self) -> None:
-        for x in range(self.environment.width):
-            for y in range(self.environment.height):
-                terrain = self.environment.get_terrain(x, y)
-                if terrain == TerrainType.FOOD:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        FOOD_COLOR,
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
-                elif terrain == TerrainType.COLONY:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        (HOME_R, HOME_G, HOME_B),
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
-                elif terrain == TerrainType.WALL:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        GRAY,
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
+    def rebuild_terrain_layer(self) -> None:
+        """Render the whole terrain layer from scratch"""
+        env = self.environment
+        env.take_terrain_changes()
+        env.home_pheromones.take_modified_positions()
+        env.food_pheromones.take_modified_positions()
 
-    def render_pixel_perfect(self) -> None:
-        max_pheromone = 100.0
-
-        for y in range(self.environment.height):
-            for x in range(self.environment.width):
-                terrain = self.environment.get_terrain(x, y)
-                if terrain == TerrainType.FOOD:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        FOOD_COLOR,
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
-                    continue
-
-                # Draw colony
-                if terrain == TerrainType.COLONY:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        (HOME_R, HOME_G, HOME_B),
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
-                    continue
-
-                # Draw walls
-                if terrain == TerrainType.WALL:
-                    pygame.draw.rect(
-                        self.main_surface,
-                        GRAY,
-                        (
-                            x * self.cell_size,
-                            y * self.cell_size,
-                            self.cell_size,
-                            self.cell_size,
-                        ),
-                    )
-                    continue
+        surface = self.terrain_surface
+        surface.fill(DIRT_COLOR)
+        if self.show_grid:
+            for x in range(0, self.width, 10):
+                pygame.draw.line(surface, GRID_COLOR, (x, 0), (x, self.height), 1)
+            for y in range(0, self.height, 10):
+                pygame.draw.line(surface, GRID_COLOR, (0, y), (self.width, y), 1)
 
-                # Get pheromone values
-                home_val = self.environment.home_pheromones.get_value(x, y)
-                food_val = self.environment.food_pheromones.get_value(x, y)
+        colors, drawn = cell_colors(env, show_pheromones=False)
+        cells = np.flatnonzero(drawn)
+        self.write_cells(cells, colors.reshape(-1, 3)[cells])
+        self.static_pixels = pygame.surfarray.array3d(surface)
+        self.static_drawn = drawn.ravel()
 
-                # Skip pixels with no pheromones
-                if home_val == 0 and food_val == 0:
-                    continue
+        self.lod_levels = []
+        self.lod_dirty = []
+        self.tinted_cells = np.zeros(0, dtype=np.int64)
+        if self.show_pheromones:
+            home = env.home_pheromones.to_array().ravel()
+            food = env.food_pheromones.to_array().ravel()
+            self.tint_cells(np.flatnonzero((home != 0) | (food != 0)))
+
+    def update_terrain_layer(self) -> None:
+        """Redraw the cells whose terrain or pheromones changed since last frame"""
+        env = self.environment
+        width = env.width
+        changed = env.take_terrain_changes()
+        if changed:
+            cells = np.array([y * width + x for x, y in changed], dtype=np.int64)
+            self.update_static_cells(cells)
+            self.restore_cells(cells)
+
+        if not self.show_pheromones:
+            return
+        # Cells tinted last frame may have evaporated, new deposits add cells
+        modified = env.home_pheromones.take_modified_positions()
+        modified |= env.food_pheromones.take_modified_positions()
+        cells = np.array([y * width + x for x, y in modified], dtype=np.int64)
+        if changed:
+            cells = np.concatenate((cells, [y * width + x for x, y in changed]))
+        self.tint_cells(np.union1d(self.tinted_cells, cells))
+
+    def tint_cells(self, cells: np.ndarray) -> None:
+        """Draw the pheromone colour of empty cells, restoring those without any"""
+        env = self.environment
+        cells = cells[~self.static_drawn[cells]]
+        ys, xs = np.divmod(cells, env.width)
+        home = env.home_pheromones.get_values(xs, ys)
+        food = env.food_pheromones.get_values(xs, ys)
+        tinted = (home != 0) | (food != 0)
+        self.restore_cells(cells[~tinted])
+        self.tinted_cells = cells[tinted]
+        self.write_cells(
+            self.tinted_cells, blend_pheromones(home[tinted], food[tinted])
+        )
 
-                # Calculate percentages
-                home_pct = min(1.0, home_val / max_pheromone)
-                food_pct = min(1.0, food_val / max_pheromone)
+    def cell_pixels(self, cells: np.ndarray):
+        """Pixel x and y indices of whole cells, broadcastable per cell"""
+        size = self.cell_size
+        ys, xs = np.divmod(cells, self.environment.width)
+        offsets = np.arange(size)
+        return (
+            (xs * size)[:, None, None] + offsets[None, :, None],
+            (ys * size)[:, None, None] + offsets[None, None, :],
+        )
 
-                # Calculate blended color, exactly like in improved_ant.py
-                pixel_r = int(HOME_R * home_pct + DIRT_R * (1 - home_pct))
-                pixel_g = int(HOME_G * home_pct + DIRT_G * (1 - home_pct))
-                pixel_b = int(HOME_B * home_pct + DIRT_B * (1 - home_pct))
+    def write_cells(self, cells: np.ndarray, colors: np.ndarray) -> None:
+        """Fill cells of the terrain surface with one colour each"""
+        if not cells.size:
+            return
+        px, py = self.cell_pixels(cells)
+        pixels = pygame.surfarray.pixels3d(self.terrain_surface)
+        pixels[px, py] = colors[:, None, None, :]
+        del pixels  # Unlocks the surface
+        if self.lod_levels:
+            self.lod_dirty.append(cells)
+
+    def update_static_cells(self, cells: np.ndarray) -> None:
+        """Redraw cells of the static layer from their current terrain"""
+        # Read only these cells, terrain_array() would copy the whole map
+        rows = self.environment.terrain
+        ys, xs = np.divmod(cells, self.environment.width)
+        terrain = np.array(
+            [rows[y][x] for x, y in zip(xs.tolist(), ys.tolist())], dtype=np.uint8
+        )
+        drawn = terrain != TerrainType.EMPTY.value
+        self.static_drawn[cells] = drawn
 
-                pixel_r = int(FOOD_R * food_pct + pixel_r * (1 - food_pct))
-                pixel_g = int(FOOD_G * food_pct + pixel_g * (1 - food_pct))
-                pixel_b = int(FOOD_B * food_pct + pixel_b * (1 - food_pct))
+        # Terrain covers the grid lines, empty cells show dirt and the grid
+        px, py = self.cell_pixels(cells)
+        colors = np.empty(px.shape[:1] + (self.cell_size, self.cell_size, 3))
+        colors[...] = DIRT_COLOR
+        if self.show_grid:
+            colors[(px % 10 == 0) | (py % 10 == 0)] = GRID_COLOR
+        colors[drawn] = TERRAIN_COLORS[terrain[drawn]][:, None, None, :]
+        self.static_pixels[px, py] = colors
+
+    def restore_cells(self, cells: np.ndarray) -> None:
+        """Copy cells back from the static layer"""
+        if not cells.size:
+            return
+        px, py = self.cell_pixels(cells)
+        pixels = pygame.surfarray.pixels3d(self.terrain_surface)
+        pixels[px, py] = self.static_pixels[px, py]
+        del pixels
+        if self.lod_levels:
+            self.lod_dirty.append(cells)
+
+    def lod_level(self, level: int) -> np.ndarray:
+        """Terrain layer averaged over 2^level x 2^level pixel blocks, [x, y]"""
+        self.update_lod_levels()
+        while len(self.lod_levels) < level:
+            if self.lod_levels:
+                self.lod_levels.append(_downsample(self.lod_levels[-1]))
+            else:
+                pixels = pygame.surfarray.pixels3d(self.terrain_surface)
+                self.lod_levels.append(_downsample(pixels))
+                del pixels
+        return self.lod_levels[level - 1]
+
+    def update_lod_levels(self) -> None:
+        """Recompute the blocks of every level that cover redrawn cells"""
+        if not self.lod_dirty:
+            return
+        cells = np.unique(np.concatenate(self.lod_dirty))
+        self.lod_dirty = []
+
+        # Layer pixels of the cells, then the blocks containing them
+        px, py = self.cell_pixels(cells)
+        px, py = np.broadcast_arrays(px, py)
+        xs, ys = _unique_pairs(px.ravel() // 2, py.ravel() // 2)
+        pixels = pygame.surfarray.pixels3d(self.terrain_surface)
+        source = pixels
+        for level in self.lod_levels:
+            _downsample_at(source, level, xs, ys)
+            source = level
+            xs, ys = _unique_pairs(xs // 2, ys // 2)
+        del source, pixels
+
+    def map_rect(self) -> pygame.Rect:
+        """Part of the map area of the window the map covers"""
+        env = self.environment
+        left = round(-self.view_x * self.zoom)
+        top = round(-self.view_y * self.zoom)
+        right = round((env.width - self.view_x) * self.zoom)
+        bottom = round((env.height - self.view_y) * self.zoom)
+        view = pygame.Rect(0, 0, self.scaled_width, self.scaled_height)
+        return view.clip(pygame.Rect(left, top, right - left, bottom - top))
+
+    def render_view(self) -> None:
+        """Draw the visible part of the terrain layer into the map area
+
+        Only the visible cells are scaled to the window. When a screen pixel
+        covers two or more layer pixels, the visible part of a downsampled
+        level is used instead, so the cost depends on the window size, not
+        on the map size.
+        """
+        env = self.environment
+        zoom, size = self.zoom, self.cell_size
+        self.screen.fill(BLACK, (0, 0, self.scaled_width, self.scaled_height))
+
+        # Visible cells, clipped to the map
+        x0 = max(0, int(self.view_x))
+        y0 = max(0, int(self.view_y))
+        x1 = min(env.width, math.ceil(self.view_x + self.scaled_width / zoom))
+        y1 = min(env.height, math.ceil(self.view_y + self.scaled_height / zoom))
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        # Level of detail: layer pixels per screen pixel, halved per level
+        level = 0
+        shrink = size / zoom
+        while shrink >= 2:
+            level += 1
+            shrink /= 2
+        block = 1 << level
+
+        # Layer pixels, or level blocks, covering the visible cells
+        left, top = x0 * size // block, y0 * size // block
+        right, bottom = -(-x1 * size // block), -(-y1 * size // block)
+        if level == 0:
+            source = self.terrain_surface.subsurface(
+                (left, top, right - left, bottom - top)
+            )
+        else:
+            pixels = self.lod_level(level)[left:right, top:bottom]
+            source = pygame.surfarray.make_surface(pixels)
+
+        # Their place in the window
+        screen_left = round((left * block / size - self.view_x) * zoom)
+        screen_top = round((top * block / size - self.view_y) * zoom)
+        screen_right = round((right * block / size - self.view_x) * zoom)
+        screen_bottom = round((bottom * block / size - self.view_y) * zoom)
+        scaled = pygame.transform.scale(
+            source, (screen_right - screen_left, screen_bottom - screen_top)
+        )
+        self.screen.set_clip(self.map_rect())
+        self.screen.blit(scaled, (screen_left, screen_top))
+        self.screen.set_clip(None)
+
+    def visible_ants(self) -> tuple:
+        """x, y, direction value and has_food arrays of the ants in the view
+
+        Ants are 3 cells long, so those starting up to 3 cells before the
+        view are included. Read from the store's arrays when it is enabled,
+        else from the occupancy index, so ants outside the view cost nothing.
+        """
+        min_x, min_y = self.view_x - 3, self.view_y - 3
+        max_x = self.view_x + self.scaled_width / self.zoom
+        max_y = self.view_y + self.scaled_height / self.zoom
+
+        environment = self.environment
+        store = environment.ant_store
+        if store is not None:
+            count = store.count
+            xs, ys = store.x[:count], store.y[:count]
+            indices = np.flatnonzero(
+                (xs > min_x) & (xs < max_x) & (ys > min_y) & (ys < max_y)
+            )
+            return (
+                xs[indices],
+                ys[indices],
+                store.direction[indices],
+                store.has_food[indices],
+            )
 
-                # Draw the pixel
-                pygame.draw.rect(
-                    self.main_surface,
-                    (pixel_r, pixel_g, pixel_b),
-                    (
-                        x * self.cell_size,
-                        y * self.cell_size,
-                        self.cell_size,
-                        self.cell_size,
-                    ),
-                )
+        # Cells with min_x < x < max_x and min_y < y < max_y
+        x0, x1 = max(0, math.floor(min_x) + 1), min(environment.width, math.ceil(max_x))
+        y0, y1 = max(0, math.floor(min_y) + 1), min(environment.height, math.ceil(max_y))
+        ant_cells = environment.ant_cells
+        ants = []
+        if (x1 - x0) * (y1 - y0) < len(ant_cells):
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    occupants = ant_cells.get((x, y))
+                    if occupants:
+                        ants.extend(occupants)
+        else:
+            for (x, y), occupants in ant_cells.items():
+                if x0 <= x < x1 and y0 <= y < y1:
+                    ants.extend(occupants)
+        return (
+            np.array([ant.x for ant in ants], dtype=np.int64),
+            np.array([ant.y for ant in ants], dtype=np.int64),
+            np.array([ant.direction.value for ant in ants], dtype=np.int64),
+            np.array([ant.has_food for ant in ants], dtype=bool),
+        )
 
     def render_ants(self) -> None:
-        for ant in self.environment.ants:
-            color = FOOD_COLOR if ant.has_food else ANT_COLOR
-
-            this_x_f = ant.x * self.cell_size
-            this_y_f = ant.y * self.cell_size
-
-            dx, dy = Direction.get_delta(ant.direction)
-
-            if abs(dx) > abs(dy):
+        zoom = self.zoom
+        long_side = max(1, round(3 * zoom))
+        short_side = max(1, round(2 * zoom))
+
+        xs, ys, directions, has_food = self.visible_ants()
+        if not len(xs):
+            return
+        screen_xs = np.round((xs - self.view_x) * zoom).astype(np.int64)
+        screen_ys = np.round((ys - self.view_y) * zoom).astype(np.int64)
+        horizontal = (directions == Direction.EAST.value) | (
+            directions == Direction.WEST.value
+        )
+        has_food = has_food.astype(bool)
+
+        # Zoomed out many ants land on the same pixels. Keep each distinct
+        # rectangle once, at the place of its last ant so overlaps stay the same
+        # Ants start at most 3 cells before the view, so offsets keep keys positive
+        span = self.scaled_height + 4 * max(1, math.ceil(zoom))
+        keys = (
+            (screen_xs + span) * (2 * span) + (screen_ys + span)
+        ) * 4 + horizontal * 2 + has_food
+        _, last = np.unique(keys[::-1], return_index=True)
+        order = np.sort(len(keys) - 1 - last)
+        screen_xs, screen_ys = screen_xs[order], screen_ys[order]
+        horizontal, has_food = horizontal[order], has_food[order]
+
+        clip = self.map_rect()
+        if long_side == 1 and short_side == 1:
+            # Single pixels, written straight into the screen
+            inside = (
+                (screen_xs >= clip.left)
+                & (screen_xs < clip.right)
+                & (screen_ys >= clip.top)
+                & (screen_ys < clip.bottom)
+            )
+            colors = np.where(
+                has_food[inside, None], np.array(FOOD_COLOR), np.array(ANT_COLOR)
+            )
+            pixels = pygame.surfarray.pixels3d(self.screen)
+            pixels[screen_xs[inside], screen_ys[inside]] = colors
+            del pixels
+            return
+
+        self.screen.set_clip(clip)
+        for screen_x, screen_y, is_horizontal, carrying in zip(
+            screen_xs.tolist(), screen_ys.tolist(), horizontal.tolist(), has_food.tolist()
+        ):
+            color = FOOD_COLOR if carrying else ANT_COLOR
+            if is_horizontal:
                 pygame.draw.rect(
-                    self.main_surface,
-                    color,
-                    (this_x_f, this_y_f, 3 * self.cell_size, 2 * self.cell_size),
+                    self.screen, color, (screen_x, screen_y, long_side, short_side)
                 )
             else:
                 pygame.draw.rect(
-                    self.main_surface,
-                    color,
-                    (this_x_f, this_y_f, 2 * self.cell_size, 3 * self.cell_size),
+                    self.screen, color, (screen_x, screen_y, short_side, long_side)
                 )
+        self.screen.set_clip(None)
 
     def draw_stats(self) -> None:
         pygame.draw.rect(
@@ -402,17 +909,22 @@ class AntSimulationGUI:
                 remaining_time = f"{remaining:.1f}s"
 
         fps = self.clock.get_fps()
+        sampled_step, sampled_at = self.rate_sample
+        now = time.perf_counter()
+        if now - sampled_at >= 1.0:
+            self.steps_per_second = (self.step_count - sampled_step) / (now - sampled_at)
+            self.rate_sample = (self.step_count, now)
 
         status = (
             "COMPLETE"
             if self.simulation_complete
-            else "PAUSED" if self.paused else "RUNNING"
+            else "PAUSED" if self.paused else "TURBO" if self.turbo else "RUNNING"
         )
         grid_status = "ON" if self.show_grid else "OFF"
         pher_status = "ON" if self.show_pheromones else "OFF"
 
         lines = [
-            f"FPS: {fps:.1f} | Status: {status} | Step: {self.step_count} | Time: {elapsed_time:.1f}s",
+            f"FPS: {fps:.1f} | Steps/s: {self.steps_per_second:.0f} | Status: {status} | Step: {self.step_count} | Time: {elapsed_time:.1f}s",
             f"Ants: {total_ants} | With Food: {ants_with_food} | Food Collected: {food_collected}/{total_food}",
             f"Grid: {grid_status} | Pheromones: {pher_status}"
             + (
@@ -422,7 +934,12 @@ class AntSimulationGUI:
             ),
         ]
 
-        if self.simulation_complete:
+        lines[2] += f" | Zoom: {self.zoom:.2f}"
+        if self.replay is not None:
+            lines[2] += f" | Replay: {self.replay_speed}x"
+        if self.replay is not None and self.replay.finished:
+            lines.append(f"REPLAY FINISHED after {self.step_count} steps.")
+        elif self.simulation_complete:
             lines.append(
                 f"SIMULATION COMPLETE! All food collected in {self.step_count} steps."
             )
@@ -434,13 +951,29 @@ class AntSimulationGUI:
             y_offset += 25
 
         controls = self.font.render(
-            "SPACE: Pause | P: Toggle Pheromones | G: Toggle Grid | S: Toggle Stats | N: Step (when paused)",
+            "SPACE: Pause | T: Turbo | P: Toggle Pheromones | G: Toggle Grid | S: Toggle Stats | N: Step (when paused) | Wheel/PgUp/PgDn: Zoom | Arrows/Drag: Pan | F: Fit | Home: Reset",
             True,
             (180, 180, 180),
         )
         self.screen.blit(controls, (15, y_offset))
 
 
+def run_or_export(gui: AntSimulationGUI, args) -> None:
+    """Open the window, or export frames headless with --export"""
+    if not args.export:
+        gui.run()
+        return
+
+    writer = open_frame_writer(args.export, fps=args.export_fps)
+    start = time.time()
+    frames = gui.export(writer, every=args.export_every)
+    if gui.verbose:
+        print(
+            f"Exported {frames} frames of {gui.step_count} steps to {args.export} "
+            f"in {time.time() - start:.1f}s"
+        )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ant Colony Simulation")
     parser.add_argument(
@@ -491,7 +1024,38 @@ def main():
         help="Display scale factor (default: 2x)",
     )
     parser.add_argument(
-        "--fps", type=int, default=30, help="Target simulation FPS (default: 30)"
+        "--fps",
+        type=int,
+        default=30,
+        help="Target simulation steps per second, 0 = as fast as possible (default: 30)",
+    )
+    parser.add_argument(
+        "--view-width",
+        type=int,
+        default=0,
+        help=f"Width of the map area of the window in pixels (default: the scaled map, at most {MAX_VIEW_WIDTH})",
+    )
+    parser.add_argument(
+        "--view-height",
+        type=int,
+        default=0,
+        help=f"Height of the map area of the window in pixels (default: the scaled map, at most {MAX_VIEW_HEIGHT})",
+    )
+    parser.add_argument(
+        "--fit",
+        action="store_true",
+        help="Start zoomed out to show the whole map - F does the same while running",
+    )
+    parser.add_argument(
+        "--display-fps",
+        type=int,
+        default=60,
+        help="Frames drawn per second, independent of the simulation speed (default: 60)",
+    )
+    parser.add_argument(
+        "--turbo",
+        action="store_true",
+        help="Start in turbo mode, stepping as fast as possible - T toggles it while running",
     )
     parser.add_argument(
         "--max-steps",
@@ -505,6 +1069,56 @@ def main():
         default=0,
         help="Time limit in seconds (0 = no limit) (default: 0) - command line value takes precedence over environment file",
     )
+    parser.add_argument(
+        "--pheromone-map",
+        type=str,
+        choices=["sparse", "dense", "lazy"],
+        default="sparse",
+        help="Pheromone storage: sparse dict, dense array or lazy timestamp decay (default: sparse) - dense suits large, pheromone-heavy maps, lazy suits long runs",
+    )
+    parser.add_argument(
+        "--ant-store",
+        action="store_true",
+        help="Keep ant state in arrays and apply each step's actions in batch (all ants perceive the start-of-step state)",
+    )
+    parser.add_argument(
+        "--lazy-perception",
+        action="store_true",
+        help="Only compute the perception fields a strategy actually reads",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed, makes generated environments and ant behaviour reproducible (default: unseeded)",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        help="Play back a trajectory recorded with simulation.py --record instead of running a strategy - environment and ant options are taken from the recording",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=int,
+        default=1,
+        help="Recorded steps shown per simulation tick, +/- change it while running (default: 1)",
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        help="Run without a window and save frames instead: a .gif (needs Pillow) or video file such as .mp4 (needs ffmpeg), otherwise a directory of PNG files - needs --max-steps or --time-limit",
+    )
+    parser.add_argument(
+        "--export-every",
+        type=int,
+        default=1,
+        help="Export a frame every N steps (default: 1)",
+    )
+    parser.add_argument(
+        "--export-fps",
+        type=int,
+        default=30,
+        help="Frame rate of exported GIF and video files (default: 30)",
+    )
     parser.add_argument("--quiet", action="store_true", help="Suppress progress output")
     parser.add_argument(
         "--progress-interval",
@@ -515,7 +1129,43 @@ def main():
     args = parser.parse_args()
 
     try:
-        environment = create_environment(args.env, args.width, args.height)
+        if args.replay:
+            replay = TrajectoryReplay(args.replay, verbose=not args.quiet)
+            if not args.quiet:
+                print(
+                    f"Replaying {args.replay} with {len(replay.environment.ants)} ants"
+                )
+            gui = AntSimulationGUI(
+                replay.environment,
+                cell_size=args.cell_size,
+                fps=args.fps,
+                scale_factor=args.scale,
+                max_steps=args.max_steps,
+                time_limit=args.time_limit,
+                verbose=not args.quiet,
+                progress_interval=args.progress_interval,
+                replay=replay,
+                replay_speed=args.replay_speed,
+                display_fps=args.display_fps,
+                turbo=args.turbo,
+                headless=bool(args.export),
+                view_width=args.view_width,
+                view_height=args.view_height,
+                fit=args.fit,
+            )
+            run_or_export(gui, args)
+            return
+
+        if args.seed is not None:
+            # Also seeds strategies that use the random module directly
+            random.seed(args.seed)
+        environment = create_environment(
+            args.env, args.width, args.height, seed=args.seed
+        )
+        environment.set_pheromone_map(args.pheromone_map)
+        if args.ant_store:
+            environment.enable_ant_store()
+        environment.lazy_perception = args.lazy_perception
 
         # Check if environment file specified a number of ants
         ant_count = args.ants
@@ -561,8 +1211,14 @@ def main():
             time_limit=time_limit,
             verbose=not args.quiet,
             progress_interval=args.progress_interval,
+            display_fps=args.display_fps,
+            turbo=args.turbo,
+            headless=bool(args.export),
+            view_width=args.view_width,
+            view_height=args.view_height,
+            fit=args.fit,
         )
-        gui.run()
+        run_or_export(gui, args)
 
     except Exception as e:
         print(f"Error: {str(e)}")
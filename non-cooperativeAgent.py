@@ -1,4 +1,3 @@
-import random
 from environment import TerrainType, AntPerception
 from ant import AntAction, AntStrategy
 
@@ -55,7 +54,7 @@ class NonCooperativeAgent(AntStrategy):
         return action
     
     def _random_move(self, ant_id, movement_list, perception):
-        movement_choice = random.random()
+        movement_choice = perception.rng.random()
         
 
         if (0,1) in perception.visible_cells:
@@ -100,8 +100,7 @@ class PathMemoryStrategy(AntStrategy):
 
     def _choose_exploration_action(self, perception: AntPerception) -> AntAction:
         """Basic exploration behavior to reach food (simple forward-biased random walk)"""
-        import random
-        r = random.random()
+        r = perception.rng.random()
         
 
         if len(perception.visible_cells) == 1 or len(perception.visible_cells) == 4:
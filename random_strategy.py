@@ -1,4 +1,3 @@
-import random
 from environment import TerrainType, AntPerception
 from ant import AntAction, AntStrategy
 
@@ -25,45 +24,35 @@ class RandomStrategy(AntStrategy):
 
         # Get ant's ID to track its actions
         ant_id = perception.ant_id
-        last_action = self.ants_last_action.get(ant_id, None)
+        action = self._next_action(perception, self.ants_last_action.get(ant_id))
+        self.ants_last_action[ant_id] = action
+        return action
+
+    def _next_action(self, perception: AntPerception, last_action) -> AntAction:
+        """The action of one ant, given the action it took last"""
+        current = perception.visible_cells.get((0, 0))
 
         # Priority 1: Pick up food if standing on it
-        if (
-            not perception.has_food
-            and (0, 0) in perception.visible_cells
-            and perception.visible_cells[(0, 0)] == TerrainType.FOOD
-        ):
-            self.ants_last_action[ant_id] = AntAction.PICK_UP_FOOD
+        if not perception.has_food and current == TerrainType.FOOD:
             return AntAction.PICK_UP_FOOD
 
         # Priority 2: Drop food if at colony and carrying food
-        if (
-            perception.has_food
-            and TerrainType.COLONY in perception.visible_cells.values()
-        ):
-            for pos, terrain in perception.visible_cells.items():
-                if terrain == TerrainType.COLONY:
-                    if pos == (0, 0):  # Directly on colony
-                        self.ants_last_action[ant_id] = AntAction.DROP_FOOD
-                        return AntAction.DROP_FOOD
+        if perception.has_food and current == TerrainType.COLONY:
+            return AntAction.DROP_FOOD
 
         # Alternate between movement and dropping pheromones
         # If last action was not a pheromone drop, drop pheromone
-        if last_action not in [
+        if last_action not in (
             AntAction.DEPOSIT_HOME_PHEROMONE,
             AntAction.DEPOSIT_FOOD_PHEROMONE,
-        ]:
+        ):
             if perception.has_food:
-                self.ants_last_action[ant_id] = AntAction.DEPOSIT_FOOD_PHEROMONE
                 return AntAction.DEPOSIT_FOOD_PHEROMONE
             else:
-                self.ants_last_action[ant_id] = AntAction.DEPOSIT_HOME_PHEROMONE
                 return AntAction.DEPOSIT_HOME_PHEROMONE
 
         # Otherwise, perform movement
-        action = self._decide_movement(perception)
-        self.ants_last_action[ant_id] = action
-        return action
+        return self._decide_movement(perception)
 
     def _decide_movement(self, perception: AntPerception) -> AntAction:
         """Decide which direction to move based on current state"""
@@ -81,8 +70,8 @@ class RandomStrategy(AntStrategy):
                     if pos[1] > 0:  # Food is ahead in some direction
                         return AntAction.MOVE_FORWARD
 
-        # Random movement if no specific goal
-        movement_choice = random.random()
+        # Random movement if no specific goal, from the ant's own stream
+        movement_choice = perception.rng.random()
 
         if movement_choice < 0.6:  # 60% chance to move forward
             return AntAction.MOVE_FORWARD
@@ -1,10 +1,14 @@
 # Command-line simulation runner for ant colony simulation.
 
 import argparse
+import random
 import time
 import sys
+from typing import Optional
 
 from environment import Environment
+from snapshot import save_snapshot, load_snapshot
+from trajectory import TrajectoryRecorder
 from utils import create_environment, add_ants
 
 
@@ -15,6 +19,8 @@ class SimulationRunner:
         max_steps: int = 10000,
         progress_interval: int = 100,
         time_limit: float = 0,  # Time limit in seconds, 0 means no limit
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 0,  # Steps between checkpoints, 0 means only at the end
     ):
         self.environment = environment
         self.max_steps = max_steps
@@ -22,9 +28,31 @@ class SimulationRunner:
         self.step_count = 0
         self.time_limit = time_limit
         self.duration = 0.0  # Initialize duration attribute
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+
+    @classmethod
+    def resume(cls, filename: str, **kwargs) -> "SimulationRunner":
+        """Runner continuing from a checkpoint written by save_checkpoint"""
+        environment, state = load_snapshot(filename)
+        runner = cls(environment, **kwargs)
+        runner.step_count = state.get("step_count", environment.steps)
+        if "random_state" in state:
+            random.setstate(state["random_state"])
+        return runner
+
+    def save_checkpoint(self, filename: Optional[str] = None) -> None:
+        """Snapshot the environment, ants, strategies and step count"""
+        save_snapshot(
+            self.environment,
+            filename or self.checkpoint_path,
+            # The random module too, for strategies that don't use perception.rng
+            {"step_count": self.step_count, "random_state": random.getstate()},
+        )
 
     def run(self, verbose: bool = True) -> dict:
         start_time = time.time()
+        start_step = self.step_count  # Non-zero when resumed from a checkpoint
         initial_food = self.environment.initial_food_amount
         if verbose:
             print(f"Starting simulation with {len(self.environment.ants)} ants")
@@ -51,6 +79,12 @@ class SimulationRunner:
         ):
             self.environment.update()
             self.step_count += 1
+            if (
+                self.checkpoint_path
+                and self.checkpoint_interval > 0
+                and self.step_count % self.checkpoint_interval == 0
+            ):
+                self.save_checkpoint()
             # print(f"Step {self.step_count} / {self.max_steps}")
             # Print progress updates at specified intervals
             if verbose and self.step_count % self.progress_interval == 0:
@@ -65,11 +99,19 @@ class SimulationRunner:
                     f"Food collected: {food_collected}/{initial_food} ({completion_pct:.1f}%) | "
                     f"Ants with food: {ants_with_food}/{len(self.environment.ants)}"
                 )
+                if self.environment.stats is not None:
+                    print(self.environment.stats.format())
 
         # Print final results
         end_time = time.time()
         self.duration = end_time - start_time
 
+        # Final checkpoint, so a run can be extended or forked from where it stopped
+        if self.checkpoint_path:
+            self.save_checkpoint()
+            if verbose:
+                print(f"Checkpoint saved to {self.checkpoint_path}")
+
         if verbose:
             if self.environment.is_complete():
                 print(
@@ -91,7 +133,11 @@ class SimulationRunner:
                 )
 
             print(f"Total runtime: {self.duration:.2f} seconds")
-            print(f"Average steps per second: {self.step_count / self.duration:.1f}")
+            print(
+                f"Average steps per second: {(self.step_count - start_step) / self.duration:.1f}"
+            )
+            if self.environment.stats is not None:
+                print(self.environment.stats.format())
 
         # Calculate completion percentage
         completion_percentage = (
@@ -101,7 +147,7 @@ class SimulationRunner:
         )
 
         # Return a dictionary with completion percentage, number of steps, and time taken
-        return {
+        result = {
             "completion_percentage": completion_percentage,
             "food_collected": self.environment.food_collected,
             "total_food": self.environment.initial_food_amount,
@@ -110,6 +156,9 @@ class SimulationRunner:
             "steps": self.step_count,
             "time_taken": self.duration,
         }
+        if self.environment.stats is not None:
+            result["phase_stats"] = self.environment.stats.as_dict()
+        return result
 
 
 def main():
@@ -170,24 +219,82 @@ def main():
         default=0,
         help="Time limit for simulation (in seconds) (default: 0, no limit) - command line value takes precedence over environment file",
     )
+    parser.add_argument(
+        "--pheromone-map",
+        type=str,
+        choices=["sparse", "dense", "lazy"],
+        default="sparse",
+        help="Pheromone storage: sparse dict, dense array or lazy timestamp decay (default: sparse) - dense suits large, pheromone-heavy maps, lazy suits long runs",
+    )
+    parser.add_argument(
+        "--ant-store",
+        action="store_true",
+        help="Keep ant state in arrays and apply each step's actions in batch (all ants perceive the start-of-step state)",
+    )
+    parser.add_argument(
+        "--lazy-perception",
+        action="store_true",
+        help="Only compute the perception fields a strategy actually reads",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each phase of the update (evaporate, perception, decide, execute) and print the breakdown with progress updates",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Snapshot file to save the simulation state to, at the end and every --checkpoint-interval steps",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=0,
+        help="Save a checkpoint every N steps (default: 0, only at the end)",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        help="Continue from a snapshot file - environment, ant and pheromone options are taken from the snapshot",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        help="Trajectory file to record every ant's position, direction, food and action to, for replay in the GUI with --replay",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed, makes generated environments and ant behaviour reproducible (default: unseeded)",
+    )
     parser.add_argument("--quiet", action="store_true", help="Suppress progress output")
 
     args = parser.parse_args()
+    recorder = None
 
     try:
-        environment = create_environment(
-            args.env, args.width, args.height, verbose=not args.quiet
-        )
-
-        # Check if environment file specified a number of ants
-        ant_count = args.ants
-        if (
-            hasattr(environment, "requested_ant_count")
-            and environment.requested_ant_count > 0
-        ):
-            ant_count = environment.requested_ant_count
+        if args.resume:
+            runner = SimulationRunner.resume(args.resume)
+            environment = runner.environment
             if not args.quiet:
-                print(f"Using ant count from environment file: {ant_count}")
+                print(f"Resumed from {args.resume} at step {runner.step_count}")
+        else:
+            if args.seed is not None:
+                # Also seeds strategies that use the random module directly
+                random.seed(args.seed)
+            environment = create_environment(
+                args.env,
+                args.width,
+                args.height,
+                verbose=not args.quiet,
+                seed=args.seed,
+            )
+            environment.set_pheromone_map(args.pheromone_map)
+            if args.ant_store:
+                environment.enable_ant_store()
+        environment.lazy_perception = args.lazy_perception
+        if args.profile:
+            environment.enable_stats()
 
         # For time limit and max steps, command line args take precedence
         time_limit = args.time_limit
@@ -213,22 +320,41 @@ def main():
             if not args.quiet:
                 print(f"Using max steps from environment file: {max_steps} steps")
 
-        add_ants(
-            environment,
-            args.strategy,
-            args.strategy_file,
-            ant_count,
-            verbose=not args.quiet,
-        )
-        runner = SimulationRunner(
-            environment,
-            max_steps=max_steps,
-            progress_interval=args.progress_interval,
-            time_limit=time_limit,
-        )
+        if not args.resume:
+            # Check if environment file specified a number of ants
+            ant_count = args.ants
+            if (
+                hasattr(environment, "requested_ant_count")
+                and environment.requested_ant_count > 0
+            ):
+                ant_count = environment.requested_ant_count
+                if not args.quiet:
+                    print(f"Using ant count from environment file: {ant_count}")
+
+            add_ants(
+                environment,
+                args.strategy,
+                args.strategy_file,
+                ant_count,
+                verbose=not args.quiet,
+            )
+            runner = SimulationRunner(environment)
+        runner.max_steps = max_steps
+        runner.progress_interval = args.progress_interval
+        runner.time_limit = time_limit
+        runner.checkpoint_path = args.checkpoint
+        runner.checkpoint_interval = args.checkpoint_interval
+
+        if args.record:
+            recorder = TrajectoryRecorder(environment, args.record).start()
 
         result = runner.run(verbose=not args.quiet)
 
+        if recorder is not None:
+            recorder.close()
+            if not args.quiet:
+                print(f"Trajectory of {recorder.steps} steps saved to {args.record}")
+
         if not args.quiet:
             print(f"\nSimulation completed in {result['steps']} steps")
             print(
@@ -240,6 +366,9 @@ def main():
 
     except Exception as e:
         error_message = f"Error: {str(e)}"
+        if recorder is not None:
+            # Keep the steps recorded up to the error
+            recorder.close()
 
         # Try to get time_limit and max_steps values if they were set earlier, otherwise use 0
         safe_time_limit = time_limit if "time_limit" in locals() else 0
@@ -264,6 +393,28 @@ def main():
 
 
 if __name__ == "__main__":
+    # "simulation.py batch ..." runs many seeded simulations in parallel
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+    # "simulation.py sweep ..." runs a cached parameter sweep
+    if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        from sweep import main as sweep_main
+
+        sys.exit(sweep_main(sys.argv[2:]))
+
+    # "simulation.py convert ..." converts environment files between formats
+    if len(sys.argv) > 1 and sys.argv[1] == "convert":
+        from convert_env import main as convert_main
+
+        sys.exit(convert_main(sys.argv[2:]))
+    # "simulation.py bench ..." runs the throughput benchmark suite
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from benchmark import main as bench_main
+
+        sys.exit(bench_main(sys.argv[2:]))
+
     result = main()
     # Return 0 for success (100% completion) or 1 for incomplete simulation
     exit_code = (
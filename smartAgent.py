@@ -1,7 +1,6 @@
 from environment import TerrainType, AntPerception
 from ant import AntAction, AntStrategy
 from common import Direction
-import random
 
 class SmartAgent(AntStrategy):
     """
@@ -91,7 +90,7 @@ class SmartAgent(AntStrategy):
     def _choose_exploration_action(self, perception: AntPerception) -> AntAction:
         """Basic exploration behavior to reach food (simple forward-biased random walk)"""
 
-        r = random.random()
+        r = perception.rng.random()
         
 
         if len(perception.visible_cells) == 1 or (len(perception.visible_cells) <= 4 and perception.direction.value not in [0, 2, 4, 6]):
@@ -201,7 +200,7 @@ class SmartAgent(AntStrategy):
 
         if perception.visible_cells[delta] == TerrainType.WALL: # If the ant is going to a wall, make it turn
             ant_memory["bypassing"] = True
-            r = random.random()
+            r = perception.rng.random()
             if r > 0.5:
                 return AntAction.TURN_RIGHT
             elif r <= 0.5:
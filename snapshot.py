@@ -0,0 +1,129 @@
+# Binary checkpoints of a running simulation.
+
+import importlib.util
+import inspect
+import io
+import os
+import pickle
+import random
+import sys
+import zlib
+from typing import Optional, Tuple
+
+from ant import AntStrategy
+from environment import Environment
+
+# File header: magic bytes followed by the format version
+MAGIC = b"ANTSNAP"
+VERSION = 1
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler that stores strategy classes by source file
+
+    Strategies loaded with utils.load_strategy_from_file live in modules that
+    are not importable by name, so their classes are saved as the file they
+    were defined in and loaded from it again on restore. The random module,
+    the rng of perceptions in unseeded runs, is saved by reference.
+    """
+
+    def persistent_id(self, obj):
+        if obj is random:
+            return ("module", "random", None)
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, AntStrategy)
+            and obj is not AntStrategy
+        ):
+            return ("strategy", os.path.abspath(_class_file(obj)), obj.__name__)
+        return None
+
+
+def _class_file(cls: type) -> str:
+    """Source file of a class, also for modules missing from sys.modules"""
+    module = sys.modules.get(cls.__module__)
+    if getattr(module, "__file__", None):
+        return module.__file__
+    for value in vars(cls).values():
+        if inspect.isfunction(value):
+            return value.__code__.co_filename
+    raise ValueError(f"Cannot find the source file of strategy {cls.__name__}")
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file):
+        super().__init__(file)
+        # Source file -> module, so every strategy of a file shares its classes
+        self.modules = {}
+
+    def persistent_load(self, pid):
+        kind, path, name = pid
+        if kind == "module" and path == "random":
+            return random
+        if kind != "strategy":
+            raise pickle.UnpicklingError(f"Unknown persistent id: {kind}")
+
+        module = self.modules.get(path)
+        if module is None:
+            module = self.modules[path] = _load_module(path)
+        return getattr(module, name)
+
+
+def _load_module(path: str):
+    if not os.path.exists(path):
+        raise ValueError(f"Strategy file of the snapshot not found: {path}")
+
+    # Built-in strategies are imported normally so their classes stay shared
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    module = sys.modules.get(module_name)
+    if module is not None and getattr(module, "__file__", None) is not None:
+        if os.path.abspath(module.__file__) == path:
+            return module
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"Could not load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def dumps(environment: Environment, state: Optional[dict] = None) -> bytes:
+    """Serialize an environment, its ants and strategies to compressed bytes
+
+    state holds extra picklable values restored alongside, such as the
+    runner's step count.
+    """
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(
+        (environment, state or {})
+    )
+    return MAGIC + bytes([VERSION]) + zlib.compress(buffer.getvalue(), 6)
+
+
+def loads(data: bytes) -> Tuple[Environment, dict]:
+    """Restore what dumps() wrote, returning (environment, state)"""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a simulation snapshot")
+    version = data[len(MAGIC)]
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    payload = zlib.decompress(data[len(MAGIC) + 1 :])
+    return _SnapshotUnpickler(io.BytesIO(payload)).load()
+
+
+def save_snapshot(
+    environment: Environment, filename: str, state: Optional[dict] = None
+) -> None:
+    """Write a snapshot, replacing filename only once it is complete"""
+    data = dumps(environment, state)
+    temp_filename = f"{filename}.tmp"
+    with open(temp_filename, "wb") as f:
+        f.write(data)
+    os.replace(temp_filename, filename)
+
+
+def load_snapshot(filename: str) -> Tuple[Environment, dict]:
+    with open(filename, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,362 @@
+# Parameter sweeps over the batch runner with an on-disk result cache.
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import statistics
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from batch import PARAMETERS, BatchJob, run_batch, strategy_label
+
+# Bump when a simulation change invalidates every cached result
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = ".sweep_cache"
+
+# Deterministic result columns written to the results table
+RESULT_COLUMNS = ("steps", "food_collected", "total_food", "completion_percentage")
+
+
+def parse_values(spec: str) -> List[float]:
+    """Parse "1,2,5" as a list or "start:stop:step" as an inclusive grid"""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Grid step must be positive: {spec}")
+        count = int(round((stop - start) / step)) + 1
+        values = [round(start + i * step, 10) for i in range(count)]
+    else:
+        values = [float(part) for part in spec.split(",") if part]
+    # Keep integral values as ints so they hash and print the same as the CLI input
+    return [int(value) if float(value).is_integer() else value for value in values]
+
+
+def parse_param(spec: str) -> tuple:
+    """Parse NAME=VALUES into (name, values)"""
+    name, _, values = spec.partition("=")
+    if name not in PARAMETERS or not values:
+        raise ValueError(
+            f"Invalid parameter '{spec}', expected NAME=VALUES with NAME one of "
+            f"{', '.join(PARAMETERS)}"
+        )
+    return name, parse_values(values)
+
+
+def parse_point(spec: str) -> Dict[str, float]:
+    """Parse NAME=VALUE,NAME=VALUE into one parameter combination"""
+    point = {}
+    for part in spec.split(","):
+        name, values = parse_param(part)
+        if len(values) != 1:
+            raise ValueError(f"Point values must be single numbers: {spec}")
+        point[name] = values[0]
+    return point
+
+
+def parameter_combinations(
+    grid: Dict[str, List[float]], points: Optional[List[Dict[str, float]]] = None
+) -> List[Dict[str, float]]:
+    """Every listed point combined with the cartesian product of the grid"""
+    names = sorted(grid)
+    combinations = []
+    for point in points or [{}]:
+        for values in itertools.product(*(grid[name] for name in names)):
+            combination = dict(point)
+            combination.update(zip(names, values))
+            combinations.append(combination)
+    return combinations
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def cache_key(job: BatchJob) -> str:
+    """Content hash of everything that determines a job's result"""
+    if os.path.isfile(job.env):
+        env = _hash_file(job.env)
+    else:
+        env = f"{job.env}:{job.width}x{job.height}"
+    strategy_file = job.strategy_file or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "random_strategy.py"
+    )
+    content = {
+        "version": CACHE_VERSION,
+        "env": env,
+        "strategy": _hash_file(strategy_file),
+        "params": sorted(job.params),
+        "seed": job.seed,
+        "ants": job.ants,
+        "max_steps": job.max_steps,
+        "time_limit": job.time_limit,
+    }
+    encoded = json.dumps(content, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _cache_path(cache_dir: str, key: str) -> str:
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+
+def load_cached(cache_dir: str, key: str) -> Optional[dict]:
+    try:
+        with open(_cache_path(cache_dir, key)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(cache_dir: str, key: str, result: dict) -> None:
+    path = _cache_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so an interrupted sweep never leaves a partial entry
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(result, f)
+    os.replace(temp_path, path)
+
+
+def run_sweep(
+    jobs: Iterable[BatchJob],
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    processes: Optional[int] = None,
+    verbose: bool = True,
+) -> List[dict]:
+    """Run jobs not found in the cache in parallel and return all results
+
+    Results are returned in job order. Failed runs are reported but not cached.
+    """
+    jobs = list(jobs)
+    keys = [cache_key(job) for job in jobs]
+    results: List[Optional[dict]] = [load_cached(cache_dir, key) for key in keys]
+
+    pending = {}
+    for index, (job, result) in enumerate(zip(jobs, results)):
+        if result is None:
+            pending.setdefault(
+                (job.env, job.strategy_file, job.seed, job.params), []
+            ).append(index)
+
+    if verbose:
+        print(f"{len(jobs) - len(pending)} cached, {len(pending)} to run")
+
+    missing = [jobs[indexes[0]] for indexes in pending.values()]
+    for done, result in enumerate(run_batch(missing, processes), 1):
+        job_id = (
+            result["env"],
+            result["strategy_file"],
+            result["seed"],
+            tuple(result.get("params", {}).items()),
+        )
+        for index in pending[job_id]:
+            results[index] = result
+        if "error" not in result:
+            store_cached(cache_dir, keys[pending[job_id][0]], result)
+        if verbose:
+            status = result.get("error") or (
+                f"completion={result['completion_percentage']:.1f}%"
+            )
+            params = " ".join(f"{k}={v}" for k, v in result.get("params", {}).items())
+            print(
+                f"[{done}/{len(missing)}] {result['env']} {result['strategy']} "
+                f"{params} seed={result['seed']}: {status}"
+            )
+
+    return results
+
+
+def write_table(
+    path: str,
+    jobs: List[BatchJob],
+    results: List[dict],
+    param_names: List[str],
+    timing: bool = False,
+) -> None:
+    """Write one tab-separated row per run, sorted so reruns diff cleanly"""
+    columns = ["env", "strategy", *param_names, "seed", *RESULT_COLUMNS]
+    if timing:
+        columns.append("time_taken")
+
+    rows = []
+    for job, result in zip(jobs, results):
+        params = dict(job.params)
+        row = [job.env, strategy_label(job.strategy_file)]
+        row += [str(params.get(name, "")) for name in param_names]
+        row.append(str(job.seed))
+        if "error" in result:
+            row += ["error"] * (len(columns) - len(row))
+        else:
+            row.append(str(result["steps"]))
+            row.append(str(result["food_collected"]))
+            row.append(str(result["total_food"]))
+            row.append(f"{result['completion_percentage']:.2f}")
+            if timing:
+                row.append(f"{result['time_taken']:.3f}")
+        rows.append(row)
+
+    rows.sort()
+    with open(path, "w") as f:
+        f.write("\t".join(columns) + "\n")
+        for row in rows:
+            f.write("\t".join(row) + "\n")
+
+
+def print_summary(
+    jobs: List[BatchJob], results: List[dict], param_names: List[str]
+) -> None:
+    """Mean steps and completion over seeds for each parameter combination"""
+    groups = {}
+    for job, result in zip(jobs, results):
+        if "error" not in result:
+            key = (job.env, strategy_label(job.strategy_file), job.params)
+            groups.setdefault(key, []).append(result)
+
+    print(f"\n{'env':<36} {'strategy':<28} {'params':<40} {'steps':>9} {'done %':>7}")
+    for (env, strategy, params), group in sorted(groups.items()):
+        values = dict(params)
+        label = " ".join(f"{name}={values[name]}" for name in param_names)
+        steps = statistics.fmean(result["steps"] for result in group)
+        completion = statistics.fmean(
+            result["completion_percentage"] for result in group
+        )
+        print(f"{env:<36} {strategy:<28} {label:<40} {steps:>9.1f} {completion:>7.1f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Sweep simulation parameters over environments and strategies"
+    )
+    parser.add_argument(
+        "--env",
+        type=str,
+        nargs="+",
+        required=True,
+        help="Environment types (simple, obstacle, maze) or environment files",
+    )
+    parser.add_argument(
+        "--strategy-file",
+        type=str,
+        nargs="+",
+        default=["random"],
+        help="Strategy files, 'random' for the built-in strategy (default: random)",
+    )
+    parser.add_argument(
+        "--param",
+        type=str,
+        action="append",
+        default=[],
+        help="Grid axis NAME=V1,V2,... or NAME=START:STOP:STEP, NAME one of "
+        f"{', '.join(PARAMETERS)} (repeatable)",
+    )
+    parser.add_argument(
+        "--point",
+        type=str,
+        action="append",
+        default=[],
+        help="Explicit combination NAME=VALUE,NAME=VALUE (repeatable), "
+        "combined with every --param grid point",
+    )
+    parser.add_argument(
+        "--seeds",
+        type=int,
+        default=5,
+        help="Number of seeded runs per combination (default: 5)",
+    )
+    parser.add_argument(
+        "--seed-start", type=int, default=0, help="First seed (default: 0)"
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=0,
+        help="Maximum steps per run (default: 0, environment file's MAX_STEPS)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=0,
+        help="Time limit per run in seconds (default: 0, file's TIME_LIMIT)",
+    )
+    parser.add_argument(
+        "--width",
+        type=int,
+        default=100,
+        help="Environment width for generated environments (default: 100)",
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=100,
+        help="Environment height for generated environments (default: 100)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0, one per CPU core)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Result cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="sweep_results.tsv",
+        help="Tab-separated results file (default: sweep_results.tsv)",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Add a time_taken column (makes the results file machine dependent)",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        grid = dict(parse_param(spec) for spec in args.param)
+        points = [parse_point(spec) for spec in args.point]
+    except ValueError as e:
+        parser.error(str(e))
+
+    combinations = parameter_combinations(grid, points)
+    param_names = sorted({name for combination in combinations for name in combination})
+
+    jobs = [
+        BatchJob(
+            env=env,
+            strategy_file=None if strategy_file == "random" else strategy_file,
+            seed=seed,
+            max_steps=args.max_steps,
+            time_limit=args.time_limit,
+            width=args.width,
+            height=args.height,
+            params=tuple(sorted(combination.items())),
+        )
+        for env in args.env
+        for strategy_file in args.strategy_file
+        for combination in combinations
+        for seed in range(args.seed_start, args.seed_start + args.seeds)
+    ]
+
+    results = run_sweep(
+        jobs, args.cache_dir, args.processes or None, verbose=not args.quiet
+    )
+    write_table(args.output, jobs, results, param_names, timing=args.timing)
+    print_summary(jobs, results, param_names)
+    print(f"\nResults written to {args.output}")
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules live at the top level of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENVS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "envs")
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from ant import Ant
+from ant_store import AntStore, AntView
+from common import AntAction, Direction
+from environment import Environment
+
+
+def _environment(store: bool) -> Environment:
+    environment = Environment(20, 20)
+    environment.add_colony(10, 10)
+    environment.add_food_area(3, 3, 4, 4)
+    environment.add_wall_rect(0, 15, 12, 1)
+    if store:
+        environment.enable_ant_store()
+    rng = random.Random(5)
+    for i in range(60):
+        x, y = rng.choice([(10, 10), (4, 4), (5, 14), (rng.randrange(20), 2)])
+        ant = Ant(x, y, rng.choice(list(Direction)), None, ant_id=i + 1)
+        ant.has_food = rng.random() < 0.3
+        environment.add_ant(ant)
+    return environment
+
+
+def _state(environment):
+    ants = [
+        (
+            ant.x,
+            ant.y,
+            ant.direction,
+            ant.has_food,
+            ant.food_collected,
+            ant.home_pheromone,
+            ant.food_pheromone,
+        )
+        for ant in environment.ants
+    ]
+    cells = {
+        pos: sorted(ant.id for ant in occupants)
+        for pos, occupants in environment.ant_cells.items()
+    }
+    return (
+        ants,
+        cells,
+        environment.food_collected,
+        sorted(environment.food_positions),
+        environment.home_pheromones.to_array().tolist(),
+        environment.food_pheromones.to_array().tolist(),
+    )
+
+
+def test_batched_actions_match_one_ant_at_a_time():
+    sequential, batched = _environment(False), _environment(True)
+    rng = random.Random(9)
+    for _ in range(80):
+        actions = [rng.choice(list(AntAction)) for _ in sequential.ants]
+        for ant, action in zip(sequential.ants, actions):
+            sequential.execute_action(ant, action)
+        batched.execute_actions(
+            np.array([action.value for action in actions], dtype=np.int8)
+        )
+        assert _state(batched) == _state(sequential)
+
+
+def test_views_read_and_write_the_store():
+    store = AntStore(capacity=1)
+    views = [
+        store.attach(Ant(i, 2 * i, Direction.EAST, None, ant_id=i + 1))
+        for i in range(5)
+    ]
+    assert store.capacity >= 5
+    assert all(isinstance(view, AntView) for view in views)
+
+    view = views[3]
+    assert (view.x, view.y, view.direction, view.id) == (3, 6, Direction.EAST, 4)
+    view.turn_left()
+    view.move_forward(True)
+    view.has_food = True
+    assert store.direction[3] == Direction.NORTHEAST.value
+    assert (store.x[3], store.y[3]) == (4, 5)
+    assert store.has_food[3]
+    assert (views[2].x, views[2].y) == (2, 4)
@@ -0,0 +1,63 @@
+import os
+
+import batch
+from batch import BatchJob, aggregate_results, percentile, run_batch, run_job
+from conftest import ENVS
+
+ENV_FILE = os.path.join(ENVS, "03_square_two_food_spots.txt")
+
+
+def _ant_counts(monkeypatch, job):
+    counts = []
+    add_ants = batch.add_ants
+
+    def counting_add_ants(environment, strategy, strategy_file, count, **kwargs):
+        counts.append(count)
+        add_ants(environment, strategy, strategy_file, count, **kwargs)
+
+    monkeypatch.setattr(batch, "add_ants", counting_add_ants)
+    assert "error" not in run_job(job)
+    return counts
+
+
+def test_job_ant_count_overrides_the_file(monkeypatch):
+    # The file's ANTS section asks for 25
+    assert _ant_counts(monkeypatch, BatchJob(ENV_FILE, max_steps=5)) == [25]
+    assert _ant_counts(monkeypatch, BatchJob(ENV_FILE, ants=4, max_steps=5)) == [4]
+    job = BatchJob(ENV_FILE, ants=4, max_steps=5, params=(("ants", 7),))
+    assert _ant_counts(monkeypatch, job) == [7]
+
+
+def test_seeded_jobs_are_reproducible():
+    job = BatchJob(ENV_FILE, seed=5, ants=20, max_steps=200)
+    first, second = run_job(job), run_job(job)
+    assert first["food_collected"] == second["food_collected"]
+    assert first["steps"] == second["steps"]
+
+
+def test_processes_match_in_process_results():
+    jobs = [BatchJob("maze", seed=seed, ants=10, max_steps=50) for seed in range(3)]
+    serial = sorted(run_batch(jobs, processes=1), key=lambda r: r["seed"])
+    parallel = sorted(run_batch(jobs, processes=2), key=lambda r: r["seed"])
+    assert [r["food_collected"] for r in serial] == [
+        r["food_collected"] for r in parallel
+    ]
+
+
+def test_aggregate_results_skips_errors():
+    results = [
+        {
+            "env": "e",
+            "strategy": "s",
+            "steps": steps,
+            "time_taken": steps / 10,
+            "completion_percentage": steps,
+        }
+        for steps in (10, 30)
+    ]
+    results.append({"env": "e", "strategy": "s", "error": "failed"})
+    summary = aggregate_results(results)[("e", "s")]
+    assert summary["runs"] == 3
+    assert summary["errors"] == 1
+    assert summary["steps"]["mean"] == 20
+    assert percentile([10, 30], 95) == 29
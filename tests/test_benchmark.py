@@ -0,0 +1,51 @@
+import time
+
+from benchmark import BenchmarkCase, compare_reports, run_case
+
+
+def _report(rates):
+    return {
+        "results": [
+            {"key": key, "steps_per_second": rate}
+            if rate is not None
+            else {"key": key, "error": "failed"}
+            for key, rate in rates.items()
+        ]
+    }
+
+
+def test_compare_reports_flags_regressions_beyond_threshold():
+    baseline = _report({"a": 100.0, "b": 100.0, "c": 100.0, "d": 100.0})
+    current = _report({"a": 95.0, "b": 50.0, "c": 80.0, "d": None, "e": 1.0})
+
+    regressions = compare_reports(baseline, current, threshold=0.1)
+
+    assert [key for key, *_ in regressions] == ["b", "c"]
+    assert regressions[0][1:] == (100.0, 50.0, -0.5)
+
+
+def test_run_case_reports_throughput():
+    case = BenchmarkCase("envs/03_square_two_food_spots.txt", None, 20)
+    result = run_case(case, steps=5, warmup=1)
+
+    assert "error" not in result
+    assert result["key"] == "envs/03_square_two_food_spots.txt|random|20"
+    assert result["steps"] == 5
+    assert result["steps_per_second"] > 0
+    latency = result["latency_ms"]
+    assert latency["p50"] <= latency["p99"] <= latency["max"]
+
+
+def test_run_case_bounds_warmup_by_max_seconds():
+    case = BenchmarkCase("envs/03_square_two_food_spots.txt", None, 20)
+    started = time.perf_counter()
+    result = run_case(case, steps=2, warmup=10**6, max_seconds=0.2)
+
+    assert "error" not in result
+    assert result["steps"] == 2
+    assert time.perf_counter() - started < 5
+
+
+def test_run_case_reports_errors():
+    result = run_case(BenchmarkCase("missing.txt", None, 5), steps=1)
+    assert "error" in result
@@ -0,0 +1,235 @@
+import copy
+import glob
+import os
+import pickle
+import time
+
+import pytest
+
+from conftest import ENVS
+from convert_env import convert_environment
+from environment import Environment, EnvironmentBuilder
+
+ENV_FILES = sorted(glob.glob(os.path.join(ENVS, "*.txt")))
+
+
+def _layout(environment):
+    return (
+        environment.width,
+        environment.height,
+        # Binary files load memory-mapped rows, compare their values
+        [list(row) for row in environment.grid],
+        [list(row) for row in environment.food_amounts],
+        sorted(environment.food_positions),
+        sorted(environment.wall_positions),
+        environment.colony_positions,
+        [bytes(row) for row in environment.terrain],
+        environment.initial_food_amount,
+        getattr(environment, "requested_ant_count", 0),
+        getattr(environment, "time_limit", 0),
+        getattr(environment, "max_steps", 0),
+    )
+
+
+def _maze():
+    environment = EnvironmentBuilder.create_maze(60, 40)
+    environment.requested_ant_count = 12
+    environment.max_steps = 500
+    return environment
+
+
+@pytest.mark.parametrize("env_file", ENV_FILES, ids=os.path.basename)
+def test_binary_round_trip(tmp_path, env_file):
+    environment = EnvironmentBuilder.load_from_file(env_file, verbose=False)
+    filename = str(tmp_path / "env.envb")
+
+    assert EnvironmentBuilder.save_binary(environment, filename)
+    assert EnvironmentBuilder.is_binary_file(filename)
+    assert not EnvironmentBuilder.is_binary_file(env_file)
+    loaded = EnvironmentBuilder.load_binary(filename, verbose=False)
+
+    assert _layout(loaded) == _layout(environment)
+
+
+def test_binary_rows_are_copy_on_write(tmp_path):
+    environment = _maze()
+    environment.add_food(1, 1, 2)
+    filename = str(tmp_path / "maze.envb")
+    EnvironmentBuilder.save_binary(environment, filename)
+    with open(filename, "rb") as f:
+        saved = f.read()
+
+    loaded = EnvironmentBuilder.load_binary(filename, verbose=False)
+    loaded.add_wall_rect(10, 10, 3, 2)
+    assert loaded.remove_food(1, 1)
+    environment.add_wall_rect(10, 10, 3, 2)
+    assert environment.remove_food(1, 1)
+
+    assert _layout(loaded) == _layout(environment)
+    with open(filename, "rb") as f:
+        assert f.read() == saved
+    # Plain rows once copied, and saving over the mapped file is safe
+    assert _layout(copy.deepcopy(loaded)) == _layout(environment)
+    assert isinstance(pickle.loads(pickle.dumps(loaded)).grid[0], list)
+    assert EnvironmentBuilder.save_binary(loaded, filename)
+    assert _layout(EnvironmentBuilder.load_binary(filename, verbose=False)) == _layout(
+        environment
+    )
+
+
+def _best_load_time(filename):
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        EnvironmentBuilder.load_binary(filename, verbose=False)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_binary_load_time_does_not_grow_with_area(tmp_path):
+    times = []
+    for size in (50, 2000):
+        environment = Environment(size, size)
+        environment.add_colony(25, 25)
+        environment.add_wall_rect(0, 0, 40, 2)
+        environment.add_food_area(5, 40, 5, 5, 3)
+        filename = str(tmp_path / f"{size}.envb")
+        EnvironmentBuilder.save_binary(environment, filename)
+        times.append(_best_load_time(filename))
+
+    # 1600 times the area, the loader only slices rows
+    assert times[1] < 20 * times[0] + 0.01
+
+
+def test_convert_between_formats(tmp_path):
+    environment = _maze()
+    text_file = str(tmp_path / "maze.txt")
+    EnvironmentBuilder.save_to_file(environment, text_file)
+
+    binary_file = str(tmp_path / "maze.envb")
+    assert convert_environment(text_file, binary_file, verbose=False)
+    back = str(tmp_path / "back.txt")
+    assert convert_environment(binary_file, back, verbose=False)
+
+    loaded = EnvironmentBuilder.load_from_file(back, verbose=False)
+    assert _layout(loaded) == _layout(environment)
+
+
+def test_compact_sections_match_single_cells():
+    compact = EnvironmentBuilder.from_text(
+        """
+DIMENSIONS:
+12 10
+COLONY:
+6 6
+WALL_RECT:
+0 0 3 2
+WALL_LINE:
+5 0 8 0
+9 2 11 4
+WALL_RUNS:
+8 1 2 5 3
+FOOD_RECT:
+9 7 2 2 4
+""",
+        verbose=False,
+    )
+
+    walls = [(x, y) for x in range(3) for y in range(2)]
+    walls += [(x, 0) for x in range(5, 9)]
+    walls += [(9, 2), (10, 3), (11, 4)]
+    walls += [(1, 8), (2, 8), (5, 8), (6, 8), (7, 8)]
+    lines = ["DIMENSIONS:", "12 10", "COLONY:", "6 6", "WALL:"]
+    lines += [f"{x} {y}" for x, y in walls]
+    lines += ["FOOD:"] + [f"{x} {y} 4" for x in (9, 10) for y in (7, 8)]
+    cells = EnvironmentBuilder.from_text("\n".join(lines), verbose=False)
+
+    assert _layout(compact) == _layout(cells)
+    assert compact.initial_food_amount == 16
+
+
+def test_rectangles_are_clipped_to_the_map():
+    environment = EnvironmentBuilder.from_text(
+        "DIMENSIONS:\n5 5\nWALL_RECT:\n3 3 10 10\n-2 0 3 1\n", verbose=False
+    )
+    assert sorted(environment.wall_positions) == [
+        (0, 0),
+        (3, 3),
+        (3, 4),
+        (4, 3),
+        (4, 4),
+    ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_text_round_trip(tmp_path, compress):
+    environment = _maze()
+    environment.add_food(1, 1, 3)
+    filename = str(tmp_path / ("maze.txt.gz" if compress else "maze.txt"))
+
+    assert EnvironmentBuilder.save_to_file(environment, filename)
+    with open(filename, "rb") as f:
+        assert (f.read(2) == b"\x1f\x8b") == compress
+    loaded = EnvironmentBuilder.load_from_file(filename, verbose=False)
+
+    assert _layout(loaded) == _layout(environment)
+
+
+def test_text_writes_rectangles():
+    environment = EnvironmentBuilder.create_empty(30, 30)
+    environment.add_colony(15, 15)
+    environment.add_wall_rect(2, 2, 20, 5)
+    environment.add_wall(25, 25)
+    environment.add_food_area(0, 20, 4, 4, 2)
+
+    text = EnvironmentBuilder.to_text(environment)
+
+    assert "WALL_RECT:\n2 2 20 5\n" in text
+    assert "WALL:\n25 25\n" in text
+    assert "FOOD_RECT:\n0 20 4 4 2\n" in text
+    assert _layout(EnvironmentBuilder.from_text(text, verbose=False)) == _layout(
+        environment
+    )
+
+
+def test_text_writes_row_runs():
+    environment = EnvironmentBuilder.create_empty(20, 20)
+    environment.add_colony(10, 10)
+    environment.add_wall_rect(2, 2, 3, 1)
+    environment.add_wall(7, 2)
+    environment.add_wall_line(0, 19, 19, 19)
+    environment.add_wall(5, 5)
+
+    text = EnvironmentBuilder.to_text(environment)
+
+    assert "WALL_RUNS:\n2 2 3 7 1\n19 0 20\n" in text
+    assert "WALL:\n5 5\n" in text
+    assert "WALL_RECT" not in text
+    assert _layout(EnvironmentBuilder.from_text(text, verbose=False)) == _layout(
+        environment
+    )
+
+
+def test_text_shrinks_curved_walls():
+    env_file = os.path.join(ENVS, "07_round_maze.txt")
+    environment = EnvironmentBuilder.load_from_file(env_file, verbose=False)
+
+    text = EnvironmentBuilder.to_text(environment)
+
+    # Mostly isolated cells, written as WALL_RUNS rows instead of WALL lines
+    assert len(text) < 0.85 * os.path.getsize(env_file)
+    assert _layout(EnvironmentBuilder.from_text(text, verbose=False)) == _layout(
+        environment
+    )
+
+
+def test_malformed_wall_runs_are_skipped(capsys):
+    environment = EnvironmentBuilder.from_text(
+        "DIMENSIONS:\n10 5\nWALL_RUNS:\n1 2 3 7\n2\n3 x 2\n4 0 2\n",
+        verbose=True,
+    )
+
+    assert sorted(environment.wall_positions) == [(0, 4), (1, 4)]
+    output = capsys.readouterr().out
+    for line in ("1 2 3 7", "2", "3 x 2"):
+        assert f"Invalid wall runs: {line}\n" in output
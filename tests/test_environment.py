@@ -0,0 +1,70 @@
+from ant import Ant, AntStrategy
+from common import AntAction, Direction, TerrainType
+from environment import Environment
+
+
+def _environment():
+    environment = Environment(20, 20)
+    environment.add_colony(10, 10)
+    environment.add_food_area(2, 2, 3, 3)
+    return environment
+
+
+def test_terrain_layer_matches_grid_and_colony():
+    environment = _environment()
+    environment.add_wall_rect(0, 15, 20, 1)
+
+    assert environment.get_terrain(10, 10) == TerrainType.COLONY
+    assert environment.get_terrain(12, 12) == TerrainType.COLONY
+    assert environment.get_terrain(3, 3) == TerrainType.FOOD
+    assert environment.get_terrain(5, 15) == TerrainType.WALL
+    assert environment.get_terrain(0, 0) == TerrainType.EMPTY
+    assert environment.get_terrain(-1, 0) is None
+    assert (5, 15) in environment.wall_positions
+
+
+def test_rebuild_terrain_after_direct_grid_edit():
+    environment = _environment()
+    environment.enable_ant_store()
+    east = (Direction.EAST, 3, 120)
+    assert (2, 0) in environment.visible_offsets(10, 5, *east)
+
+    environment.grid[5][11] = TerrainType.WALL.value
+    environment.rebuild_terrain()
+
+    assert environment.get_terrain(11, 5) == TerrainType.WALL
+    assert (11, 5) in environment.wall_positions
+    assert environment.wall_mask[5, 11]
+    # Cells behind the new wall are no longer in sight
+    offsets = environment.visible_offsets(10, 5, *east)
+    assert (1, 0) in offsets
+    assert (2, 0) not in offsets
+
+
+class _CountingStrategy(AntStrategy):
+    def __init__(self):
+        self.calls = []
+
+    def decide_action(self, perception):
+        return AntAction.TURN_LEFT
+
+    def decide_actions(self, perceptions):
+        self.calls.append(len(perceptions))
+        return [AntAction.MOVE_FORWARD for _ in perceptions]
+
+
+def test_batch_strategies_decide_once_per_step():
+    for store in (False, True):
+        environment = _environment()
+        if store:
+            environment.enable_ant_store()
+        strategy = _CountingStrategy()
+        for i in range(6):
+            environment.add_ant(Ant(10, 10, Direction.NORTH, strategy, ant_id=i + 1))
+
+        environment.update()
+        environment.update()
+
+        assert strategy.calls == [6, 6]
+        assert [ant.y for ant in environment.ants] == [8] * 6
+        assert [ant.steps_taken for ant in environment.ants] == [2] * 6
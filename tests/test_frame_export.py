@@ -0,0 +1,105 @@
+import os
+import shutil
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from frame_export import (  # noqa: E402
+    GifWriter,
+    PngSequenceWriter,
+    VideoWriter,
+    open_frame_writer,
+)
+from gui import AntSimulationGUI  # noqa: E402
+from utils import add_ants, create_environment  # noqa: E402
+
+
+class _ListWriter:
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def add(self, surface):
+        self.frames.append(pygame.surfarray.array3d(surface))
+
+    def close(self):
+        self.closed = True
+
+
+def _gui(max_steps=10) -> AntSimulationGUI:
+    environment = create_environment("simple", 40, 40, verbose=False, seed=1)
+    add_ants(environment, "random", None, 10, verbose=False)
+    return AntSimulationGUI(
+        environment, verbose=False, headless=True, max_steps=max_steps
+    )
+
+
+def test_export_writes_every_nth_step_and_the_last():
+    gui = _gui(max_steps=10)
+    writer = _ListWriter()
+
+    frames = gui.export(writer, every=4)
+
+    # Steps 0, 4, 8 and the last step 10
+    assert frames == len(writer.frames) == 4
+    assert writer.closed
+    assert gui.step_count == 10
+    assert writer.frames[0].shape == (gui.scaled_width, gui.screen.get_height(), 3)
+
+
+def test_export_needs_a_limit():
+    with pytest.raises(ValueError):
+        _gui(max_steps=0).export(_ListWriter())
+
+
+def test_png_sequence(tmp_path):
+    directory = str(tmp_path / "frames")
+    gui = _gui(max_steps=3)
+
+    assert gui.export(PngSequenceWriter(directory)) == 4
+    assert sorted(os.listdir(directory)) == [
+        f"frame_{index:06d}.png" for index in range(4)
+    ]
+    image = pygame.image.load(os.path.join(directory, "frame_000003.png"))
+    assert image.get_size() == gui.screen.get_size()
+
+
+def test_open_frame_writer_picks_by_extension(tmp_path):
+    assert isinstance(open_frame_writer(str(tmp_path / "out")), PngSequenceWriter)
+    try:
+        writer = open_frame_writer(str(tmp_path / "out.gif"))
+    except ValueError:
+        pass  # Pillow is not installed
+    else:
+        assert isinstance(writer, GifWriter)
+    try:
+        writer = open_frame_writer(str(tmp_path / "out.mp4"))
+    except ValueError:
+        pass  # ffmpeg is not on the PATH
+    else:
+        assert isinstance(writer, VideoWriter)
+
+
+def test_gif(tmp_path):
+    pytest.importorskip("PIL")
+    filename = str(tmp_path / "run.gif")
+    _gui(max_steps=2).export(GifWriter(filename, fps=10))
+
+    from PIL import Image
+
+    # Pillow merges identical frames, so check the total play time
+    with Image.open(filename) as image:
+        duration = 0
+        for index in range(image.n_frames):
+            image.seek(index)
+            duration += image.info["duration"]
+    assert duration == 300
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_video(tmp_path):
+    filename = str(tmp_path / "run.mp4")
+    _gui(max_steps=5).export(VideoWriter(filename, fps=10))
+    assert os.path.getsize(filename) > 0
@@ -0,0 +1,251 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+import numpy as np  # noqa: E402
+
+from ant import Ant, AntStrategy  # noqa: E402
+from common import AntAction, Direction, TerrainType  # noqa: E402
+from environment import Environment  # noqa: E402
+from gui import (  # noqa: E402
+    ANT_COLOR,
+    DIRT_COLOR,
+    MAX_ZOOM,
+    TERRAIN_COLORS,
+    AntSimulationGUI,
+    SimulationWorker,
+    _downsample,
+    blend_pheromones,
+    cell_colors,
+)
+from utils import add_ants  # noqa: E402
+
+
+def _gui(store: bool) -> AntSimulationGUI:
+    environment = Environment(400, 400)
+    environment.add_colony(200, 200)
+    if store:
+        environment.enable_ant_store()
+    positions = [(5, 5), (6, 5), (100, 40), (390, 390), (2, 300)]
+    for i, (x, y) in enumerate(positions):
+        environment.add_ant(Ant(x, y, Direction.EAST, None, ant_id=i + 1))
+    return AntSimulationGUI(
+        environment, verbose=False, headless=True, view_width=200, view_height=100
+    )
+
+
+@pytest.mark.parametrize("store", [False, True])
+def test_visible_ants_skips_ants_outside_the_view(store):
+    gui = _gui(store)
+    gui.zoom, gui.view_x, gui.view_y = 1.0, 0.0, 0.0
+
+    xs, ys, _, _ = gui.visible_ants()
+    assert sorted(zip(xs.tolist(), ys.tolist())) == [(5, 5), (6, 5), (100, 40)]
+
+    gui.fit_view()
+    xs, _, _, _ = gui.visible_ants()
+    assert len(xs) == 5
+
+
+@pytest.mark.parametrize("store", [False, True])
+def test_render_ants_draws_visible_ants(store):
+    gui = _gui(store)
+    gui.zoom, gui.view_x, gui.view_y = 2.0, 0.0, 0.0
+    gui.render_frame()
+
+    # East-facing ants are 3 cells wide and 2 high
+    assert tuple(gui.screen.get_at((10, 10)))[:3] == ANT_COLOR
+    assert tuple(gui.screen.get_at((15, 13)))[:3] == ANT_COLOR
+
+
+def _terrain_gui(cell_size: int = 2) -> AntSimulationGUI:
+    environment = Environment(40, 30)
+    environment.add_colony(20, 15)
+    environment.add_food_area(3, 3, 4, 4)
+    environment.add_wall_rect(10, 0, 2, 20)
+    environment.home_pheromones.add_pheromone(30, 5, 80.0)
+    environment.food_pheromones.add_pheromone(30, 6, 40.0)
+    environment.food_pheromones.add_pheromone(20, 15, 40.0)  # Under the colony
+    return AntSimulationGUI(
+        environment, cell_size=cell_size, verbose=False, headless=True
+    )
+
+
+def _layer_colors(gui: AntSimulationGUI) -> np.ndarray:
+    """Colour of the top-left pixel of every cell of the terrain layer, [y, x]"""
+    pixels = pygame.surfarray.array3d(gui.terrain_surface)
+    return pixels[:: gui.cell_size, :: gui.cell_size].transpose(1, 0, 2)
+
+
+def test_blend_pheromones():
+    home = np.array([0.0, 250.0, 0.0])
+    food = np.array([0.0, 0.0, 100.0])
+    # Nothing is dirt, full home pheromone the colony colour, full food white
+    assert blend_pheromones(home, food).tolist() == [
+        list(DIRT_COLOR),
+        [96, 85, 33],
+        [255, 255, 255],
+    ]
+
+
+def test_terrain_layer_matches_cell_colors():
+    gui = _terrain_gui()
+    gui.render_terrain()
+
+    colors, drawn = cell_colors(gui.environment)
+    layer = _layer_colors(gui)
+    assert (layer[drawn] == colors[drawn]).all()
+    assert (layer[~drawn] == DIRT_COLOR).all()
+    # Terrain hides pheromones, empty cells show them
+    assert layer[15, 20].tolist() == TERRAIN_COLORS[TerrainType.COLONY.value].tolist()
+    assert layer[5, 30].tolist() != list(DIRT_COLOR)
+
+
+@pytest.mark.parametrize("show_grid", [False, True])
+def test_incremental_terrain_layer_matches_rebuild(show_grid):
+    gui = _terrain_gui(cell_size=3)
+    gui.show_grid = show_grid
+    environment = gui.environment
+    environment.seed = 2
+    environment.home_pheromones.evaporation_rate = 0.8
+    add_ants(environment, "random", None, 30, verbose=False)
+    gui.render_terrain()
+
+    for step in range(40):
+        environment.update()
+        if step == 10:
+            environment.add_wall(30, 20)
+            environment.remove_food(3, 3)
+        if step == 20:
+            gui.show_pheromones = False
+        if step == 25:
+            gui.show_pheromones = True
+        gui.render_terrain()
+
+        incremental = pygame.surfarray.array3d(gui.terrain_surface)
+        gui.rebuild_terrain_layer()
+        assert (pygame.surfarray.array3d(gui.terrain_surface) == incremental).all()
+
+
+def test_incremental_terrain_layer_reads_only_changed_cells(monkeypatch):
+    gui = _terrain_gui(cell_size=2)
+    environment = gui.environment
+    gui.render_terrain()
+
+    def whole_map():
+        raise AssertionError("terrain_array() called on the incremental path")
+
+    monkeypatch.setattr(environment, "terrain_array", whole_map)
+    environment.add_wall(30, 20)
+    environment.remove_food(3, 3)
+    gui.render_terrain()
+    monkeypatch.undo()
+
+    incremental = pygame.surfarray.array3d(gui.terrain_surface)
+    gui.rebuild_terrain_layer()
+    assert (pygame.surfarray.array3d(gui.terrain_surface) == incremental).all()
+
+
+class _TurningStrategy(AntStrategy):
+    def decide_action(self, perception):
+        return AntAction.TURN_LEFT
+
+
+class _FailingStrategy(AntStrategy):
+    def decide_action(self, perception):
+        if perception.steps_taken >= 5:
+            raise RuntimeError("strategy failed")
+        return AntAction.MOVE_FORWARD
+
+
+def _worker_gui(strategy, **options) -> AntSimulationGUI:
+    environment = Environment(30, 30)
+    environment.add_colony(15, 15)
+    environment.add_food_area(2, 2, 2, 2)
+    environment.add_ant(Ant(15, 15, Direction.NORTH, strategy, ant_id=1))
+    gui = AntSimulationGUI(environment, verbose=False, headless=True, **options)
+    gui.running = True
+    gui.start_time = time.time()
+    return gui
+
+
+def test_worker_stops_the_gui_on_errors():
+    gui = _worker_gui(_FailingStrategy(), fps=0)
+    worker = SimulationWorker(gui)
+    worker.start()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert not gui.running
+    assert str(worker.error) == "strategy failed"
+    assert gui.step_count == 5
+
+
+@pytest.mark.parametrize("options", [{"fps": 200}, {"fps": 30, "turbo": True}])
+def test_worker_steps_until_max_steps(options):
+    gui = _worker_gui(_TurningStrategy(), max_steps=20, **options)
+    worker = SimulationWorker(gui)
+    worker.start()
+    worker.join(timeout=10)
+
+    assert worker.error is None
+    assert not gui.running
+    assert gui.step_count == 20
+
+
+def test_zoom_keeps_the_cell_under_the_cursor():
+    gui = _gui(store=False)
+    gui.zoom, gui.view_x, gui.view_y = 2.0, 50.0, 50.0
+    cell = (gui.view_x + 60 / gui.zoom, gui.view_y + 30 / gui.zoom)
+
+    gui.zoom_at(1.25, 60, 30)
+    assert gui.zoom == 2.5
+    assert (gui.view_x + 60 / gui.zoom, gui.view_y + 30 / gui.zoom) == pytest.approx(
+        cell
+    )
+
+    gui.zoom_at(1000, 60, 30)
+    assert gui.zoom == MAX_ZOOM
+
+
+def test_fit_view_shows_the_whole_map():
+    gui = _gui(store=False)
+    gui.fit_view()
+    # 400x400 cells in a 200x100 view
+    assert gui.zoom == 0.25
+    assert gui.view_y == 0
+    assert gui.view_x == pytest.approx((400 - 200 / 0.25) / 2)
+    assert gui.map_rect() == pygame.Rect(50, 0, 100, 100)
+
+    # Zooming out further is limited, panning stays on the map
+    gui.zoom_at(0.5, 0, 0)
+    assert gui.zoom == 0.25
+    gui.zoom = 1.0
+    gui.view_x, gui.view_y = -50.0, 1000.0
+    gui.clamp_view()
+    assert (gui.view_x, gui.view_y) == (0.0, 300.0)
+
+
+@pytest.mark.parametrize("cell_size", [1, 3])
+def test_lod_levels_follow_redrawn_cells(cell_size):
+    gui = _terrain_gui(cell_size=cell_size)
+    environment = gui.environment
+    environment.seed = 4
+    add_ants(environment, "random", None, 20, verbose=False)
+    gui.render_terrain()
+    gui.lod_level(3)
+
+    for step in range(30):
+        environment.update()
+        if step == 12:
+            environment.add_wall_line(25, 25, 35, 28)
+        gui.render_terrain()
+
+    expected = pygame.surfarray.array3d(gui.terrain_surface)
+    for level in range(1, 4):
+        expected = _downsample(expected)
+        assert (gui.lod_level(level) == expected).all()
@@ -0,0 +1,214 @@
+import math
+import random
+
+import pytest
+
+from ant import Ant, AntStrategy
+from common import AntAction, Direction, LazyAntPerception, TerrainType
+from environment import Environment
+
+
+def _reference_offsets(environment, x, y, direction, vision_range, vision_angle):
+    """Visible offsets computed cell by cell, as perception originally did"""
+    offsets = set()
+    dir_dx, dir_dy = Direction.get_delta(direction)
+    magnitude = math.sqrt(dir_dx * dir_dx + dir_dy * dir_dy)
+    dir_dx, dir_dy = dir_dx / magnitude, dir_dy / magnitude
+    for dx in range(-vision_range, vision_range + 1):
+        for dy in range(-vision_range, vision_range + 1):
+            distance = math.sqrt(dx * dx + dy * dy)
+            if distance == 0 or distance > vision_range:
+                continue
+            dot = max(-1.0, min(1.0, (dir_dx * dx + dir_dy * dy) / distance))
+            if math.degrees(math.acos(dot)) > vision_angle / 2:
+                continue
+            if not environment.is_valid_position(x + dx, y + dy):
+                continue
+            steps = max(abs(dx), abs(dy))
+            blocked = False
+            if steps > 1:
+                for step in range(1, steps):
+                    step_x = int(x + step * dx / steps)
+                    step_y = int(y + step * dy / steps)
+                    if (
+                        environment.is_valid_position(step_x, step_y)
+                        and environment.grid[step_y][step_x] == TerrainType.WALL.value
+                    ):
+                        blocked = True
+                        break
+            if not blocked:
+                offsets.add((dx, dy))
+    return offsets
+
+
+def _walled_environment(seed=4):
+    environment = Environment(24, 24)
+    rng = random.Random(seed)
+    for _ in range(80):
+        environment.add_wall(rng.randrange(24), rng.randrange(24))
+    return environment
+
+
+@pytest.mark.parametrize("vision_range", [1, 3, 5])
+@pytest.mark.parametrize("vision_angle", [90, 120, 360])
+def test_cone_tables_match_reference_on_open_map(vision_range, vision_angle):
+    environment = Environment(20, 20)
+    for direction in Direction:
+        for x, y in [(10, 10), (0, 0), (19, 5)]:
+            offsets = environment.visible_offsets(
+                x, y, direction, vision_range, vision_angle
+            )
+            assert len(offsets) == len(set(offsets))
+            assert set(offsets) == _reference_offsets(
+                environment, x, y, direction, vision_range, vision_angle
+            )
+
+
+def _scan_nearby_ants(environment, ant, offsets):
+    """Nearby ants found by scanning every ant, one per visible cell"""
+    nearby = []
+    for dx, dy in offsets:
+        for other in environment.ants:
+            if other is not ant and (other.x, other.y) == (ant.x + dx, ant.y + dy):
+                nearby.append(((dx, dy), other.has_food))
+                break
+    return nearby
+
+
+def test_occupancy_index_follows_moving_ants():
+    environment = Environment(15, 15)
+    environment.add_colony(7, 7)
+    rng = random.Random(2)
+    for i in range(40):
+        ant = Ant(
+            rng.randrange(15),
+            rng.randrange(15),
+            rng.choice(list(Direction)),
+            None,
+            ant_id=i + 1,
+        )
+        ant.has_food = rng.random() < 0.5
+        environment.add_ant(ant)
+
+    for _ in range(30):
+        for ant in environment.ants:
+            action = rng.choice([AntAction.MOVE_FORWARD, AntAction.TURN_LEFT])
+            environment.execute_action(ant, action)
+
+        cells = {}
+        for ant in environment.ants:
+            cells.setdefault((ant.x, ant.y), set()).add(ant)
+        assert {pos: set(ants) for pos, ants in environment.ant_cells.items()} == cells
+
+        for ant in environment.ants:
+            perception = environment.get_perception_for_ant(ant)
+            offsets = [
+                offset for offset in perception.visible_cells if offset != (0, 0)
+            ]
+            # One ant represents each cell, so only which cells hold ants is compared
+            found = [offset for offset, _ in perception.nearby_ants]
+            expected = [
+                offset for offset, _ in _scan_nearby_ants(environment, ant, offsets)
+            ]
+            assert sorted(found) == sorted(expected)
+
+
+def _assert_cache_matches_reference(environment):
+    for direction in Direction:
+        for x in range(0, 24, 3):
+            for y in range(0, 24, 3):
+                offsets = environment.visible_offsets(x, y, direction, 4, 120)
+                assert set(offsets) == _reference_offsets(
+                    environment, x, y, direction, 4, 120
+                )
+
+
+def test_visibility_cache_matches_line_of_sight():
+    environment = _walled_environment()
+    _assert_cache_matches_reference(environment)
+    # Cached masks are reused on the second pass
+    _assert_cache_matches_reference(environment)
+
+
+def test_visibility_cache_follows_new_walls():
+    environment = _walled_environment()
+    _assert_cache_matches_reference(environment)
+
+    environment.add_wall(10, 10)
+    environment.add_wall_rect(3, 15, 6, 2)
+    environment.add_wall_line(20, 2, 16, 6)
+    _assert_cache_matches_reference(environment)
+
+
+def _populated_environment():
+    environment = _walled_environment()
+    environment.add_colony(12, 12)
+    environment.add_food_area(2, 2, 3, 3)
+    rng = random.Random(8)
+    for i in range(30):
+        x, y = rng.randrange(24), rng.randrange(24)
+        if environment.is_walkable(x, y):
+            ant = Ant(x, y, rng.choice(list(Direction)), None, ant_id=i + 1)
+            ant.has_food = rng.random() < 0.5
+            environment.add_ant(ant)
+        environment.home_pheromones.add_pheromone(x, y, rng.uniform(1, 100))
+        environment.food_pheromones.add_pheromone(y, x, rng.uniform(1, 100))
+    return environment
+
+
+def _fields(perception):
+    return (
+        dict(perception.visible_cells),
+        dict(perception.food_pheromone),
+        dict(perception.home_pheromone),
+        list(perception.nearby_ants),
+        perception.has_food,
+        perception.direction,
+        perception.ant_id,
+    )
+
+
+def test_lazy_perception_matches_eager_perception():
+    environment = _populated_environment()
+    for ant in environment.ants:
+        environment.lazy_perception = False
+        eager = _fields(environment.get_perception_for_ant(ant))
+        environment.lazy_perception = True
+        lazy = environment.get_perception_for_ant(ant)
+        assert type(lazy) is LazyAntPerception
+        assert _fields(lazy) == eager
+        assert lazy.can_see_food() == (TerrainType.FOOD in eager[0].values())
+
+
+class _KeepingStrategy(AntStrategy):
+    keeps_perceptions = True
+
+    def decide_action(self, perception):
+        return AntAction.NO_ACTION
+
+
+def test_perception_buffers_are_reused_and_refilled():
+    environment = _populated_environment()
+    ant = environment.ants[0]
+
+    first = environment.get_perception_for_ant(ant)
+    fields = _fields(first)
+    ant.direction = Direction.get_left(ant.direction)
+    second = environment.get_perception_for_ant(ant)
+
+    assert second is first
+    assert not hasattr(ant, "__dict__") and not hasattr(first, "__dict__")
+    assert _fields(second) != fields
+    # A fresh perception sees the same as the refilled buffer
+    ant.perception_buffer = None
+    assert _fields(environment.get_perception_for_ant(ant)) == _fields(second)
+
+
+def test_strategies_keeping_perceptions_get_new_ones():
+    environment = _populated_environment()
+    ant = environment.ants[0]
+    ant.strategy = _KeepingStrategy()
+
+    first = environment.get_perception_for_ant(ant)
+    assert environment.get_perception_for_ant(ant) is not first
+    assert ant.perception_buffer is None
@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pytest
+
+from environment import PHEROMONE_MAP_TYPES, PheromoneMap
+
+MAP_TYPES = ["dense", "lazy"]
+
+
+def _run(map_class, seed=1, steps=300):
+    """Random deposits and evaporation, the same for every map type"""
+    pheromones = map_class(30, 20, 0.97)
+    rng = random.Random(seed)
+    for _ in range(steps):
+        for _ in range(rng.randint(0, 5)):
+            # Some deposits fall off the map and are ignored
+            x, y = rng.randint(-2, 31), rng.randint(-2, 21)
+            pheromones.add_pheromone(x, y, rng.uniform(0, 100))
+        pheromones.evaporate()
+    return pheromones
+
+
+@pytest.mark.parametrize("map_type", MAP_TYPES)
+def test_matches_sparse_map(map_type):
+    expected = _run(PheromoneMap)
+    pheromones = _run(PHEROMONE_MAP_TYPES[map_type])
+
+    np.testing.assert_allclose(pheromones.to_array(), expected.to_array())
+    for x in range(-1, 31):
+        for y in range(-1, 21):
+            assert pheromones.get_value(x, y) == pytest.approx(
+                expected.get_value(x, y)
+            )
+    for x, y in [(0, 0), (15, 10), (29, 19)]:
+        assert pheromones.get_strongest_direction(
+            x, y
+        ) == expected.get_strongest_direction(x, y)
+
+
+@pytest.mark.parametrize("map_type", ["sparse"] + MAP_TYPES)
+def test_array_access_matches_single_cells(map_type):
+    pheromones = _run(PHEROMONE_MAP_TYPES[map_type])
+    xs, ys = np.meshgrid(np.arange(30), np.arange(20))
+    xs, ys = xs.ravel(), ys.ravel()
+
+    values = pheromones.get_values(xs, ys)
+    assert values.tolist() == [
+        pheromones.get_value(x, y) for x, y in zip(xs.tolist(), ys.tolist())
+    ]
+    assert pheromones.to_array()[ys, xs].tolist() == values.tolist()
+
+
+@pytest.mark.parametrize("map_type", ["sparse"] + MAP_TYPES)
+def test_add_pheromones_matches_add_pheromone(map_type):
+    map_class = PHEROMONE_MAP_TYPES[map_type]
+    single, batched = map_class(10, 10), map_class(10, 10)
+    xs = np.array([1, 1, 5, -1, 9, 10])
+    ys = np.array([2, 2, 5, 0, 9, 3])
+    amounts = np.array([30.0, 50.0, 20.0, 99.0, 10.0, 99.0])
+
+    for x, y, amount in zip(xs.tolist(), ys.tolist(), amounts.tolist()):
+        single.add_pheromone(x, y, amount)
+    batched.add_pheromones(xs, ys, amounts)
+
+    assert batched.to_array().tolist() == single.to_array().tolist()
+    assert batched.get_value(1, 2) == 50.0
+    assert batched.take_modified_positions() == {(1, 2), (5, 5), (9, 9)}
+    assert batched.take_modified_positions() == set()
+
+
+@pytest.mark.parametrize("map_type", ["sparse"] + MAP_TYPES)
+def test_values_fall_to_zero_below_cutoff(map_type):
+    pheromones = PHEROMONE_MAP_TYPES[map_type](5, 5, 0.5)
+    pheromones.add_pheromone(2, 2, 1.0)
+    for _ in range(7):
+        pheromones.evaporate()
+    # 1.0 * 0.5**7 is below the 0.01 cutoff
+    assert pheromones.get_value(2, 2) == 0.0
+    assert pheromones.get_strongest_direction(2, 3) is None
+
+
+def test_lazy_map_reclaims_expired_cells():
+    pheromones = PHEROMONE_MAP_TYPES["lazy"](10, 10, 0.9)
+    pheromones.add_pheromone(1, 1, 1.0)
+    pheromones.add_pheromone(2, 2, 100.0)
+    for _ in range(50):
+        pheromones.evaporate()
+
+    # 1.0 * 0.9**50 is below the cutoff, 100 * 0.9**50 is not
+    assert (1, 1) not in pheromones.values
+    assert pheromones.get_value(2, 2) == pytest.approx(100 * 0.9**50)
+
+    # A deposit after the expiry was scheduled keeps the cell alive
+    pheromones.add_pheromone(2, 2, 50.0)
+    for _ in range(20):
+        pheromones.evaporate()
+    assert pheromones.get_value(2, 2) == pytest.approx(50 * 0.9**20)
@@ -0,0 +1,54 @@
+import random
+
+from common import AntAction, AntPerception, Direction, TerrainType
+from environment import _decides_in_batch
+from random_strategy import RandomStrategy
+
+
+def _perceptions(seed):
+    rng = random.Random(seed)
+    perceptions = []
+    for ant_id in range(1, 41):
+        perception = AntPerception()
+        perception.ant_id = ant_id
+        perception.direction = Direction.NORTH
+        perception.has_food = rng.random() < 0.5
+        perception.visible_cells = {
+            (dx, dy): rng.choice(list(TerrainType))
+            for dx in range(-2, 3)
+            for dy in range(0, 3)
+        }
+        perception.rng = random.Random(f"{seed}:{ant_id}")
+        perceptions.append(perception)
+    return perceptions
+
+
+def test_decides_each_ant_separately():
+    # No batched override, RandomStrategy stays on the per-ant path
+    assert not _decides_in_batch(RandomStrategy())
+
+    strategy = RandomStrategy()
+    perceptions = _perceptions(0)
+    strategy.decide_actions(perceptions)
+    assert len(strategy.ants_last_action) == len(perceptions)
+
+
+def test_priorities():
+    strategy = RandomStrategy()
+    perception = AntPerception()
+    perception.ant_id = 1
+    perception.visible_cells = {(0, 0): TerrainType.FOOD}
+    assert strategy.decide_action(perception) == AntAction.PICK_UP_FOOD
+
+    perception.has_food = True
+    perception.visible_cells = {(0, 0): TerrainType.COLONY}
+    assert strategy.decide_action(perception) == AntAction.DROP_FOOD
+
+    # Pheromone deposits alternate with movement
+    perception.visible_cells = {(0, 0): TerrainType.EMPTY}
+    assert strategy.decide_action(perception) == AntAction.DEPOSIT_FOOD_PHEROMONE
+    assert strategy.decide_action(perception) in (
+        AntAction.MOVE_FORWARD,
+        AntAction.TURN_LEFT,
+        AntAction.TURN_RIGHT,
+    )
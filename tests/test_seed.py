@@ -0,0 +1,37 @@
+import os
+
+from conftest import ENVS
+from utils import add_ants, create_environment
+
+ENV_FILE = os.path.join(ENVS, "05_square_four_food_spots.txt")
+
+
+def _run(seed, ants=30, steps=150, store=False, env=ENV_FILE):
+    environment = create_environment(env, 60, 60, verbose=False, seed=seed)
+    if store:
+        environment.enable_ant_store()
+    add_ants(environment, "random", None, ants, verbose=False)
+    for _ in range(steps):
+        environment.update()
+    return [
+        (ant.id, ant.x, ant.y, ant.direction, ant.has_food)
+        for ant in environment.ants
+    ]
+
+
+def test_same_seed_same_run():
+    assert _run(4) == _run(4)
+    assert _run(4) != _run(5)
+    assert _run(4, env="maze") == _run(4, env="maze")
+
+
+def test_ant_streams_do_not_depend_on_other_ants():
+    # The first ants make the same moves whether or not more ants follow
+    # while they do not meet, so compare the first steps only
+    few = _run(4, ants=5, steps=3)
+    many = _run(4, ants=30, steps=3)
+    assert many[:5] == few
+
+
+def test_store_and_sequential_runs_are_each_reproducible():
+    assert _run(9, store=True) == _run(9, store=True)
@@ -0,0 +1,72 @@
+import os
+import random
+
+from conftest import ENVS
+from simulation import SimulationRunner
+from snapshot import load_snapshot, save_snapshot
+from utils import add_ants, create_environment
+
+ENV_FILE = os.path.join(ENVS, "03_square_two_food_spots.txt")
+
+
+def _runner(seed=None, ants=20):
+    environment = create_environment(ENV_FILE, 0, 0, verbose=False, seed=seed)
+    add_ants(environment, "random", None, ants, verbose=False)
+    return SimulationRunner(environment, max_steps=30)
+
+
+def _ant_states(environment):
+    return [
+        (ant.id, ant.x, ant.y, ant.direction, ant.has_food, ant.food_collected)
+        for ant in environment.ants
+    ]
+
+
+def test_unseeded_run_saves_and_loads(tmp_path):
+    runner = _runner()
+    runner.run(verbose=False)
+    filename = str(tmp_path / "run.snap")
+
+    runner.save_checkpoint(filename)
+    environment, state = load_snapshot(filename)
+
+    assert state["step_count"] == 30
+    assert _ant_states(environment) == _ant_states(runner.environment)
+    assert all(ant.perception_buffer is None for ant in environment.ants)
+
+    # The restored run keeps going with the random module
+    resumed = SimulationRunner.resume(filename, max_steps=40)
+    resumed.run(verbose=False)
+    assert resumed.step_count == 40
+
+
+def test_seeded_resume_matches_uninterrupted_run(tmp_path):
+    filename = str(tmp_path / "run.snap")
+    first = _runner(seed=7)
+    first.run(verbose=False)
+    first.save_checkpoint(filename)
+
+    resumed = SimulationRunner.resume(filename, max_steps=60)
+    resumed.run(verbose=False)
+
+    uninterrupted = _runner(seed=7)
+    uninterrupted.max_steps = 60
+    uninterrupted.run(verbose=False)
+
+    assert _ant_states(resumed.environment) == _ant_states(uninterrupted.environment)
+    assert resumed.environment.food_collected == uninterrupted.environment.food_collected
+
+
+def test_kept_perceptions_are_saved(tmp_path):
+    runner = _runner()
+    strategy = runner.environment.ants[0].strategy
+    strategy.seen = [
+        runner.environment.get_perception_for_ant(ant)
+        for ant in runner.environment.ants
+    ]
+    filename = str(tmp_path / "run.snap")
+
+    save_snapshot(runner.environment, filename)
+    environment, _ = load_snapshot(filename)
+
+    assert environment.ants[0].strategy.seen[0].rng is random
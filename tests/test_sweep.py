@@ -0,0 +1,76 @@
+import os
+import shutil
+
+import pytest
+
+from batch import BatchJob
+from conftest import ENVS
+from sweep import (
+    cache_key,
+    load_cached,
+    parameter_combinations,
+    parse_param,
+    parse_values,
+    run_sweep,
+)
+
+ENV_FILE = os.path.join(ENVS, "03_square_two_food_spots.txt")
+
+
+def test_parse_values():
+    assert parse_values("1,2,5") == [1, 2, 5]
+    assert parse_values("0.9:1:0.05") == [0.9, 0.95, 1]
+    assert parse_param("vision_range=2:4:1") == ("vision_range", [2, 3, 4])
+    with pytest.raises(ValueError):
+        parse_param("speed=1,2")
+
+
+def test_parameter_combinations():
+    combinations = parameter_combinations(
+        {"vision_range": [2, 3], "ants": [5]}, [{"vision_angle": 90}, {}]
+    )
+    assert combinations == [
+        {"vision_angle": 90, "ants": 5, "vision_range": 2},
+        {"vision_angle": 90, "ants": 5, "vision_range": 3},
+        {"ants": 5, "vision_range": 2},
+        {"ants": 5, "vision_range": 3},
+    ]
+
+
+def test_cache_key_follows_the_content(tmp_path):
+    env_file = str(tmp_path / "env.txt")
+    shutil.copy(ENV_FILE, env_file)
+    job = BatchJob(env_file, seed=1, params=(("ants", 5),))
+    key = cache_key(job)
+
+    # The same content under another name shares the key
+    renamed = str(tmp_path / "renamed.txt")
+    shutil.copy(ENV_FILE, renamed)
+    assert cache_key(job._replace(env=renamed)) == key
+
+    # Parameter order does not matter, values, seeds and limits do
+    job2 = job._replace(params=(("vision_range", 2), ("ants", 5)))
+    job3 = job._replace(params=(("ants", 5), ("vision_range", 2)))
+    assert cache_key(job2) == cache_key(job3)
+    assert cache_key(job._replace(params=(("ants", 6),))) != key
+    assert cache_key(job._replace(seed=2)) != key
+    assert cache_key(job._replace(max_steps=10)) != key
+    assert cache_key(BatchJob("maze", width=50)) != cache_key(BatchJob("maze"))
+
+    # Editing the environment file invalidates the entry
+    with open(env_file, "a") as f:
+        f.write("\n")
+    assert cache_key(job) != key
+
+
+def test_sweep_reuses_cached_results(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    jobs = [
+        BatchJob(ENV_FILE, seed=seed, max_steps=30, params=(("ants", 5),))
+        for seed in range(2)
+    ]
+    first = run_sweep(jobs, cache_dir, processes=1, verbose=False)
+    assert all(load_cached(cache_dir, cache_key(job)) for job in jobs)
+
+    second = run_sweep(jobs, cache_dir, processes=1, verbose=False)
+    assert second == first
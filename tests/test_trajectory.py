@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ENVS
+from trajectory import TrajectoryLog, TrajectoryRecorder, TrajectoryReplay
+from utils import add_ants, create_environment
+
+ENV_FILE = os.path.join(ENVS, "03_square_two_food_spots.txt")
+
+
+def _environment(pheromone_map):
+    environment = create_environment(ENV_FILE, 0, 0, verbose=False, seed=3)
+    environment.set_pheromone_map(pheromone_map)
+    add_ants(environment, "random", None, 30, verbose=False)
+    return environment
+
+
+def _assert_same_state(replayed, recorded):
+    assert [(ant.x, ant.y, ant.direction, ant.has_food) for ant in replayed.ants] == [
+        (ant.x, ant.y, ant.direction, ant.has_food) for ant in recorded.ants
+    ]
+    assert replayed.food_collected == recorded.food_collected
+    assert replayed.steps == recorded.steps
+    np.testing.assert_allclose(
+        replayed.home_pheromones.to_array(), recorded.home_pheromones.to_array()
+    )
+    np.testing.assert_allclose(
+        replayed.food_pheromones.to_array(), recorded.food_pheromones.to_array()
+    )
+
+
+@pytest.mark.parametrize("pheromone_map", ["sparse", "dense", "lazy"])
+def test_replay_follows_recording_started_mid_run(tmp_path, pheromone_map):
+    environment = _environment(pheromone_map)
+    for _ in range(40):
+        environment.update()
+    # A GUI redraw drains the dirty sets before recording starts
+    environment.home_pheromones.take_modified_positions()
+    environment.food_pheromones.take_modified_positions()
+
+    filename = str(tmp_path / "run.traj")
+    with TrajectoryRecorder(environment, filename, chunk_cells=500):
+        for _ in range(60):
+            environment.update()
+
+    replay = TrajectoryReplay(filename)
+    while replay.update():
+        pass
+
+    assert replay.step_count == 60
+    _assert_same_state(replay.environment, environment)
+
+
+def test_log_reads_every_step_across_chunks(tmp_path):
+    environment = _environment("sparse")
+    filename = str(tmp_path / "run.traj")
+    with TrajectoryRecorder(environment, filename, chunk_cells=100):
+        for _ in range(25):
+            environment.update()
+
+    log = TrajectoryLog(filename)
+    steps = list(log.steps())
+
+    assert len(steps) == 25
+    assert steps[-1]["x"] == [ant.x for ant in environment.ants]
+    assert steps[-1]["y"] == [ant.y for ant in environment.ants]
@@ -0,0 +1,42 @@
+import pytest
+
+from environment import EnvironmentBuilder
+from random_strategy import RandomStrategy
+from update_stats import PHASES
+from utils import add_ants
+
+
+@pytest.mark.parametrize("store", [False, True])
+def test_profiled_update_counts_every_phase(store):
+    environment = EnvironmentBuilder.create_simple(40, 40)
+    environment.seed = 1
+    if store:
+        environment.enable_ant_store()
+    add_ants(environment, "random", None, 12, verbose=False)
+    stats = environment.enable_stats()
+
+    for _ in range(5):
+        environment.update()
+
+    assert stats.steps == 5
+    assert set(stats.phases) == set(PHASES)
+    assert stats.phases["evaporate"].calls == 10  # Two pheromone maps per step
+    for phase in ("perception", "decide", "execute"):
+        assert stats.phases[phase].calls == 60
+    assert stats.strategies[RandomStrategy.__name__].calls == 60
+    assert stats.total_seconds > 0
+    assert "decide" in stats.format()
+
+
+def test_profiling_does_not_change_the_run():
+    runs = []
+    for profile in (False, True):
+        environment = EnvironmentBuilder.create_simple(40, 40)
+        environment.seed = 3
+        add_ants(environment, "random", None, 20, verbose=False)
+        if profile:
+            environment.enable_stats()
+        for _ in range(100):
+            environment.update()
+        runs.append([(ant.x, ant.y, ant.direction) for ant in environment.ants])
+    assert runs[0] == runs[1]
@@ -0,0 +1,356 @@
+# Recording of ant trajectories and their replay without the strategy code.
+
+import json
+import struct
+import zlib
+from typing import Dict, Iterator
+
+import numpy as np
+
+from ant import Ant
+from common import AntAction
+from environment import Environment, EnvironmentBuilder
+from ant_store import DIRECTIONS
+
+# File layout: magic bytes, the zlib-compressed JSON header length as a
+# little-endian uint32 and the header, then chunks of consecutive steps. A
+# chunk is CHUNK_MAGIC, its step count as a uint32, then one zlib-compressed
+# (steps, ants) array per column in COLUMNS order, each preceded by its
+# compressed length as a uint32.
+MAGIC = b"ANTTRAJ\x00"
+VERSION = 1
+CHUNK_MAGIC = b"CHNK"
+
+# Column name, dtype (positions use the narrowest type that fits the map)
+COLUMNS = (
+    ("x", None),
+    ("y", None),
+    ("direction", np.int8),
+    ("has_food", np.uint8),
+    ("action", np.int8),
+)
+
+_UINT32 = struct.Struct("<I")
+
+
+def _position_dtype(width: int, height: int):
+    return np.int16 if max(width, height) <= np.iinfo(np.int16).max else np.int32
+
+
+def _pheromone_cells(pheromones) -> list:
+    """[x, y, value] of every cell holding pheromone"""
+    # Read from the map's contents, modified_positions is only a dirty set
+    # that the GUI empties as it redraws
+    values = pheromones.to_array()
+    ys, xs = np.nonzero(values > 0)
+    return [
+        [x, y, float(values[y, x])] for x, y in sorted(zip(xs.tolist(), ys.tolist()))
+    ]
+
+
+class TrajectoryRecorder:
+    """Write the state of every ant after each step to a trajectory file
+
+    Attach with environment.recorder = recorder (or start()); the environment
+    then reports each ant's action and the end of every step. Steps are kept
+    in preallocated arrays of about chunk_cells values per column and
+    written out as a compressed chunk when those are full, so memory stays
+    bounded however long the run is.
+    """
+
+    def __init__(
+        self,
+        environment: Environment,
+        filename: str,
+        chunk_cells: int = 1 << 20,
+        compress_level: int = 6,
+    ):
+        self.environment = environment
+        self.filename = filename
+        self.compress_level = compress_level
+        self.ant_count = len(environment.ants)
+        if self.ant_count == 0:
+            raise ValueError("Cannot record an environment without ants")
+
+        # id(ant) -> column index, for actions reported one ant at a time
+        self.index = {id(ant): i for i, ant in enumerate(environment.ants)}
+        self.chunk_steps = max(1, chunk_cells // self.ant_count)
+        position_dtype = _position_dtype(environment.width, environment.height)
+        self.dtypes = {
+            name: dtype or position_dtype for name, dtype in COLUMNS
+        }
+        self.buffers = {
+            name: np.zeros((self.chunk_steps, self.ant_count), dtype=dtype)
+            for name, dtype in self.dtypes.items()
+        }
+        self.row = 0
+        self.steps = 0
+        self.actions = np.full(self.ant_count, AntAction.NO_ACTION.value, np.int8)
+
+        self.file = open(filename, "wb")
+        self._write_header()
+
+    def _write_header(self) -> None:
+        env = self.environment
+        ants = env.ants
+        header = {
+            "version": VERSION,
+            "ant_count": self.ant_count,
+            "columns": [
+                [name, np.dtype(dtype).str] for name, dtype in self.dtypes.items()
+            ],
+            "start_step": env.steps,
+            "food_collected": env.food_collected,
+            "initial_food_amount": env.initial_food_amount,
+            "pheromones_enabled": env.pheromones_enabled,
+            "pheromone_map": env.pheromone_map,
+            "evaporation_rate": [
+                env.home_pheromones.evaporation_rate,
+                env.food_pheromones.evaporation_rate,
+            ],
+            "environment": EnvironmentBuilder.to_text(env),
+            "pheromones": {
+                "home": _pheromone_cells(env.home_pheromones),
+                "food": _pheromone_cells(env.food_pheromones),
+            },
+            "ants": {
+                "id": [ant.id for ant in ants],
+                "x": [int(ant.x) for ant in ants],
+                "y": [int(ant.y) for ant in ants],
+                "direction": [ant.direction.value for ant in ants],
+                "has_food": [bool(ant.has_food) for ant in ants],
+                "home_pheromone": [float(ant.home_pheromone) for ant in ants],
+                "food_pheromone": [float(ant.food_pheromone) for ant in ants],
+                "pheromone_decrease_rate": [
+                    float(ant.pheromone_decrease_rate) for ant in ants
+                ],
+                "food_collected": [int(ant.food_collected) for ant in ants],
+            },
+        }
+        payload = zlib.compress(json.dumps(header).encode("utf-8"), self.compress_level)
+        self.file.write(MAGIC + _UINT32.pack(len(payload)) + payload)
+
+    def start(self) -> "TrajectoryRecorder":
+        self.environment.recorder = self
+        return self
+
+    def record_action(self, ant, action: AntAction) -> None:
+        index = self.index.get(id(ant))
+        if index is not None:
+            self.actions[index] = action.value
+
+    def record_actions(self, actions) -> None:
+        """Actions of all ants at once, as an array of AntAction values"""
+        self.actions[: len(actions)] = actions
+
+    def record_step(self, environment: Environment) -> None:
+        ants = environment.ants
+        if len(ants) != self.ant_count:
+            raise ValueError(
+                f"Ant count changed during recording: {self.ant_count} -> {len(ants)}"
+            )
+
+        buffers, row = self.buffers, self.row
+        store = environment.ant_store
+        if store is not None:
+            count = store.count
+            buffers["x"][row] = store.x[:count]
+            buffers["y"][row] = store.y[:count]
+            buffers["direction"][row] = store.direction[:count]
+            buffers["has_food"][row] = store.has_food[:count]
+        else:
+            buffers["x"][row] = [ant.x for ant in ants]
+            buffers["y"][row] = [ant.y for ant in ants]
+            buffers["direction"][row] = [ant.direction.value for ant in ants]
+            buffers["has_food"][row] = [ant.has_food for ant in ants]
+        buffers["action"][row] = self.actions
+        self.actions.fill(AntAction.NO_ACTION.value)
+
+        self.row += 1
+        self.steps += 1
+        if self.row == self.chunk_steps:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered steps as one chunk"""
+        if not self.row:
+            return
+        parts = [CHUNK_MAGIC, _UINT32.pack(self.row)]
+        for name in self.dtypes:
+            data = zlib.compress(
+                self.buffers[name][: self.row].tobytes(), self.compress_level
+            )
+            parts.append(_UINT32.pack(len(data)))
+            parts.append(data)
+        self.file.write(b"".join(parts))
+        self.row = 0
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        if self.environment.recorder is self:
+            self.environment.recorder = None
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TrajectoryLog:
+    """Read access to a trajectory file, one chunk in memory at a time"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a trajectory file: {filename}")
+            (length,) = _UINT32.unpack(f.read(_UINT32.size))
+            self.header = json.loads(zlib.decompress(f.read(length)))
+            self.data_offset = f.tell()
+
+        if self.header["version"] != VERSION:
+            raise ValueError(
+                f"Unsupported trajectory version {self.header['version']}"
+            )
+        self.ant_count = self.header["ant_count"]
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in self.header["columns"]}
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        """Each chunk as column name -> (steps, ants) array"""
+        with open(self.filename, "rb") as f:
+            f.seek(self.data_offset)
+            while True:
+                magic = f.read(len(CHUNK_MAGIC))
+                if not magic:
+                    return
+                if magic != CHUNK_MAGIC:
+                    raise ValueError(f"Corrupt trajectory file: {self.filename}")
+                (steps,) = _UINT32.unpack(f.read(_UINT32.size))
+                chunk = {}
+                for name, dtype in self.dtypes.items():
+                    (length,) = _UINT32.unpack(f.read(_UINT32.size))
+                    data = zlib.decompress(f.read(length))
+                    chunk[name] = np.frombuffer(data, dtype=dtype).reshape(
+                        steps, self.ant_count
+                    )
+                yield chunk
+
+    def steps(self) -> Iterator[Dict[str, list]]:
+        """Each step as column name -> one value per ant"""
+        for chunk in self.chunks():
+            columns = [(name, chunk[name].tolist()) for name in self.dtypes]
+            for row in range(len(columns[0][1])):
+                yield {name: values[row] for name, values in columns}
+
+
+class TrajectoryReplay:
+    """Rebuild a recorded run step by step from a trajectory file
+
+    The environment is restored from the header and its ants get no
+    strategy: update() applies the recorded positions and replays the food
+    pick-ups, drops and pheromone deposits, so the map, the collected food
+    and the pheromone trails follow the recording.
+    """
+
+    def __init__(self, filename: str, verbose: bool = False):
+        self.log = TrajectoryLog(filename)
+        header = self.log.header
+
+        env = EnvironmentBuilder.from_text(header["environment"], verbose=verbose)
+        env.set_pheromone_map(header["pheromone_map"])
+        env.home_pheromones.evaporation_rate, env.food_pheromones.evaporation_rate = (
+            header["evaporation_rate"]
+        )
+        env.pheromones_enabled = header["pheromones_enabled"]
+        env.steps = header["start_step"]
+        env.food_collected = header["food_collected"]
+        env.initial_food_amount = header["initial_food_amount"]
+        for name, pheromones in (
+            ("home", env.home_pheromones),
+            ("food", env.food_pheromones),
+        ):
+            for x, y, value in header["pheromones"][name]:
+                pheromones.add_pheromone(x, y, value)
+
+        columns = header["ants"]
+        for i in range(self.log.ant_count):
+            ant = Ant(
+                columns["x"][i],
+                columns["y"][i],
+                DIRECTIONS[columns["direction"][i]],
+                None,
+                ant_id=columns["id"][i],
+            )
+            ant.has_food = columns["has_food"][i]
+            ant.home_pheromone = columns["home_pheromone"][i]
+            ant.food_pheromone = columns["food_pheromone"][i]
+            ant.pheromone_decrease_rate = columns["pheromone_decrease_rate"][i]
+            ant.food_collected = columns["food_collected"][i]
+            # Bypass add_ant so ids and random streams stay as recorded
+            env.ants.append(ant)
+            env._occupy(ant, ant.x, ant.y)
+
+        self.environment = env
+        self.step_count = 0
+        self.finished = False
+        self._steps = self.log.steps()
+
+    def update(self) -> bool:
+        """Advance one recorded step, returning False once the log is exhausted"""
+        if self.finished:
+            return False
+        step = next(self._steps, None)
+        if step is None:
+            self.finished = True
+            return False
+
+        env = self.environment
+        if env.pheromones_enabled:
+            env.home_pheromones.evaporate()
+            env.food_pheromones.evaporate()
+
+        columns = zip(
+            env.ants,
+            step["x"],
+            step["y"],
+            step["direction"],
+            step["has_food"],
+            step["action"],
+        )
+        for ant, x, y, direction, has_food, action in columns:
+            # Effects of the action, judged from the state before the step
+            if action == AntAction.PICK_UP_FOOD.value:
+                if has_food and not ant.has_food:
+                    env.remove_food(ant.x, ant.y)
+            elif action == AntAction.DROP_FOOD.value:
+                if ant.has_food and not has_food:
+                    env.food_collected += 1
+                    ant.drop_food(True)
+            elif action == AntAction.DEPOSIT_HOME_PHEROMONE.value:
+                if env.pheromones_enabled:
+                    env.home_pheromones.add_pheromone(
+                        ant.x, ant.y, ant.deposit_pheromone()
+                    )
+            elif action == AntAction.DEPOSIT_FOOD_PHEROMONE.value:
+                if env.pheromones_enabled:
+                    env.food_pheromones.add_pheromone(
+                        ant.x, ant.y, ant.deposit_pheromone()
+                    )
+
+            if x != ant.x or y != ant.y:
+                env._vacate(ant, ant.x, ant.y)
+                env._occupy(ant, x, y)
+                ant.x, ant.y = x, y
+            ant.direction = DIRECTIONS[direction]
+            ant.has_food = bool(has_food)
+
+        env.steps += 1
+        self.step_count += 1
+        return True
+
+    def is_complete(self) -> bool:
+        return self.finished
@@ -0,0 +1,88 @@
+from typing import Dict, List
+
+
+# Phases of Environment.update, in the order they run
+PHASES = ("evaporate", "perception", "decide", "execute")
+
+
+class PhaseTiming:
+    """Cumulative time and call count of one phase"""
+
+    __slots__ = ("seconds", "calls")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+
+    def add(self, seconds: float, calls: int = 1) -> None:
+        self.seconds += seconds
+        self.calls += calls
+
+    def as_dict(self) -> dict:
+        return {"seconds": self.seconds, "calls": self.calls}
+
+
+# Timing of Environment.update split by phase, see Environment.enable_stats
+class UpdateStats:
+    """Cumulative per-phase timings of Environment.update
+
+    Calls count what a phase processed: pheromone maps for evaporate and
+    ants for perception, decide and execute. Decisions are also broken
+    down by strategy class.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.steps = 0
+        self.phases: Dict[str, PhaseTiming] = {
+            phase: PhaseTiming() for phase in PHASES
+        }
+        # Strategy class name -> decide timing of that class's ants
+        self.strategies: Dict[str, PhaseTiming] = {}
+
+    def add(self, phase: str, seconds: float, calls: int = 1) -> None:
+        self.phases[phase].add(seconds, calls)
+
+    def add_decisions(self, strategy, seconds: float, calls: int = 1) -> None:
+        """Record decision time, both for the phase and the strategy's class"""
+        self.phases["decide"].add(seconds, calls)
+        name = type(strategy).__name__ if strategy is not None else "None"
+        timing = self.strategies.get(name)
+        if timing is None:
+            timing = self.strategies[name] = PhaseTiming()
+        timing.add(seconds, calls)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(timing.seconds for timing in self.phases.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "steps": self.steps,
+            "phases": {name: timing.as_dict() for name, timing in self.phases.items()},
+            "strategies": {
+                name: timing.as_dict() for name, timing in self.strategies.items()
+            },
+        }
+
+    def format(self) -> str:
+        """Table of the phases and strategies with their share of the total"""
+        total = self.total_seconds or 1.0
+        lines: List[str] = [f"Phase timings over {self.steps} steps:"]
+
+        def row(indent: int, name: str, timing: PhaseTiming) -> str:
+            per_call = timing.seconds / timing.calls * 1e6 if timing.calls else 0.0
+            return (
+                f"{' ' * indent}{name:<{30 - indent}} {timing.seconds:>9.3f}s "
+                f"{timing.calls:>11} calls {per_call:>9.2f}us/call "
+                f"{timing.seconds / total * 100:>5.1f}%"
+            )
+
+        for name, timing in self.phases.items():
+            lines.append(row(2, name, timing))
+            if name == "decide":
+                for strategy, strategy_timing in sorted(self.strategies.items()):
+                    lines.append(row(4, strategy, strategy_timing))
+        return "\n".join(lines)
@@ -40,26 +40,45 @@ def load_strategy_from_file(filepath: str, verbose: bool = True) -> Type[AntStra
 
 
 def create_environment(
-    env_type: str, width: int, height: int, verbose: bool = True
+    env_type: str,
+    width: int,
+    height: int,
+    verbose: bool = True,
+    seed: Optional[int] = None,
 ) -> Environment:
+    """Build or load an environment
+
+    With a seed, generated layouts are reproducible and every ant added
+    afterwards gets its own random stream derived from the seed.
+    """
     if env_type == "simple":
-        return EnvironmentBuilder.create_simple(width, height)
+        environment = EnvironmentBuilder.create_simple(width, height)
     elif env_type == "obstacle":
-        return EnvironmentBuilder.create_obstacle_course(width, height)
+        environment = EnvironmentBuilder.create_obstacle_course(width, height)
     elif env_type == "maze":
-        return EnvironmentBuilder.create_maze(width, height)
+        rng = random.Random(f"{seed}:maze") if seed is not None else None
+        environment = EnvironmentBuilder.create_maze(width, height, rng=rng)
     elif env_type == "empty":
-        return EnvironmentBuilder.create_empty(width, height)
+        environment = EnvironmentBuilder.create_empty(width, height)
     elif os.path.isfile(env_type):
         try:
-            return EnvironmentBuilder.load_from_file(env_type, verbose=verbose)
+            if EnvironmentBuilder.is_binary_file(env_type):
+                load = EnvironmentBuilder.load_binary
+            else:
+                load = EnvironmentBuilder.load_from_file
+            environment = load(env_type, verbose=verbose)
         except Exception as e:
             raise ValueError(
                 f"Failed to load environment from file {env_type}: {str(e)}"
             )
+        if environment is None:
+            raise ValueError(f"Failed to load environment from file {env_type}")
     else:
         raise ValueError(f"Unknown environment type: {env_type}")
 
+    environment.seed = seed
+    return environment
+
 
 def add_ants(
     environment: Environment,
@@ -99,7 +118,11 @@ def add_ants(
     for i in range(count):
         colony_pos = environment.colony_positions[i % len(environment.colony_positions)]
         x, y = colony_pos
-        # Create ant with random initial direction
-        direction = random.choice(list(Direction))
+        # Create ant with random initial direction, drawn from the ant's own
+        # stream in seeded runs so it doesn't depend on how many ants there are
+        rng = environment.ant_rng(i + 1) if environment.seed is not None else random
+        direction = rng.choice(list(Direction))
         ant = Ant(x, y, direction, strategy, ant_id=i + 1)
+        if rng is not random:
+            ant.rng = rng
         environment.add_ant(ant)